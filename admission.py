@@ -0,0 +1,239 @@
+"""
+Rate limiting and admission control for TalentScout Hiring Assistant
+
+Token buckets limit how fast each session and each client IP may send
+messages, so one user pasting repeatedly cannot monopolise the LLM. The
+admission controller caps how many turns talk to the LLM at once and how
+many may wait; waiting turns are admitted first come, first served and
+can report their place in line. Turns of one session already run one at a
+time, so every waiting session gets its turn before any session gets two.
+Async callers can wait for admission on the event loop instead of tying up
+a worker thread per queued turn.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional
+
+from config import (
+    SESSION_RATE_PER_MINUTE, SESSION_RATE_BURST, IP_RATE_PER_MINUTE, IP_RATE_BURST,
+    LLM_MAX_ACTIVE, LLM_MAX_QUEUED
+)
+
+
+class Overloaded(Exception):
+    """Raised when too many turns are already waiting for the LLM"""
+
+
+class TokenBucket:
+    """Allows bursts of up to capacity, refilled at rate tokens per second"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def refund(self, tokens: float = 1):
+        """Return tokens taken for a request that was not carried out"""
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+    def retry_after(self, tokens: float = 1) -> float:
+        """Seconds until tokens will be available"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """One token bucket per key, keeping only the most recently used max_keys"""
+
+    def __init__(self, per_minute: float, burst: float, max_keys: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def bucket(self, key: str) -> TokenBucket:
+        # Caller holds the owning RateLimits lock
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # An evicted bucket was idle longest, so it would have been full anyway
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, self.clock)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+
+class RateLimits:
+    """Per-session and per-client-IP message rate limits"""
+
+    def __init__(self, session_limiter: Optional[RateLimiter] = None, ip_limiter: Optional[RateLimiter] = None):
+        self.sessions = session_limiter or RateLimiter(SESSION_RATE_PER_MINUTE, SESSION_RATE_BURST)
+        self.ips = ip_limiter or RateLimiter(IP_RATE_PER_MINUTE, IP_RATE_BURST)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def check(self, session_id: str, client_ip: Optional[str] = None) -> float:
+        """Count a message against both limits; returns 0 if allowed, else seconds to wait"""
+        with self._lock:
+            session_bucket = self.sessions.bucket(session_id)
+            if not session_bucket.try_acquire():
+                self.rejected += 1
+                return session_bucket.retry_after()
+            if client_ip:
+                ip_bucket = self.ips.bucket(client_ip)
+                if not ip_bucket.try_acquire():
+                    session_bucket.refund()
+                    self.rejected += 1
+                    return ip_bucket.retry_after()
+            return 0.0
+
+
+class Ticket:
+    """A turn's place in the admission queue"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.admitted = False
+        self.released = False
+        self.enqueued_at = time.monotonic()
+        # Called once when the ticket is admitted, with the controller's lock held
+        self.on_admit: Optional[Callable[[], None]] = None
+
+
+class AdmissionController:
+    """Caps turns running against the LLM; the rest wait in a first-come queue"""
+
+    def __init__(self, max_active: int = LLM_MAX_ACTIVE, max_queued: int = LLM_MAX_QUEUED):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self._cond = threading.Condition()
+        self._waiting: Deque[Ticket] = deque()
+        self.active = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+
+    def enter(self, session_id: str) -> Ticket:
+        """Join the queue, or raise Overloaded if it is full"""
+        with self._cond:
+            if self.active >= self.max_active and len(self._waiting) >= self.max_queued:
+                self.rejected_total += 1
+                raise Overloaded("TalentScout is very busy right now. Please try again in a minute.")
+            ticket = Ticket(session_id)
+            self._waiting.append(ticket)
+            self._admit()
+            return ticket
+
+    def _admit(self):
+        # Caller holds self._cond
+        while self.active < self.max_active and self._waiting:
+            ticket = self._waiting.popleft()
+            ticket.admitted = True
+            self.active += 1
+            self.admitted_total += 1
+            if ticket.on_admit is not None:
+                ticket.on_admit()
+        self._cond.notify_all()
+
+    def wait(self, ticket: Ticket, timeout: Optional[float] = None) -> bool:
+        """Block until the ticket is admitted; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: ticket.admitted, timeout)
+
+    async def wait_async(self, ticket: Ticket):
+        """Wait until the ticket is admitted without blocking a thread; call from the event loop"""
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def wake():
+            if not admitted.done():
+                admitted.set_result(None)
+
+        with self._cond:
+            if ticket.admitted:
+                return
+            ticket.on_admit = lambda: loop.call_soon_threadsafe(wake)
+        await admitted
+
+    def release(self, ticket: Ticket):
+        """Free the ticket's slot, or leave the queue if it was never admitted"""
+        with self._cond:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket.admitted:
+                self.active -= 1
+            else:
+                self._waiting.remove(ticket)
+            self._admit()
+
+    def position(self, ticket: Ticket) -> int:
+        """1-based place in line, or 0 once admitted"""
+        with self._cond:
+            if ticket.admitted or ticket.released:
+                return 0
+            return self._waiting.index(ticket) + 1
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    @contextmanager
+    def slot(self, session_id: str, ticket: Optional[Ticket] = None) -> Iterator[Ticket]:
+        """Hold an LLM slot for the duration of the block, queueing unless given a ticket"""
+        ticket = ticket or self.enter(session_id)
+        try:
+            self.wait(ticket)
+            yield ticket
+        finally:
+            self.release(ticket)
+
+
+def ordinal(n: int) -> str:
+    """1 -> '1st', 2 -> '2nd', 11 -> '11th'"""
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+_rate_limits: Optional[RateLimits] = None
+_admission: Optional[AdmissionController] = None
+_singleton_lock = threading.Lock()
+
+
+def get_rate_limits() -> RateLimits:
+    """Return the process-wide rate limits, creating them on first use"""
+    global _rate_limits
+    with _singleton_lock:
+        if _rate_limits is None:
+            _rate_limits = RateLimits()
+        return _rate_limits
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller, creating it on first use"""
+    global _admission
+    with _singleton_lock:
+        if _admission is None:
+            _admission = AdmissionController()
+        return _admission
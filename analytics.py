@@ -0,0 +1,275 @@
+"""
+Funnel and skill analytics for TalentScout Hiring Assistant
+
+Loads sessions into columnar pandas frames and computes the reporting
+metrics with vectorised group-bys: drop-off by final conversation state,
+technology frequency and co-occurrence, experience distribution by
+position and average turns per state. All aggregates are additive, so
+update() folds in new or changed sessions only instead of recomputing the
+whole corpus, and finished reports are cached until the next update.
+Session exports do not record conversation states, so the drop-off and
+turns per state reports only cover sessions read from the store.
+
+Usage:
+    python analytics.py --db talentscout_sessions.db
+    python analytics.py --source exports/
+"""
+
+import argparse
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Try to import pandas, but handle gracefully if not available
+try:
+    import numpy as np
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+    np = None
+    pd = None
+
+from config import CONVERSATION_STATES
+
+STATE_ORDER = list(CONVERSATION_STATES.values())
+
+
+def _session_fields(record: Dict[str, Any]) -> Tuple[str, Any, Dict[str, Any]]:
+    """Return (session_id, version, state) for a store record or an export"""
+    state = record.get("state") or record
+    version = record.get("updated_at") or record.get("timestamp")
+    return str(record["session_id"]), version, state
+
+
+def _visited_states(state: Dict[str, Any]) -> List[str]:
+    """States a session spent turns in, plus the state it ended in"""
+    visited = [s for s, n in (state.get("state_turns") or {}).items() if int(n) > 0]
+    if state.get("conversation_state") is not None:
+        visited.append(state["conversation_state"])
+    return visited
+
+
+def _to_frames(records: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, "pd.DataFrame"]:
+    """Build the per-session, per-technology and per-state frames for a batch"""
+    ids = [session_id for session_id, _ in records]
+    states = [state for _, state in records]
+    info = [state.get("candidate_info") or {} for state in states]
+    visits = pd.DataFrame(
+        [(session_id, s) for session_id, state in records for s in _visited_states(state)],
+        columns=["session_id", "state"]
+    ).drop_duplicates()
+    sessions = pd.DataFrame({
+        "session_id": ids,
+        "final_state": [state.get("conversation_state") for state in states],
+        "position": pd.Series([i.get("position") for i in info], dtype="object").str.strip().str.lower(),
+        "experience": pd.to_numeric(pd.Series([i.get("experience") for i in info], dtype="object"),
+                                    errors="coerce")
+    })
+    techs = pd.DataFrame(
+        [(session_id, str(tech).lower()) for session_id, state in records for tech in state.get("tech_stack") or []],
+        columns=["session_id", "tech"]
+    ).drop_duplicates()
+    turns = pd.DataFrame(
+        [(session_id, s, int(n)) for session_id, state in records
+         for s, n in (state.get("state_turns") or {}).items()],
+        columns=["session_id", "state", "turns"]
+    )
+    return {"sessions": sessions, "techs": techs, "turns": turns, "visits": visits}
+
+
+def _aggregate(frames: Dict[str, "pd.DataFrame"]) -> Dict[str, "pd.Series"]:
+    """Additive aggregates of a set of frames"""
+    sessions, techs, turns, visits = frames["sessions"], frames["techs"], frames["turns"], frames["visits"]
+    pairs = techs.merge(techs, on="session_id", suffixes=("_a", "_b"))
+    pairs = pairs[pairs["tech_a"] < pairs["tech_b"]]
+    experienced = sessions.dropna(subset=["position", "experience"])
+    return {
+        "total": pd.Series({"sessions": len(sessions)}, dtype="int64"),
+        "final_state": sessions.groupby("final_state").size(),
+        "visited": visits.groupby("state").size(),
+        "tech": techs.groupby("tech").size(),
+        "tech_pairs": pairs.groupby(["tech_a", "tech_b"]).size(),
+        "experience": experienced.groupby(["position", "experience"]).size(),
+        "turn_sum": turns.groupby("state")["turns"].sum(),
+        "turn_sessions": turns[turns["turns"] > 0].groupby("state").size()
+    }
+
+
+def _combine(total: "pd.Series", delta: "pd.Series", sign: int) -> "pd.Series":
+    """Add (or subtract) one aggregate into another, dropping empty groups"""
+    combined = total.add(delta * sign, fill_value=0)
+    return combined[combined != 0].astype("int64")
+
+
+class SessionAnalytics:
+    """Incrementally maintained funnel and skill aggregates over sessions"""
+
+    def __init__(self):
+        if not PANDAS_AVAILABLE:
+            raise RuntimeError("Session analytics require pandas")
+        self._frames = _to_frames([])
+        self._versions: Dict[str, Any] = {}
+        self._aggregates: Dict[str, "pd.Series"] = _aggregate(self._frames)
+        self._reports: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def update(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """Fold new or changed sessions into the aggregates; returns how many"""
+        batch: Dict[str, Dict[str, Any]] = {}
+        versions: Dict[str, Any] = {}
+        for record in sessions:
+            session_id, version, state = _session_fields(record)
+            if session_id in self._versions and version is not None and self._versions[session_id] == version:
+                continue
+            batch[session_id] = state
+            versions[session_id] = version
+        if not batch:
+            return 0
+
+        changed = [session_id for session_id in batch if session_id in self._versions]
+        if changed:
+            # Retract the previous contribution of sessions that changed
+            old = {name: frame[frame["session_id"].isin(changed)] for name, frame in self._frames.items()}
+            for name, delta in _aggregate(old).items():
+                self._aggregates[name] = _combine(self._aggregates[name], delta, -1)
+            self._frames = {name: frame[~frame["session_id"].isin(changed)] for name, frame in self._frames.items()}
+
+        new = _to_frames(list(batch.items()))
+        for name, delta in _aggregate(new).items():
+            self._aggregates[name] = _combine(self._aggregates[name], delta, 1)
+        self._frames = {
+            name: pd.concat([frame, new[name]], ignore_index=True) if len(frame) else new[name]
+            for name, frame in self._frames.items()
+        }
+        self._versions.update(versions)
+        self._reports.clear()
+        return len(batch)
+
+    @property
+    def state_sessions(self) -> int:
+        """Sessions with a recorded conversation state, which the state reports cover"""
+        return int(self._aggregates["final_state"].sum())
+
+    def _cached(self, name: str, build):
+        if name not in self._reports:
+            self._reports[name] = build()
+        return self._reports[name]
+
+    def drop_off(self) -> "pd.DataFrame":
+        """Sessions ending in each state, and how many actually reached that state"""
+        def build():
+            counts = self._aggregates["final_state"].reindex(STATE_ORDER, fill_value=0).astype("int64")
+            total = self.state_sessions
+            frame = pd.DataFrame({"state": STATE_ORDER, "ended": counts.values})
+            frame["ended_share"] = frame["ended"] / total if total else 0.0
+            # Exit keywords jump straight to the end, so ending late does not mean passing every state
+            frame["reached"] = self._aggregates["visited"].reindex(STATE_ORDER, fill_value=0).astype("int64").values
+            return frame
+        return self._cached("drop_off", build)
+
+    def tech_frequency(self) -> "pd.DataFrame":
+        """Number and share of sessions mentioning each technology"""
+        def build():
+            counts = self._aggregates["tech"].sort_values(ascending=False, kind="stable")
+            total = int(self._aggregates["total"].get("sessions", 0))
+            frame = pd.DataFrame({"tech": counts.index, "sessions": counts.values.astype("int64")})
+            frame["share"] = frame["sessions"] / total if total else 0.0
+            return frame
+        return self._cached("tech_frequency", build)
+
+    def tech_cooccurrence(self, min_sessions: int = 1) -> "pd.DataFrame":
+        """Pairs of technologies named in the same session, most frequent first"""
+        def build():
+            counts = self._aggregates["tech_pairs"].sort_values(ascending=False, kind="stable")
+            frame = counts.rename("sessions").reset_index()
+            frame.columns = ["tech_a", "tech_b", "sessions"]
+            return frame
+        frame = self._cached("tech_cooccurrence", build)
+        return frame[frame["sessions"] >= min_sessions].reset_index(drop=True)
+
+    def experience_by_position(self) -> "pd.DataFrame":
+        """Distribution of years of experience for each position"""
+        def build():
+            rows = []
+            histogram = self._aggregates["experience"]
+            for position, group in histogram.groupby(level="position"):
+                years = group.index.get_level_values("experience").to_numpy(dtype=float)
+                values = np.repeat(years, group.to_numpy(dtype="int64"))
+                rows.append({
+                    "position": position,
+                    "candidates": len(values),
+                    "mean": values.mean(),
+                    "median": np.median(values),
+                    "p25": np.percentile(values, 25),
+                    "p75": np.percentile(values, 75),
+                    "min": values.min(),
+                    "max": values.max()
+                })
+            columns = ["position", "candidates", "mean", "median", "p25", "p75", "min", "max"]
+            return pd.DataFrame(rows, columns=columns)
+        return self._cached("experience_by_position", build)
+
+    def turns_per_state(self) -> "pd.DataFrame":
+        """Average user turns spent in each state by sessions that visited it"""
+        def build():
+            turn_sum = self._aggregates["turn_sum"].reindex(STATE_ORDER, fill_value=0)
+            visits = self._aggregates["turn_sessions"].reindex(STATE_ORDER, fill_value=0)
+            frame = pd.DataFrame({
+                "state": STATE_ORDER,
+                "sessions": visits.values.astype("int64"),
+                "total_turns": turn_sum.values.astype("int64")
+            })
+            frame["avg_turns"] = (frame["total_turns"] / frame["sessions"].where(frame["sessions"] > 0)).fillna(0.0)
+            return frame
+        return self._cached("turns_per_state", build)
+
+    def report(self) -> Dict[str, "pd.DataFrame"]:
+        """All reports, keyed by name; the state reports only if some session recorded its state"""
+        reports = {
+            "drop_off": self.drop_off(),
+            "tech_frequency": self.tech_frequency(),
+            "tech_cooccurrence": self.tech_cooccurrence(),
+            "experience_by_position": self.experience_by_position(),
+            "turns_per_state": self.turns_per_state()
+        }
+        if not self.state_sessions:
+            del reports["drop_off"], reports["turns_per_state"]
+        return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for session analytics"""
+    parser = argparse.ArgumentParser(description="TalentScout funnel and skill analytics")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="Path to the SQLite session store")
+    source.add_argument("--source", help="Directory of JSON/JSONL session exports")
+    parser.add_argument("--top", type=int, default=20, help="Rows to show for technology reports")
+    args = parser.parse_args(argv)
+
+    analytics = SessionAnalytics()
+    if args.db:
+        from session_store import SessionStore
+        store = SessionStore(args.db)
+        try:
+            analytics.update(store.iter_sessions())
+        finally:
+            store.close()
+    else:
+        from bulk_export import iter_sessions_from_directory
+        analytics.update(iter_sessions_from_directory(args.source))
+
+    print(f"Sessions: {len(analytics)}")
+    stateless = len(analytics) - analytics.state_sessions
+    if stateless:
+        print(f"Warning: {stateless} sessions record no conversation state (exports do not), "
+              f"so drop-off and turns per state cover {analytics.state_sessions} sessions"
+              + ("" if analytics.state_sessions else " and are skipped"))
+    for name, frame in analytics.report().items():
+        print(f"\n{name.replace('_', ' ').title()}")
+        print(frame.head(args.top).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,417 @@
+"""
+Headless HTTP API for TalentScout Hiring Assistant
+
+Runs screenings without Streamlit, so other front ends and integrations
+can drive the same HiringAssistant logic and session store over HTTP.
+Responses can be streamed as Server-Sent Events while the LLM generates
+them. Each session's turns run one at a time; different sessions run
+concurrently on the server's thread pool. Live state is kept in the shared
+state backend, so several servers can sit behind a load balancer without
+sticky sessions; a turn that races one on another server gets a 409.
+Messages are rate limited per session and client IP (429), and turns wait
+for an LLM slot from the admission controller (503 when the queue is full).
+Queued turns wait on the event loop, so they never starve other requests
+of worker threads.
+Sessions idle for longer than SESSION_IDLE_TTL are dropped from memory and
+resumed from the shared state when they are next used.
+
+Endpoints:
+    POST /sessions                              start a screening
+    GET  /sessions/{session_id}                 conversation state and transcript
+    DELETE /sessions/{session_id}               delete a screening and everything stored for it
+    POST /sessions/{session_id}/messages        send {"message": ...}; add ?stream=1 for SSE
+    GET  /sessions/{session_id}/export          export as ?format=json (default) or csv
+    GET  /metrics                               LLM coalescing, admission and rate limit counters
+
+Usage:
+    python api_server.py --host 0.0.0.0 --port 8080
+"""
+
+import argparse
+import json
+import math
+import threading
+import uuid
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from config import API_HOST, API_PORT, API_CORS_ORIGINS, WELCOME_MESSAGE, GRADING_COMMIT_ATTEMPTS
+from assistant import HiringAssistant, Grader
+from session_store import get_session_store
+from state_backend import get_shared_state, VersionConflict
+from llm_client import get_llm_client
+from admission import (
+    AdmissionController, RateLimits, Overloaded, Ticket, get_admission_controller, get_rate_limits
+)
+from bulk_export import session_export_data
+from utils import export_to_json, export_to_csv
+from session_memory import SessionMemory, as_transcript, get_session_memory
+
+EXPORT_MEDIA_TYPES = {"json": "application/json", "csv": "text/csv"}
+
+
+class HeadlessSession:
+    """A screening driven over HTTP: the assistant, its transcript and a turn lock"""
+
+    def __init__(self, session_id: str, assistant: HiringAssistant,
+                 messages: Optional[List[Dict[str, str]]] = None, version: int = 0):
+        self.session_id = session_id
+        self.assistant = assistant
+        self.messages = as_transcript(session_id, messages or [])
+        # Shared state version this copy is based on
+        self.version = version
+        # Serialises turns so a session's messages are answered in order
+        self.lock = threading.Lock()
+
+    def add_message(self, role: str, content: str):
+        """Append to the transcript and the assistant's event log"""
+        self.messages.append({"role": role, "content": content})
+        self.assistant.record_message(role, content)
+
+
+class ScreeningService:
+    """Session lifecycle and chat turns for the HTTP API, backed by the shared state and session store"""
+
+    def __init__(self, store=None, shared=None, admission: Optional[AdmissionController] = None,
+                 rate_limits: Optional[RateLimits] = None, memory: Optional[SessionMemory] = None):
+        self.store = store or get_session_store()
+        self.shared = shared or get_shared_state()
+        self.admission = admission or get_admission_controller()
+        self.rate_limits = rate_limits or get_rate_limits()
+        self.memory = memory or get_session_memory()
+        self._sessions: Dict[str, HeadlessSession] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self) -> HeadlessSession:
+        """Start a screening with the standard welcome message"""
+        session = HeadlessSession(str(uuid.uuid4()), HiringAssistant())
+        self._adopt(session)
+        session.add_message("assistant", WELCOME_MESSAGE)
+        self._commit(session, snapshot=True)
+        with self._lock:
+            self._sessions[session.session_id] = session
+        self._track(session)
+        return session
+
+    def _track(self, session: HeadlessSession):
+        """Note activity on a session and drop sessions left idle"""
+        # A session mid-turn holds its lock, so it is never released under a turn
+        self.memory.touch(session.session_id, session.messages, session.assistant,
+                          on_release=lambda: self._drop(session), lock=session.lock)
+        self.memory.sweep()
+
+    def _drop(self, session: HeadlessSession):
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                del self._sessions[session.session_id]
+
+    def get_session(self, session_id: str) -> Optional[HeadlessSession]:
+        """Return a live session, resuming it from the store if needed"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is not None:
+            self._track(session)
+            return session
+        # Sessions saved before shared state existed are only in the session store
+        stored = self.shared.load(session_id) or self.store.load_session(session_id)
+        if stored is None:
+            return None
+        resumed = HeadlessSession(session_id, HiringAssistant.from_stored(stored), stored["messages"],
+                                  stored.get("version", 0))
+        with self._lock:
+            # Another request may have resumed it first
+            session = self._sessions.setdefault(session_id, resumed)
+        if session is resumed:
+            self._adopt(session)
+        self._track(session)
+        return session
+
+    def delete_session(self, session: HeadlessSession):
+        """Delete a screening: shared state with its spilled messages, stored events and memory"""
+        with session.lock:
+            self.shared.delete(session.session_id)
+            self.store.delete_session(session.session_id)
+            # The store falls back for unknown sessions, so wait until it has forgotten this one
+            self.store.flush()
+            self.memory.forget(session.session_id)
+            self._drop(session)
+
+    def _refresh(self, session: HeadlessSession):
+        # Caller holds session.lock
+        stored = self.shared.load(session.session_id)
+        if stored:
+            session.assistant = HiringAssistant.from_stored(stored)
+            session.messages = stored["messages"]
+            session.version = stored["version"]
+            self._adopt(session)
+
+    def _adopt(self, session: HeadlessSession):
+        """Save the session's background grading here, resuming grading abandoned by another server"""
+        session.assistant.grader = Grader(
+            claim=lambda assistant: self.shared.claim_grading(session.session_id),
+            complete=lambda assistant, assessment: self._graded(session, assessment)
+        )
+        # The lease is only free if the server grading it gave up or went away
+        if session.assistant.grading_pending and self.shared.claim_grading(
+                session.session_id, based_on_version=session.version):
+            session.assistant.resume_assessment_grading()
+
+    def _graded(self, session: HeadlessSession, assessment: Dict[str, object]):
+        """Commit a finished background grading, so every server, the store and exports see it"""
+        try:
+            with self._lock:
+                # The session may have been dropped from memory and resumed since grading started
+                session = self._sessions.get(session.session_id, session)
+            with session.lock:
+                for _ in range(GRADING_COMMIT_ATTEMPTS):
+                    self._sync(session)
+                    if not session.assistant.apply_assessment(assessment):
+                        return
+                    try:
+                        self._commit(session)
+                        return
+                    except VersionConflict:
+                        # Another server saved a turn first; apply the result on top of it
+                        continue
+        finally:
+            self.shared.release_grading(session.session_id)
+
+    def _sync(self, session: HeadlessSession):
+        """Pick up a newer version saved by another server"""
+        if self.shared.version(session.session_id) != session.version:
+            self._refresh(session)
+
+    def _commit(self, session: HeadlessSession, snapshot: bool = False):
+        """Publish the session to every server, then queue its events for the session store"""
+        try:
+            session.version = self.shared.save(session.session_id, session.assistant,
+                                               session.messages, session.version)
+        except VersionConflict:
+            # Another server ran a turn for this session first; its changes win
+            session.assistant.events.drain()
+            self._refresh(session)
+            raise
+        self.store.save_assistant(session.session_id, session.assistant, snapshot)
+
+    def send_message(self, session: HeadlessSession, message: str, ticket: Optional[Ticket] = None) -> str:
+        """Run one chat turn and return the assistant's reply
+
+        ticket is an LLM slot the caller already waited for; without one
+        the turn queues for a slot here.
+        """
+        with session.lock, self.admission.slot(session.session_id, ticket):
+            self._sync(session)
+            session.add_message("user", message)
+            response = session.assistant.generate_response(message)
+            session.add_message("assistant", response)
+            self._commit(session)
+        return response
+
+    def stream_message(self, session: HeadlessSession, message: str,
+                       ticket: Optional[Ticket] = None) -> Iterator[str]:
+        """Run one chat turn, yielding the reply in chunks as it is generated"""
+        with session.lock, self.admission.slot(session.session_id, ticket):
+            self._sync(session)
+            session.add_message("user", message)
+            parts = []
+            try:
+                for delta in session.assistant.generate_response_stream(message):
+                    parts.append(delta)
+                    yield delta
+            except GeneratorExit:
+                # The client disconnected; keep whatever was generated
+                session.add_message("assistant", "".join(parts))
+                try:
+                    self._commit(session)
+                except VersionConflict:
+                    pass
+                raise
+            session.add_message("assistant", "".join(parts))
+            self._commit(session)
+
+    def state(self, session: HeadlessSession) -> Dict[str, object]:
+        """Conversation state and transcript"""
+        with session.lock:
+            self._sync(session)
+            return {
+                "session_id": session.session_id,
+                "version": session.version,
+                "state": session.assistant.to_dict(),
+                "messages": list(session.messages)
+            }
+
+    def metrics(self) -> Dict[str, object]:
+        """Operational counters for monitoring"""
+        return {
+            "sessions_in_memory": len(self._sessions),
+            "memory": self.memory.metrics(),
+            "llm": get_llm_client().metrics(),
+            "admission": {
+                "active": self.admission.active,
+                "queued": self.admission.queued,
+                "admitted_total": self.admission.admitted_total,
+                "rejected_total": self.admission.rejected_total
+            },
+            "rate_limited_total": self.rate_limits.rejected
+        }
+
+    def export(self, session: HeadlessSession, fmt: str = "json") -> str:
+        """Export the session in the same shape as the Streamlit download buttons"""
+        data = session_export_data(self.state(session))
+        return export_to_csv(data) if fmt == "csv" else export_to_json(data)
+
+
+def _error(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+def _sse(deltas: Iterator[str]) -> Iterator[str]:
+    """Frame response chunks as Server-Sent Events"""
+    try:
+        for delta in deltas:
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+    except VersionConflict as e:
+        yield f"event: conflict\ndata: {json.dumps({'error': str(e)})}\n\n"
+        return
+    except Overloaded as e:
+        yield f"event: busy\ndata: {json.dumps({'error': str(e)})}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
+
+
+async def _admitted(admission: AdmissionController, ticket: Ticket):
+    """Wait for a ticket on the event loop, leaving the queue if the request goes away"""
+    try:
+        await admission.wait_async(ticket)
+    except BaseException:
+        admission.release(ticket)
+        raise
+
+
+def make_app(service: Optional[ScreeningService] = None) -> Starlette:
+    """Build the ASGI application around a screening service"""
+    service = service or ScreeningService()
+
+    async def stream_turn(session: HeadlessSession, message: str) -> AsyncIterator[str]:
+        try:
+            ticket = service.admission.enter(session.session_id)
+        except Overloaded as e:
+            yield f"event: busy\ndata: {json.dumps({'error': str(e)})}\n\n"
+            return
+        try:
+            await _admitted(service.admission, ticket)
+            async for frame in iterate_in_threadpool(_sse(service.stream_message(session, message, ticket))):
+                yield frame
+        finally:
+            # The turn releases its slot when it finishes; this covers a stream abandoned before it starts
+            service.admission.release(ticket)
+
+    async def load(request: Request) -> Optional[HeadlessSession]:
+        return await run_in_threadpool(service.get_session, request.path_params["session_id"])
+
+    async def create_session(request: Request) -> Response:
+        session = await run_in_threadpool(service.create_session)
+        return JSONResponse(await run_in_threadpool(service.state, session), status_code=201)
+
+    async def get_state(request: Request) -> Response:
+        session = await load(request)
+        if session is None:
+            return _error(404, "Session not found")
+        return JSONResponse(await run_in_threadpool(service.state, session))
+
+    async def delete_session(request: Request) -> Response:
+        session = await load(request)
+        if session is None:
+            return _error(404, "Session not found")
+        await run_in_threadpool(service.delete_session, session)
+        return Response(status_code=204)
+
+    async def send_message(request: Request) -> Response:
+        session = await load(request)
+        if session is None:
+            return _error(404, "Session not found")
+        try:
+            body = await request.json()
+        except ValueError:
+            return _error(400, "Request body must be JSON")
+        message = body.get("message") if isinstance(body, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            return _error(400, "'message' must be a non-empty string")
+        retry_after = service.rate_limits.check(session.session_id, request.client.host if request.client else None)
+        if retry_after:
+            response = _error(429, "Too many messages; slow down")
+            response.headers["Retry-After"] = str(math.ceil(retry_after))
+            return response
+
+        if request.query_params.get("stream") in ("1", "true"):
+            return StreamingResponse(stream_turn(session, message),
+                                     media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache"})
+        try:
+            ticket = service.admission.enter(session.session_id)
+        except Overloaded as e:
+            return _error(503, str(e))
+        # Only admitted turns take a worker thread, which then releases the slot
+        await _admitted(service.admission, ticket)
+        try:
+            response = await run_in_threadpool(service.send_message, session, message, ticket)
+        except VersionConflict as e:
+            return _error(409, str(e))
+        return JSONResponse({
+            "session_id": session.session_id,
+            "response": response,
+            "conversation_state": session.assistant.conversation_state
+        })
+
+    async def export(request: Request) -> Response:
+        session = await load(request)
+        if session is None:
+            return _error(404, "Session not found")
+        fmt = request.query_params.get("format", "json")
+        if fmt not in EXPORT_MEDIA_TYPES:
+            return _error(400, f"Unsupported export format: {fmt}")
+        content = await run_in_threadpool(service.export, session, fmt)
+        return Response(content, media_type=EXPORT_MEDIA_TYPES[fmt], headers={
+            "Content-Disposition": f'attachment; filename="talent_scout_{session.session_id}.{fmt}"'
+        })
+
+    async def metrics(request: Request) -> Response:
+        return JSONResponse(await run_in_threadpool(service.metrics))
+
+    return Starlette(
+        routes=[
+            Route("/metrics", metrics, methods=["GET"]),
+            Route("/sessions", create_session, methods=["POST"]),
+            Route("/sessions/{session_id}", get_state, methods=["GET"]),
+            Route("/sessions/{session_id}", delete_session, methods=["DELETE"]),
+            Route("/sessions/{session_id}/messages", send_message, methods=["POST"]),
+            Route("/sessions/{session_id}/export", export, methods=["GET"])
+        ],
+        middleware=[
+            Middleware(CORSMiddleware, allow_origins=API_CORS_ORIGINS,
+                       allow_methods=["GET", "POST", "DELETE"], allow_headers=["*"])
+        ]
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the headless API server"""
+    parser = argparse.ArgumentParser(description="Serve TalentScout screenings over HTTP")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    uvicorn.run(make_app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
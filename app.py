@@ -1,34 +1,36 @@
 import streamlit as st
-import openai
-import json
+import math
 import os
+import uuid
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Try to import pandas, but handle gracefully if not available
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    pd = None
+
 from config import (
-    OPENAI_API_KEY, OPENAI_MODEL, OPENAI_MAX_TOKENS, OPENAI_TEMPERATURE, OPENAI_BASE_URL,
-    APP_TITLE, APP_ICON, CONVERSATION_STATES, REQUIRED_FIELDS, 
-    EXIT_KEYWORDS, FALLBACK_QUESTIONS, validate_config, get_config_info
+    APP_TITLE, APP_ICON, WELCOME_MESSAGE, CHAT_HISTORY_RECENT, CHAT_HISTORY_PAGE_SIZE,
+    TURN_POLL_INTERVAL, GRADING_COMMIT_ATTEMPTS
 )
 from utils import (
-    extract_email, extract_phone, extract_experience_years, extract_name,
-    extract_position, extract_location, extract_tech_stack, validate_candidate_info,
     format_session_data, export_to_json, export_to_csv, generate_conversation_summary,
-    sanitize_input, get_tech_stack_categories
+    PANDAS_AVAILABLE
 )
-
-# Validate configuration
-try:
-    validate_config()
-except ValueError as e:
-    st.error(str(e))
+from assistant import HiringAssistant, Grader
+from session_store import get_session_store
+from state_backend import get_shared_state, VersionConflict
+from export_cache import ExportCache, session_version_key as export_version_key
+from turn_worker import get_turn_worker
+from admission import get_rate_limits, ordinal
+from resources import get_health_monitor, config_info as get_config_info, tech_stack_categories
+from profiling import profiled
+from session_memory import Transcript, as_transcript, get_session_memory
+
+# Export builders, profiled when TALENTSCOUT_PROFILE is set (unwrapped otherwise)
+build_json_export = profiled("export_json")(export_to_json)
+build_csv_export = profiled("export_csv")(export_to_csv)
+
+# Validate configuration; the probe runs in the background and its result is
+# shared across reruns and sessions, so the first render never waits on it
+health_error = get_health_monitor().check()
+if health_error:
+    st.error(health_error)
     st.stop()
 
 # Page configuration
@@ -81,212 +83,256 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class HiringAssistant:
-    def __init__(self):
-        self.conversation_state = CONVERSATION_STATES['GREETING']
-        self.candidate_info = {}
-        self.tech_stack = []
-        self.technical_questions = []
-        self.current_question_index = 0
-        
-    def get_system_prompt(self):
-        """Get the system prompt for the AI assistant"""
-        return """You are TalentScout, an intelligent hiring assistant for a technology recruitment agency. Your role is to:
-
-1. Greet candidates warmly and explain your purpose
-2. Collect essential candidate information systematically
-3. Gather their tech stack details
-4. Generate relevant technical questions based on their tech stack
-5. Conduct a technical assessment
-6. End the conversation gracefully
-
-Key Guidelines:
-- Be professional, friendly, and encouraging
-- Ask one question at a time
-- Maintain context throughout the conversation
-- If you encounter conversation-ending keywords (goodbye, exit, quit, end, stop), gracefully conclude
-- Keep responses concise but informative
-- Always stay in character as a hiring assistant
-
-Current conversation state: {state}
-
-Candidate information collected so far: {info}
-
-Tech stack: {tech_stack}
-
-Technical questions generated: {questions}
-
-Current question index: {question_index}
-
-Respond appropriately based on the current state and context."""
-
-    def generate_response(self, user_input):
-        """Generate AI response based on user input and current state"""
-        try:
-            # Sanitize user input
-            user_input = sanitize_input(user_input)
-            
-            # Check for conversation ending keywords
-            if any(keyword in user_input.lower() for keyword in EXIT_KEYWORDS):
-                return self.end_conversation()
-            
-            # Prepare context for the AI
-            context = {
-                'state': self.conversation_state,
-                'info': self.candidate_info,
-                'tech_stack': self.tech_stack,
-                'questions': self.technical_questions,
-                'question_index': self.current_question_index
-            }
-            
-            system_prompt = self.get_system_prompt().format(**context)
-            
-            client = openai.OpenAI(
-                api_key="local",  # Not needed for local LLMs
-                base_url=OPENAI_BASE_URL
-            )
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input}
-                ],
-                max_tokens=OPENAI_MAX_TOKENS,
-                temperature=OPENAI_TEMPERATURE
-            )
-            
-            ai_response = response.choices[0].message.content
-            
-            # Update conversation state based on AI response
-            self.update_conversation_state(user_input, ai_response)
-            
-            return ai_response
-            
-        except Exception as e:
-            return f"I apologize, but I'm experiencing technical difficulties. Please try again. Error: {str(e)}"
-
-    def update_conversation_state(self, user_input, ai_response):
-        """Update conversation state based on user input and AI response"""
-        # Extract information from user input based on current state
-        if self.conversation_state == CONVERSATION_STATES['GREETING']:
-            self.conversation_state = CONVERSATION_STATES['COLLECTING_INFO']
-            
-        elif self.conversation_state == CONVERSATION_STATES['COLLECTING_INFO']:
-            # Try to extract candidate information
-            self.extract_candidate_info(user_input)
-            
-            # Check if we have all required information
-            if all(field in self.candidate_info for field in REQUIRED_FIELDS):
-                self.conversation_state = CONVERSATION_STATES['COLLECTING_TECH_STACK']
-                
-        elif self.conversation_state == CONVERSATION_STATES['COLLECTING_TECH_STACK']:
-            # Extract tech stack information
-            self.extract_tech_stack(user_input)
-            if self.tech_stack:
-                self.conversation_state = CONVERSATION_STATES['GENERATING_QUESTIONS']
-                self.generate_technical_questions()
-                
-        elif self.conversation_state == CONVERSATION_STATES['GENERATING_QUESTIONS']:
-            self.conversation_state = CONVERSATION_STATES['TECHNICAL_ASSESSMENT']
-            
-        elif self.conversation_state == CONVERSATION_STATES['TECHNICAL_ASSESSMENT']:
-            # Track answers to technical questions
-            if self.current_question_index < len(self.technical_questions):
-                self.current_question_index += 1
-                
-            if self.current_question_index >= len(self.technical_questions):
-                self.conversation_state = CONVERSATION_STATES['CONCLUSION']
-
-    def extract_candidate_info(self, user_input):
-        """Extract candidate information from user input"""
-        # Use utility functions for better extraction
-        name = extract_name(user_input)
-        if name:
-            self.candidate_info['name'] = name
-            
-        email = extract_email(user_input)
-        if email:
-            self.candidate_info['email'] = email
-            
-        phone = extract_phone(user_input)
-        if phone:
-            self.candidate_info['phone'] = phone
-            
-        experience = extract_experience_years(user_input)
-        if experience:
-            self.candidate_info['experience'] = experience
-            
-        position = extract_position(user_input)
-        if position:
-            self.candidate_info['position'] = position
-            
-        location = extract_location(user_input)
-        if location:
-            self.candidate_info['location'] = location
-
-    def extract_tech_stack(self, user_input):
-        """Extract tech stack from user input"""
-        found_tech = extract_tech_stack(user_input)
-        for tech in found_tech:
-            if tech not in self.tech_stack:
-                self.tech_stack.append(tech)
-
-    def generate_technical_questions(self):
-        """Generate technical questions based on tech stack"""
-        if not self.tech_stack:
+def add_message(role, content):
+    """Append a message to the transcript and record it in the event log"""
+    st.session_state.messages.append({"role": role, "content": content})
+    st.session_state.assistant.record_message(role, content)
+
+def persist_assistant_state(snapshot=False):
+    """Publish changes to every app process, then queue their events for the session store"""
+    session_id = st.session_state.session_id
+    assistant = st.session_state.assistant
+    if get_turn_worker().pending(session_id) or assistant.events.last_seq == st.session_state.get("shared_seq"):
+        # Mid-turn state is never shared; the finished turn is saved when collected
+        return
+    try:
+        st.session_state.state_version = get_shared_state().save(
+            session_id, assistant, st.session_state.messages, st.session_state.state_version
+        )
+    except VersionConflict:
+        # Another process served this session since it was loaded here; its changes win
+        assistant.events.drain()
+        adopt_shared_state(get_shared_state().load(session_id))
+        st.warning("This conversation was continued in another window, so your last message was not saved. Please send it again.")
+        return
+    st.session_state.shared_seq = assistant.events.last_seq
+    get_session_store().save_assistant(session_id, assistant, snapshot)
+
+def adopt_shared_state(stored):
+    """Replace this run's session with a record loaded from the shared state"""
+    st.session_state.messages = stored["messages"]
+    st.session_state.assistant = attach_grader(st.session_state.session_id, HiringAssistant.from_stored(stored),
+                                               stored["version"])
+    st.session_state.conversation_started = bool(stored["messages"])
+    st.session_state.state_version = stored["version"]
+    st.session_state.shared_seq = stored["last_seq"]
+    st.session_state.pop("history_pages", None)
+
+def attach_grader(session_id, assistant, version=None):
+    """Save the assistant's background grading, resuming grading abandoned by another process
+
+    version is the shared state version the assistant was loaded from, if any.
+    """
+    shared = get_shared_state()
+    assistant.grader = Grader(
+        claim=lambda graded: shared.claim_grading(session_id),
+        complete=lambda graded, assessment: save_assessment(session_id, graded, assessment)
+    )
+    # The lease is only free if the process grading it gave up or went away
+    if assistant.grading_pending and shared.claim_grading(session_id, based_on_version=version):
+        assistant.resume_assessment_grading()
+    return assistant
+
+def save_assessment(session_id, assistant, assessment):
+    """Save a finished background grading; runs on the grading thread, outside any script run"""
+    shared = get_shared_state()
+    worker = get_turn_worker()
+    # Waits for a script run of this session, which saves its own changes
+    with get_session_memory().in_use(session_id):
+        if worker.pending(session_id) or worker.has_finished(session_id):
+            # The turn is saved with the result once collected; the lease is
+            # left to expire, so no other process grades it again meanwhile
+            assistant.apply_assessment(assessment)
             return
-            
         try:
-            prompt = f"""Generate 3-5 technical questions for a candidate with the following tech stack: {', '.join(self.tech_stack)}.
-            
-            For each technology, create relevant questions that assess:
-            1. Basic understanding
-            2. Practical experience
-            3. Problem-solving skills
-            
-            Format the response as a JSON array of questions."""
-            
-            client = openai.OpenAI(
-                api_key="local",  # Not needed for local LLMs
-                base_url=OPENAI_BASE_URL
-            )
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a technical interviewer. Generate relevant technical questions based on the provided tech stack."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            
-            questions_text = response.choices[0].message.content
-            # Try to parse as JSON, fallback to simple list
-            try:
-                self.technical_questions = json.loads(questions_text)
-            except:
-                # Fallback: split by lines and clean up
-                self.technical_questions = [q.strip() for q in questions_text.split('\n') if q.strip()]
-                
-        except Exception as e:
-            # Fallback questions
-            self.technical_questions = FALLBACK_QUESTIONS
-
-    def end_conversation(self):
-        """End the conversation gracefully"""
-        self.conversation_state = CONVERSATION_STATES['CONCLUSION']
-        return """Thank you for your time and for sharing your information with TalentScout! 
-
-I've collected your details and conducted a brief technical assessment. Our recruitment team will review your profile and get back to you within 2-3 business days.
-
-Here's a summary of what we discussed:
-- Your information has been recorded
-- Your tech stack has been noted
-- Technical assessment completed
-
-If you have any questions or need to update your information, please don't hesitate to reach out to our team.
-
-Good luck with your application! """
+            for _ in range(GRADING_COMMIT_ATTEMPTS):
+                stored = shared.load(session_id)
+                if stored is None:
+                    # Never shared yet; the next run saves it with the session
+                    assistant.apply_assessment(assessment)
+                    return
+                # Saved on top of the latest shared version; the session's next run adopts it
+                graded = HiringAssistant.from_stored(stored)
+                if not graded.apply_assessment(assessment):
+                    return
+                try:
+                    shared.save(session_id, graded, stored["messages"], stored["version"])
+                except VersionConflict:
+                    continue
+                get_session_store().save_assistant(session_id, graded)
+                return
+        finally:
+            shared.release_grading(session_id)
+
+def sync_shared_state():
+    """Pick up a newer version of this session saved by another app process"""
+    session_id = st.session_state.session_id
+    if get_turn_worker().pending(session_id):
+        return
+    if get_shared_state().version(session_id) != st.session_state.state_version:
+        stored = get_shared_state().load(session_id)
+        if stored:
+            adopt_shared_state(stored)
+
+def track_session_memory():
+    """Note this session's activity and release the memory of sessions left idle"""
+    worker = get_turn_worker()
+    memory = get_session_memory()
+    memory.touch(st.session_state.session_id, st.session_state.messages, st.session_state.assistant,
+                 caches=[st.session_state.get('export_cache')])
+    # Sessions with turns in flight or waiting to be collected are never idle
+    memory.sweep(busy=lambda session_id: bool(worker.pending(session_id)) or worker.has_finished(session_id))
+
+def collect_finished_turns():
+    """Move turns finished by the background worker into the transcript"""
+    finished = get_turn_worker().collect(st.session_state.session_id)
+    for job in finished:
+        # The assistant already logged both messages while running the turn,
+        # including the apology recorded as the response of a failed turn
+        st.session_state.messages.append({"role": "user", "content": job.prompt})
+        st.session_state.messages.append({"role": "assistant", "content": job.response})
+    if finished:
+        persist_assistant_state()
+
+@st.fragment(run_every=TURN_POLL_INTERVAL)
+def show_pending_turns():
+    """Show queued and running turns, rerunning the app once one finishes"""
+    worker = get_turn_worker()
+    if worker.has_finished(st.session_state.session_id):
+        st.rerun()
+    pending = worker.pending(st.session_state.session_id)
+    for job in pending:
+        with st.chat_message("user"):
+            st.markdown(job.prompt)
+    if pending:
+        with st.chat_message("assistant"):
+            queued = len(pending) - 1
+            position = worker.position(pending[0])
+            status = (f"_TalentScout is busy with other candidates; you are {ordinal(position)} in line..._"
+                      if position else "_TalentScout is typing..._")
+            st.markdown(status + (f" ({queued} more queued)" if queued else ""))
+
+def restore_session():
+    """Resume the session named in the URL on any app process, or start a new one"""
+    session_id = st.query_params.get("session")
+    st.session_state.state_version = 0
+    shared = get_shared_state().load(session_id) if session_id else None
+    # Sessions saved before shared state existed are only in the session store
+    stored = shared or (get_session_store().load_session(session_id) if session_id else None)
+    if shared:
+        st.session_state.session_id = session_id
+        adopt_shared_state(shared)
+    elif stored:
+        st.session_state.session_id = session_id
+        st.session_state.messages = as_transcript(session_id, stored["messages"])
+        st.session_state.assistant = attach_grader(session_id, HiringAssistant.from_stored(stored))
+        st.session_state.conversation_started = bool(stored["messages"])
+    else:
+        st.session_state.session_id = uuid.uuid4().hex
+    st.query_params["session"] = st.session_state.session_id
+
+def history_page_markdown(start, end):
+    """Combined markdown for a range of past messages, built once per page"""
+    # Past messages never change, so a page is keyed by its position alone; only
+    # the page being viewed is kept, as older pages may have been spilled to disk
+    key = (st.session_state.session_id, start, end)
+    if key not in st.session_state.get('history_pages', {}):
+        st.session_state.history_pages = {key: "\n\n---\n\n".join(
+            f"**{'You' if m['role'] == 'user' else 'TalentScout'}:** {m['content']}"
+            for m in st.session_state.messages[start:end]
+        )}
+    return st.session_state.history_pages[key]
+
+def render_chat_history():
+    """Render recent messages in full and older ones as collapsed pages"""
+    messages = st.session_state.messages
+    recent_start = max(0, len(messages) - CHAT_HISTORY_RECENT)
+    
+    if recent_start and st.toggle(f" Show {recent_start} earlier messages", key="show_history"):
+        # Pages are aligned to fixed boundaries so full pages stay cached
+        pages = (recent_start + CHAT_HISTORY_PAGE_SIZE - 1) // CHAT_HISTORY_PAGE_SIZE
+        page = st.number_input("History page", min_value=1, max_value=pages, value=pages, key="history_page")
+        start = (page - 1) * CHAT_HISTORY_PAGE_SIZE
+        end = min(start + CHAT_HISTORY_PAGE_SIZE, recent_start)
+        st.caption(f"Messages {start + 1}-{end} of {len(messages)}")
+        st.markdown(history_page_markdown(start, end))
+    
+    for message in messages[recent_start:]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+def session_version_key():
+    """Cheap change counter identifying the current state of the session"""
+    return export_version_key(st.session_state.session_id, st.session_state.assistant, st.session_state.messages)
+
+def show_export_panel():
+    """Render the export panel, building each payload only once per version"""
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = ExportCache()
+    cache = st.session_state.export_cache
+    version_key = session_version_key()
+    assistant = st.session_state.assistant
+    messages = st.session_state.messages
+    message_count = len(messages)
+
+    # Closures capture the objects themselves: download callables run on a
+    # separate thread where st.session_state is not available
+    def session_data():
+        return cache.get(version_key, "session", lambda: format_session_data(
+            assistant.candidate_info,
+            assistant.tech_stack,
+            messages[:message_count],
+            assistant.technical_questions,
+            assistant.assessment
+        ))
+
+    def json_payload():
+        return cache.get(version_key, "json", lambda: build_json_export(session_data()))
+
+    def csv_payload():
+        return cache.get(version_key, "csv", lambda: build_csv_export(session_data()))
+
+    # Display session summary
+    st.subheader(" Session Summary")
+    st.text(cache.get(version_key, "summary", lambda: generate_conversation_summary(
+        messages[:message_count], assistant.conversation_stats
+    )))
+    
+    # Display tech stack categories
+    if assistant.tech_stack:
+        st.subheader("🛠️ Tech Stack Categories")
+        categories = tech_stack_categories(tuple(assistant.tech_stack))
+        for category, techs in categories.items():
+            st.write(f"**{category}:** {', '.join(techs)}")
+    
+    # Convert to DataFrame for display
+    if PANDAS_AVAILABLE:
+        import pandas as pd  # deferred: only the export panel needs it
+        df = cache.get(version_key, "dataframe", lambda: pd.DataFrame([session_data()]))
+        st.dataframe(df)
+    else:
+        # Display as JSON if pandas is not available
+        st.json(session_data())
+    
+    # Download options: serialised only when a download is requested
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label=" Download JSON",
+            data=json_payload,
+            file_name=f"talent_scout_session_{timestamp}.json",
+            mime="application/json",
+            on_click="ignore"
+        )
+    with col2:
+        st.download_button(
+            label=" Download CSV",
+            data=csv_payload,
+            file_name=f"talent_scout_session_{timestamp}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
 
 def main():
     # Header
@@ -322,61 +368,70 @@ def main():
         """)
         
         # Environment setup info
-        try:
-            import requests
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            if response.status_code == 200:
-                st.success(" Ollama is running and ready!")
-            else:
-                st.error(" Ollama is not responding properly!")
-        except Exception as e:
+        if not get_health_monitor().known:
+            st.info(" Checking Ollama...")
+        elif get_health_monitor().check() is None:
+            st.success(" Ollama is running and ready!")
+        else:
             st.error(" Cannot connect to Ollama!")
             st.info("Please install and start Ollama:\n1. Install from: https://ollama.ai/\n2. Run: ollama serve\n3. Pull a model: ollama pull llama2")
 
     # Initialize session state
+    if 'session_id' not in st.session_state:
+        restore_session()
+    else:
+        sync_shared_state()
+
+    # Held for the rest of the run, so the session's memory is never released while in use
+    with get_session_memory().in_use(st.session_state.session_id):
+        show_session()
+
+def show_session():
+    """Chat interface and session panels for the current session"""
     if 'messages' not in st.session_state:
-        st.session_state.messages = []
+        st.session_state.messages = Transcript(st.session_state.session_id)
         
     if 'assistant' not in st.session_state:
-        st.session_state.assistant = HiringAssistant()
+        st.session_state.assistant = attach_grader(st.session_state.session_id, HiringAssistant())
         
     if 'conversation_started' not in st.session_state:
         st.session_state.conversation_started = False
 
+    track_session_memory()
+
     # Main chat interface
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    # Pick up turns the background worker finished since the last run
+    collect_finished_turns()
+    
+    # Display chat messages; only the most recent ones are rendered in full
+    render_chat_history()
     
     # Start conversation if not started
     if not st.session_state.conversation_started:
-        welcome_message = """Hello!  I'm TalentScout, your AI hiring assistant. 
-
-I'm here to help you with the initial screening process for technology positions. I'll be collecting some basic information about you and conducting a brief technical assessment.
-
-Let's get started! Please tell me your full name."""
-        
-        st.session_state.messages.append({"role": "assistant", "content": welcome_message})
+        add_message("assistant", WELCOME_MESSAGE)
+        persist_assistant_state(snapshot=True)
         st.session_state.conversation_started = True
         
         with st.chat_message("assistant"):
-            st.markdown(welcome_message)
+            st.markdown(WELCOME_MESSAGE)
 
-    # Chat input
+    # Chat input; turns run in the background so reruns never lose them, and
+    # an identical message submitted while it is still pending is ignored
     if prompt := st.chat_input("Type your message here..."):
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.markdown(prompt)
-
-        # Generate assistant response
-        with st.chat_message("assistant"):
-            response = st.session_state.assistant.generate_response(prompt)
-            st.markdown(response)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+        retry_after = get_rate_limits().check(st.session_state.session_id, st.context.ip_address)
+        if retry_after:
+            st.warning(f"You're sending messages too quickly. Please wait {math.ceil(retry_after)} seconds and send it again.")
+        else:
+            get_turn_worker().submit(st.session_state.session_id, st.session_state.assistant, prompt)
+    
+    worker = get_turn_worker()
+    if worker.pending(st.session_state.session_id):
+        show_pending_turns()
+    elif worker.has_finished(st.session_state.session_id):
+        # The turn finished before this run got here; show it straight away
+        st.rerun()
 
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -386,52 +441,16 @@ Let's get started! Please tell me your full name."""
         st.write("**Candidate Info:**", st.session_state.assistant.candidate_info)
         st.write("**Tech Stack:**", st.session_state.assistant.tech_stack)
         st.write("**Questions Generated:**", len(st.session_state.assistant.technical_questions))
+        st.write("**Answers Recorded:**", len(st.session_state.assistant.technical_answers))
+        if st.session_state.assistant.assessment:
+            st.write("**Assessment Status:**", st.session_state.assistant.assessment.get("status"))
         
-        # Export data option
-        if st.button(" Export Session Data"):
-            session_data = format_session_data(
-                st.session_state.assistant.candidate_info,
-                st.session_state.assistant.tech_stack,
-                st.session_state.messages,
-                st.session_state.assistant.technical_questions
-            )
-            
-            # Display session summary
-            st.subheader(" Session Summary")
-            summary = generate_conversation_summary(st.session_state.messages)
-            st.text(summary)
-            
-            # Display tech stack categories
-            if st.session_state.assistant.tech_stack:
-                st.subheader("🛠️ Tech Stack Categories")
-                categories = get_tech_stack_categories(st.session_state.assistant.tech_stack)
-                for category, techs in categories.items():
-                    st.write(f"**{category}:** {', '.join(techs)}")
-            
-            # Convert to DataFrame for display
-            if PANDAS_AVAILABLE:
-                df = pd.DataFrame([session_data])
-                st.dataframe(df)
-            else:
-                # Display as JSON if pandas is not available
-                st.json(session_data)
-            
-            # Download options
-            col1, col2 = st.columns(2)
-            with col1:
-                st.download_button(
-                    label=" Download JSON",
-                    data=export_to_json(session_data),
-                    file_name=f"talent_scout_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
-            with col2:
-                st.download_button(
-                    label=" Download CSV",
-                    data=export_to_csv(session_data),
-                    file_name=f"talent_scout_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+        # Export data option; payloads are memoized per session version
+        if st.toggle(" Export Session Data", key="export_panel_open"):
+            show_export_panel()
+
+    # Pick up events recorded outside a chat turn, e.g. by background grading
+    persist_assistant_state()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Technical assessment grading for TalentScout Hiring Assistant
+
+Answers are recorded against their questions during the conversation and
+graded together in a single structured-output LLM request once the
+assessment is over, instead of one request per answer.
+"""
+
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+from config import OPENAI_MODEL, ASSESSMENT_MAX_TOKENS, ASSESSMENT_TEMPERATURE, ASSESSMENT_MAX_SCORE
+
+
+@lru_cache(maxsize=128)
+def build_rubric_prompt(tech_stack: Tuple[str, ...]) -> str:
+    """Build (and cache) the grading system prompt for a tech stack"""
+    stack = ", ".join(tech_stack) if tech_stack else "general software engineering"
+    return f"""You are a senior technical interviewer grading a candidate's written answers.
+The candidate's declared tech stack is: {stack}.
+
+Grade every answer on a scale from 0 to {ASSESSMENT_MAX_SCORE} using this rubric:
+- Correctness: is the answer technically accurate?
+- Depth: does it show practical experience beyond definitions?
+- Clarity: is the explanation clear and well structured?
+
+Give 0 to answers that are empty, off-topic or refuse to answer.
+
+Respond with JSON only, in exactly this shape:
+{{"grades": [{{"index": <question number>, "score": <integer 0-{ASSESSMENT_MAX_SCORE}>, "feedback": "<one sentence>"}}]}}
+Include one entry per question, using the question numbers given."""
+
+
+def build_grading_request(answers: List[Dict[str, str]]) -> str:
+    """Render all question/answer pairs into one grading request"""
+    parts = []
+    for i, item in enumerate(answers, 1):
+        parts.append(f"Question {i}: {item['question']}\nAnswer {i}: {item['answer']}")
+    return "\n\n".join(parts)
+
+
+def parse_grades(response_text: str, count: int) -> List[Dict[str, Any]]:
+    """Parse the grader's JSON reply into one grade per answer"""
+    try:
+        payload = json.loads(response_text)
+    except (TypeError, ValueError):
+        # Some local models wrap the JSON in prose; take the outermost object
+        match = re.search(r'\{.*\}', response_text or "", re.DOTALL)
+        payload = json.loads(match.group(0)) if match else {}
+
+    entries = payload.get("grades", []) if isinstance(payload, dict) else payload
+    grades: List[Dict[str, Any]] = [{"score": None, "feedback": ""} for _ in range(count)]
+    for position, entry in enumerate(entries if isinstance(entries, list) else []):
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index", position + 1)
+        try:
+            index = int(index) - 1
+            score = max(0, min(ASSESSMENT_MAX_SCORE, int(entry.get("score"))))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            grades[index] = {"score": score, "feedback": str(entry.get("feedback", ""))}
+    return grades
+
+
+def grade_answers(client, answers: List[Dict[str, str]], tech_stack: List[str],
+                  model: str = OPENAI_MODEL) -> Dict[str, Any]:
+    """Grade every recorded answer with a single LLM request"""
+    result: Dict[str, Any] = {
+        "status": "graded",
+        "graded_at": datetime.now().isoformat(),
+        "model": model,
+        "max_score": ASSESSMENT_MAX_SCORE,
+        "grades": [],
+        "average_score": None
+    }
+    if not answers:
+        result["status"] = "no_answers"
+        return result
+
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": build_rubric_prompt(tuple(sorted(tech_stack)))},
+                {"role": "user", "content": build_grading_request(answers)}
+            ],
+            max_tokens=ASSESSMENT_MAX_TOKENS,
+            temperature=ASSESSMENT_TEMPERATURE,
+            response_format={"type": "json_object"}
+        )
+        grades = parse_grades(response.choices[0].message.content, len(answers))
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+        grades = [{"score": None, "feedback": ""} for _ in answers]
+
+    result["grades"] = [
+        {"question": item["question"], "answer": item["answer"], **grade}
+        for item, grade in zip(answers, grades)
+    ]
+    scores = [g["score"] for g in grades if g["score"] is not None]
+    if scores:
+        result["average_score"] = round(sum(scores) / len(scores), 2)
+    return result
+
@@ -0,0 +1,479 @@
+"""
+Conversation logic for TalentScout Hiring Assistant
+"""
+
+import json
+import sys
+import threading
+
+from config import (
+    OPENAI_MODEL, OPENAI_MAX_TOKENS, OPENAI_TEMPERATURE,
+    CONVERSATION_STATES, EXIT_KEYWORDS, FALLBACK_QUESTIONS
+)
+from utils import (
+    extract_email, extract_phone, extract_experience_years, extract_name,
+    extract_position, extract_location, extract_tech_stack, sanitize_input,
+    ConversationStats
+)
+from assessment import grade_answers
+from llm_client import get_llm_client
+from event_log import (
+    EventLog, MESSAGE_ADDED, FIELD_EXTRACTED, STATE_TRANSITION, QUESTIONS_GENERATED,
+    TECH_ADDED, ANSWER_RECORDED, ASSESSMENT_UPDATED
+)
+from assistant_state import AssistantState, ConversationState, CandidateField, encode_state, decode_state
+from profiling import profiled
+from session_memory import deep_sizeof
+
+
+def _state_attribute(name):
+    """Expose an AssistantState field as a HiringAssistant attribute"""
+    return property(lambda self: getattr(self.state, name),
+                    lambda self, value: setattr(self.state, name, value))
+
+
+def _question_text(question):
+    """A question as text; models sometimes send {"question": ...} objects"""
+    if isinstance(question, dict) and isinstance(question.get("question"), str):
+        return question["question"].strip()
+    return question.strip() if isinstance(question, str) else json.dumps(question)
+
+
+def parse_questions(text):
+    """Turn the model's question reply into a list of question strings
+
+    Accepts a JSON array, or an object wrapping one under "questions";
+    anything else is split into one question per non-blank line.
+    """
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        parsed = parsed.get("questions")
+    if isinstance(parsed, str):
+        text = parsed
+    if not isinstance(parsed, list):
+        parsed = str(text).split('\n')
+    return [q for q in (_question_text(question) for question in parsed) if q]
+
+
+class Grader:
+    """Persistence hooks for background grading, supplied by whoever saves the session
+
+    claim(assistant) takes the session's grading lease and returns whether
+    this process should grade; complete(assistant, assessment) stores the
+    result and saves the session from the grading thread.
+    """
+
+    def __init__(self, claim, complete):
+        self.claim = claim
+        self.complete = complete
+
+
+class HiringAssistant:
+    tech_stack = _state_attribute("tech_stack")
+    technical_questions = _state_attribute("technical_questions")
+    current_question_index = _state_attribute("current_question_index")
+    technical_answers = _state_attribute("technical_answers")
+    assessment = _state_attribute("assessment")
+
+    def __init__(self):
+        # Append-only record of every change, persisted instead of full snapshots
+        self.events = EventLog()
+        # Conversation data, in a slotted structure with a compact binary encoding;
+        # packed into that encoding while the session is idle (see release())
+        self._packed_state = None
+        self.state = AssistantState()
+        # Running message counts and topics, so summaries need no rescan
+        self.conversation_stats = ConversationStats()
+        # Saves background grading results; without one they stay in memory
+        self.grader = None
+
+    @property
+    def version(self):
+        """Change counter used to key cached exports
+
+        Every change is logged as an event and the sequence number is saved
+        with the session, so it keeps counting up across reloads.
+        """
+        return self.events.last_seq
+
+    @property
+    def state(self):
+        state = self._state
+        if state is None:
+            state = self._state = decode_state(self._packed_state)
+            self._packed_state = None
+        return state
+
+    @state.setter
+    def state(self, state):
+        self._state = state
+        self._packed_state = None
+
+    def release(self):
+        """Pack the state into its binary encoding until it is next used; returns bytes freed"""
+        state = self._state
+        if state is None or self.grading_pending:
+            # Background grading still writes to this state
+            return 0
+        before = deep_sizeof(state)
+        self._packed_state = encode_state(state)
+        self._state = None
+        return before - sys.getsizeof(self._packed_state)
+
+    def memory_bytes(self):
+        """Approximate bytes held by the conversation state"""
+        if self._state is None:
+            return sys.getsizeof(self._packed_state)
+        return deep_sizeof(self._state)
+
+    @property
+    def conversation_state(self):
+        return self.state.conversation_state.label
+
+    @conversation_state.setter
+    def conversation_state(self, state):
+        new_state = ConversationState.from_label(state)
+        if new_state != self.state.conversation_state:
+            self.events.append(STATE_TRANSITION, **{"from": self.conversation_state, "to": state})
+            self.state.conversation_state = new_state
+
+    @property
+    def candidate_info(self):
+        return self.state.candidate_info
+
+    @candidate_info.setter
+    def candidate_info(self, candidate_info):
+        self.state.candidate_info = candidate_info
+        self.state.collected = CandidateField.collected(candidate_info)
+
+    @property
+    def state_turns(self):
+        """User turns spent in each conversation state, for funnel analytics"""
+        return {state.label: turns for state, turns in self.state.state_turns.items()}
+
+    def record_message(self, role, content):
+        """Record a transcript message in the event log"""
+        if role == "user":
+            turns = self.state.state_turns
+            turns[self.state.conversation_state] = turns.get(self.state.conversation_state, 0) + 1
+        self.conversation_stats.add_message(role, content)
+        self.events.append(MESSAGE_ADDED, role=role, content=content)
+
+    def set_candidate_field(self, field, value):
+        """Store an extracted candidate field, logging it if it changed"""
+        if self.candidate_info.get(field) != value:
+            self.candidate_info[field] = value
+            self.state.collected |= CandidateField.for_name(field)
+            self.events.append(FIELD_EXTRACTED, field=field, value=value)
+
+    def set_assessment(self, assessment):
+        """Store the assessment result and log it"""
+        self.assessment = assessment
+        self.events.append(ASSESSMENT_UPDATED, assessment=assessment)
+
+    def get_system_prompt(self):
+        """Get the system prompt for the AI assistant"""
+        return """You are TalentScout, an intelligent hiring assistant for a technology recruitment agency. Your role is to:
+
+1. Greet candidates warmly and explain your purpose
+2. Collect essential candidate information systematically
+3. Gather their tech stack details
+4. Generate relevant technical questions based on their tech stack
+5. Conduct a technical assessment
+6. End the conversation gracefully
+
+Key Guidelines:
+- Be professional, friendly, and encouraging
+- Ask one question at a time
+- Maintain context throughout the conversation
+- If you encounter conversation-ending keywords (goodbye, exit, quit, end, stop), gracefully conclude
+- Keep responses concise but informative
+- Always stay in character as a hiring assistant
+
+Current conversation state: {state}
+
+Candidate information collected so far: {info}
+
+Tech stack: {tech_stack}
+
+Technical questions generated: {questions}
+
+Current question index: {question_index}
+
+Respond appropriately based on the current state and context."""
+
+    def chat_messages(self, user_input):
+        """System and user messages for one conversation turn"""
+        # Prepare context for the AI
+        context = {
+            'state': self.conversation_state,
+            'info': self.candidate_info,
+            'tech_stack': self.tech_stack,
+            'questions': self.technical_questions,
+            'question_index': self.current_question_index
+        }
+        
+        system_prompt = self.get_system_prompt().format(**context)
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_input}
+        ]
+
+    @profiled("turn")
+    def generate_response(self, user_input):
+        """Generate AI response based on user input and current state"""
+        try:
+            # Sanitize user input
+            user_input = sanitize_input(user_input)
+            
+            # Check for conversation ending keywords
+            if any(keyword in user_input.lower() for keyword in EXIT_KEYWORDS):
+                return self.end_conversation()
+            
+            client = get_llm_client()
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=self.chat_messages(user_input),
+                max_tokens=OPENAI_MAX_TOKENS,
+                temperature=OPENAI_TEMPERATURE
+            )
+            
+            ai_response = response.choices[0].message.content
+            
+            # Update conversation state based on AI response
+            self.update_conversation_state(user_input, ai_response)
+            
+            return ai_response
+            
+        except Exception as e:
+            return f"I apologize, but I'm experiencing technical difficulties. Please try again. Error: {str(e)}"
+
+    def generate_response_stream(self, user_input):
+        """Yield the AI response in chunks as it is generated, then update state"""
+        try:
+            user_input = sanitize_input(user_input)
+            
+            if any(keyword in user_input.lower() for keyword in EXIT_KEYWORDS):
+                yield self.end_conversation()
+                return
+            
+            client = get_llm_client()
+            stream = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=self.chat_messages(user_input),
+                max_tokens=OPENAI_MAX_TOKENS,
+                temperature=OPENAI_TEMPERATURE,
+                stream=True
+            )
+            
+            parts = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            self.update_conversation_state(user_input, "".join(parts))
+            
+        except Exception as e:
+            yield f"I apologize, but I'm experiencing technical difficulties. Please try again. Error: {str(e)}"
+
+    def update_conversation_state(self, user_input, ai_response):
+        """Update conversation state based on user input and AI response"""
+        # Extract information from user input based on current state
+        if self.conversation_state == CONVERSATION_STATES['GREETING']:
+            self.conversation_state = CONVERSATION_STATES['COLLECTING_INFO']
+            
+        elif self.conversation_state == CONVERSATION_STATES['COLLECTING_INFO']:
+            # Try to extract candidate information
+            self.extract_candidate_info(user_input)
+            
+            # Check if we have all required information
+            if self.state.has_required_fields:
+                self.conversation_state = CONVERSATION_STATES['COLLECTING_TECH_STACK']
+                
+        elif self.conversation_state == CONVERSATION_STATES['COLLECTING_TECH_STACK']:
+            # Extract tech stack information
+            self.extract_tech_stack(user_input)
+            if self.tech_stack:
+                self.conversation_state = CONVERSATION_STATES['GENERATING_QUESTIONS']
+                self.generate_technical_questions()
+                
+        elif self.conversation_state == CONVERSATION_STATES['GENERATING_QUESTIONS']:
+            self.conversation_state = CONVERSATION_STATES['TECHNICAL_ASSESSMENT']
+            
+        elif self.conversation_state == CONVERSATION_STATES['TECHNICAL_ASSESSMENT']:
+            # Record the answer against the current question; grading is deferred
+            if self.current_question_index < len(self.technical_questions):
+                self.record_answer(user_input)
+                self.current_question_index += 1
+                
+            if self.current_question_index >= len(self.technical_questions):
+                self.conversation_state = CONVERSATION_STATES['CONCLUSION']
+                self.start_assessment_grading()
+
+    def record_answer(self, answer):
+        """Record an answer against the current technical question"""
+        if not 0 <= self.current_question_index < len(self.technical_questions):
+            return
+        question = self.technical_questions[self.current_question_index]
+        self.technical_answers.append({"question": question, "answer": answer})
+        self.events.append(ANSWER_RECORDED, question=question, answer=answer)
+
+    def grade_assessment(self):
+        """Grade all recorded answers in one batched LLM request"""
+        if self.assessment is not None and not self.grading_pending:
+            return self.assessment
+        client = get_llm_client()
+        self.set_assessment(grade_answers(client, list(self.technical_answers), self.tech_stack))
+        return self.assessment
+
+    @property
+    def grading_pending(self):
+        """Whether the assessment is waiting on background grading"""
+        return (self.assessment or {}).get("status") == "pending"
+
+    def apply_assessment(self, assessment):
+        """Store a background grading result; False if the assessment is no longer pending"""
+        if not self.grading_pending:
+            return False
+        self.set_assessment(assessment)
+        return True
+
+    def start_assessment_grading(self):
+        """Grade the assessment in the background so the closing turn is not delayed"""
+        if not self.technical_answers or self.assessment is not None:
+            return
+        self.set_assessment({"status": "pending"})
+        if self.grader is None or self.grader.claim(self):
+            self.resume_assessment_grading()
+
+    def resume_assessment_grading(self):
+        """Grade a pending assessment on a background thread; the caller holds the grading lease"""
+        answers, tech_stack = list(self.technical_answers), list(self.tech_stack)
+        threading.Thread(target=self._grade_pending, args=(answers, tech_stack), daemon=True).start()
+
+    def _grade_pending(self, answers, tech_stack):
+        assessment = grade_answers(get_llm_client(), answers, tech_stack)
+        if self.grader is None:
+            self.apply_assessment(assessment)
+        else:
+            self.grader.complete(self, assessment)
+
+    def extract_candidate_info(self, user_input):
+        """Extract candidate information from user input"""
+        # Use utility functions for better extraction
+        name = extract_name(user_input)
+        if name:
+            self.set_candidate_field('name', name)
+            
+        email = extract_email(user_input)
+        if email:
+            self.set_candidate_field('email', email)
+            
+        phone = extract_phone(user_input)
+        if phone:
+            self.set_candidate_field('phone', phone)
+            
+        experience = extract_experience_years(user_input)
+        if experience:
+            self.set_candidate_field('experience', experience)
+            
+        position = extract_position(user_input)
+        if position:
+            self.set_candidate_field('position', position)
+            
+        location = extract_location(user_input)
+        if location:
+            self.set_candidate_field('location', location)
+
+    def extract_tech_stack(self, user_input):
+        """Extract tech stack from user input"""
+        found_tech = extract_tech_stack(user_input)
+        for tech in found_tech:
+            if tech not in self.tech_stack:
+                self.tech_stack.append(tech)
+                self.events.append(TECH_ADDED, tech=tech)
+
+    def generate_technical_questions(self):
+        """Generate technical questions based on tech stack"""
+        if not self.tech_stack:
+            return
+            
+        try:
+            # Sorted, so candidates with the same stack send identical (coalescable) requests
+            prompt = f"""Generate 3-5 technical questions for a candidate with the following tech stack: {', '.join(sorted(self.tech_stack))}.
+            
+            For each technology, create relevant questions that assess:
+            1. Basic understanding
+            2. Practical experience
+            3. Problem-solving skills
+            
+            Format the response as a JSON array of questions."""
+            
+            client = get_llm_client()
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a technical interviewer. Generate relevant technical questions based on the provided tech stack."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.7
+            )
+            
+            self.technical_questions = parse_questions(response.choices[0].message.content) or FALLBACK_QUESTIONS
+                
+        except Exception as e:
+            # Fallback questions
+            self.technical_questions = FALLBACK_QUESTIONS
+        self.events.append(QUESTIONS_GENERATED, questions=list(self.technical_questions))
+
+    def to_dict(self):
+        """Serialise the conversation state for persistence"""
+        return self.state.to_dict()
+
+    @classmethod
+    def from_dict(cls, data, last_seq=0, snapshot_seq=0):
+        """Rebuild an assistant from a to_dict() snapshot without logging events"""
+        return cls.from_state(AssistantState.from_dict(data), last_seq, snapshot_seq)
+
+    @classmethod
+    def from_state(cls, state, last_seq=0, snapshot_seq=0):
+        """Rebuild an assistant around an AssistantState without logging events"""
+        assistant = cls()
+        assistant.events = EventLog(last_seq=last_seq, snapshot_seq=snapshot_seq)
+        assistant.state = state
+        # A pending assessment stays pending: the process holding its grading
+        # lease saves the result, and an abandoned one is resumed by whoever
+        # claims the expired lease (resume_assessment_grading)
+        return assistant
+
+    @classmethod
+    def from_stored(cls, stored):
+        """Rebuild an assistant from a SessionStore.load_session() record"""
+        assistant = cls.from_dict(
+            stored["state"], last_seq=stored["last_seq"], snapshot_seq=stored["snapshot_seq"]
+        )
+        assistant.conversation_stats.add_messages(stored["messages"])
+        return assistant
+
+    def end_conversation(self):
+        """End the conversation gracefully"""
+        self.conversation_state = CONVERSATION_STATES['CONCLUSION']
+        self.start_assessment_grading()
+        return """Thank you for your time and for sharing your information with TalentScout! 
+
+I've collected your details and conducted a brief technical assessment. Our recruitment team will review your profile and get back to you within 2-3 business days.
+
+Here's a summary of what we discussed:
+- Your information has been recorded
+- Your tech stack has been noted
+- Technical assessment completed
+
+If you have any questions or need to update your information, please don't hesitate to reach out to our team.
+
+Good luck with your application! """
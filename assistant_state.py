@@ -0,0 +1,255 @@
+"""
+Typed conversation state for TalentScout Hiring Assistant
+
+HiringAssistant keeps its conversation data in a slotted AssistantState
+instead of loose instance attributes. The conversation state is a small
+IntEnum and the collected required fields are an IntFlag, so a state
+encodes to a compact, versioned binary form that is smaller and faster
+to checkpoint on every turn than JSON, and unlike pickle is safe to load
+from a store other processes write to.
+
+Binary layout (version 1):
+    header: b"TA" magic, format version, integer width (2 or 4), integer count
+    integers, little-endian: conversation state, collected-field flags,
+        question index, item counts, per-state turn counts,
+        then the character length of every string
+    one UTF-8 block holding every string back to back: collected required
+        fields in REQUIRED_FIELDS order, other candidate fields, tech stack,
+        questions, answers and the assessment as JSON
+"""
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum, IntFlag
+from itertools import accumulate
+from typing import Dict, List, Any, Optional, Union
+
+from config import CONVERSATION_STATES, REQUIRED_FIELDS
+
+STATE_MAGIC = b"TA"
+STATE_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<2sBBI")  # magic, format version, integer width, integer count
+
+
+class ConversationState(IntEnum):
+    """Conversation states, stored as one small integer"""
+    GREETING = 0
+    COLLECTING_INFO = 1
+    COLLECTING_TECH_STACK = 2
+    GENERATING_QUESTIONS = 3
+    TECHNICAL_ASSESSMENT = 4
+    CONCLUSION = 5
+
+    @property
+    def label(self) -> str:
+        """The CONVERSATION_STATES string used in prompts, events and exports"""
+        return _STATE_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> "ConversationState":
+        try:
+            return _STATES_BY_LABEL[label]
+        except KeyError:
+            raise ValueError(f"Unknown conversation state: {label}") from None
+
+
+_STATE_LABELS = {state: CONVERSATION_STATES[state.name] for state in ConversationState}
+_STATES_BY_LABEL = {label: state for state, label in _STATE_LABELS.items()}
+
+
+class CandidateField(IntFlag):
+    """Bit flags for the required candidate fields that have been collected"""
+    NONE = 0
+    NAME = 1
+    EMAIL = 2
+    PHONE = 4
+    EXPERIENCE = 8
+    POSITION = 16
+    LOCATION = 32
+
+    @classmethod
+    def for_name(cls, name: str) -> "CandidateField":
+        """Flag for a candidate_info key (NONE for optional fields)"""
+        return _FIELD_FLAGS.get(name, cls.NONE)
+
+    @classmethod
+    def collected(cls, candidate_info: Dict[str, Any]) -> "CandidateField":
+        """Flags for the required fields present in candidate_info"""
+        flags = cls.NONE
+        for name in candidate_info:
+            flags |= cls.for_name(name)
+        return flags
+
+
+_FIELD_FLAGS = {name: CandidateField[name.upper()] for name in REQUIRED_FIELDS}
+ALL_REQUIRED_FIELDS = CandidateField.collected(dict.fromkeys(REQUIRED_FIELDS))
+
+# Plain-int views for the codec; enum and flag operators are slow in hot loops
+_REQUIRED_BITS = [(name, int(_FIELD_FLAGS[name])) for name in REQUIRED_FIELDS]
+_STATES = tuple(ConversationState)
+
+
+@dataclass(slots=True)
+class AssistantState:
+    """Everything HiringAssistant needs to resume a conversation"""
+    conversation_state: ConversationState = ConversationState.GREETING
+    candidate_info: Dict[str, str] = field(default_factory=dict)
+    collected: CandidateField = CandidateField.NONE
+    tech_stack: List[str] = field(default_factory=list)
+    technical_questions: List[Union[str, Dict[str, Any]]] = field(default_factory=list)
+    current_question_index: int = 0
+    technical_answers: List[Dict[str, str]] = field(default_factory=list)
+    assessment: Optional[Dict[str, Any]] = None
+    state_turns: Dict[ConversationState, int] = field(default_factory=dict)
+
+    @property
+    def has_required_fields(self) -> bool:
+        return self.collected & ALL_REQUIRED_FIELDS == ALL_REQUIRED_FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """HiringAssistant.to_dict() shape, with states as their string labels"""
+        return {
+            "conversation_state": self.conversation_state.label,
+            "candidate_info": dict(self.candidate_info),
+            "tech_stack": list(self.tech_stack),
+            "technical_questions": list(self.technical_questions),
+            "current_question_index": self.current_question_index,
+            "technical_answers": list(self.technical_answers),
+            "assessment": self.assessment,
+            "state_turns": {state.label: turns for state, turns in self.state_turns.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AssistantState":
+        candidate_info = dict(data.get("candidate_info", {}))
+        return cls(
+            conversation_state=ConversationState.from_label(
+                data.get("conversation_state", CONVERSATION_STATES['GREETING'])
+            ),
+            candidate_info=candidate_info,
+            collected=CandidateField.collected(candidate_info),
+            tech_stack=list(data.get("tech_stack", [])),
+            technical_questions=list(data.get("technical_questions", [])),
+            current_question_index=data.get("current_question_index", 0),
+            technical_answers=list(data.get("technical_answers", [])),
+            assessment=data.get("assessment"),
+            state_turns={ConversationState.from_label(label): turns
+                         for label, turns in data.get("state_turns", {}).items()}
+        )
+
+
+# Binary encoding
+
+def _int_array(values: List[int]) -> array:
+    """Pack ints as little-endian 16-bit words when they fit, else 32-bit"""
+    packed = array("H" if max(values) < 0x10000 else "I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed
+
+
+def _check_strings(name: str, values: Any):
+    """Reject anything but a list of strings, which the format stores item by item"""
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise TypeError(f"{name} must be a list of strings, not {values!r:.80}")
+
+
+def encode_state(state: AssistantState) -> bytes:
+    """Encode a state in the versioned binary format
+
+    Candidate values, tech stack and questions must be strings; anything
+    else raises TypeError rather than being stored as something different.
+    """
+    _check_strings("tech_stack", state.tech_stack)
+    _check_strings("technical_questions", state.technical_questions)
+    _check_strings("candidate_info values", list(state.candidate_info.values()))
+    collected = int(state.collected)
+    strings = [state.candidate_info[name] for name, bit in _REQUIRED_BITS if collected & bit]
+    extra = [(name, value) for name, value in state.candidate_info.items() if name not in _FIELD_FLAGS]
+    for name, value in extra:
+        strings += (name, value)
+    strings += state.tech_stack
+    strings += state.technical_questions
+    for answer in state.technical_answers:
+        strings += (answer["question"], answer["answer"])
+    if state.assessment is not None:
+        strings.append(json.dumps(state.assessment, ensure_ascii=False, separators=(",", ":")))
+
+    ints = [
+        int(state.conversation_state), collected, state.current_question_index,
+        len(extra), len(state.tech_stack), len(state.technical_questions),
+        len(state.technical_answers), state.assessment is not None, len(state.state_turns)
+    ]
+    for conversation_state, turns in state.state_turns.items():
+        ints += (int(conversation_state), turns)
+    # String lengths are in characters, so the text block is decoded in one call
+    ints += map(len, strings)
+
+    packed = _int_array(ints)
+    return _HEADER.pack(STATE_MAGIC, STATE_FORMAT_VERSION, packed.itemsize, len(packed)) + \
+        packed.tobytes() + "".join(strings).encode("utf-8")
+
+
+def decode_state(data: bytes) -> AssistantState:
+    """Decode bytes produced by encode_state()"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not an encoded assistant state")
+    magic, version, width, count = _HEADER.unpack_from(data)
+    if magic != STATE_MAGIC:
+        raise ValueError("Not an encoded assistant state")
+    if version != STATE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported assistant state format version: {version}")
+    ints = array({2: "H", 4: "I"}.get(width, "B"))
+    if ints.itemsize != width:
+        raise ValueError("Corrupt assistant state")
+    end = _HEADER.size + width * count
+    ints.frombytes(data[_HEADER.size:end])
+    if sys.byteorder == "big":
+        ints.byteswap()
+    try:
+        text = data[end:].decode("utf-8")
+        (conversation_state, collected, question_index, n_extra, n_tech,
+         n_questions, n_answers, has_assessment, n_turns) = ints[:9]
+        pos = 9
+        turns = ints[pos:pos + 2 * n_turns]
+        pos += 2 * n_turns
+
+        offsets = list(accumulate(ints[pos:], initial=0))
+        if offsets[-1] != len(text):
+            raise ValueError("Corrupt assistant state")
+        strings = [text[start:stop] for start, stop in zip(offsets, offsets[1:])]
+
+        required = [name for name, bit in _REQUIRED_BITS if collected & bit]
+        expected = len(required) + 2 * n_extra + n_tech + n_questions + 2 * n_answers + has_assessment
+        if len(strings) != expected or len(turns) != 2 * n_turns:
+            raise ValueError("Corrupt assistant state")
+
+        candidate_info = dict(zip(required, strings))
+        pos = len(required)
+        for i in range(pos, pos + 2 * n_extra, 2):
+            candidate_info[strings[i]] = strings[i + 1]
+        pos += 2 * n_extra
+        tech_stack = strings[pos:pos + n_tech]
+        pos += n_tech
+        questions = strings[pos:pos + n_questions]
+        pos += n_questions
+        answers = [{"question": strings[i], "answer": strings[i + 1]}
+                   for i in range(pos, pos + 2 * n_answers, 2)]
+        pos += 2 * n_answers
+        return AssistantState(
+            conversation_state=_STATES[conversation_state],
+            candidate_info=candidate_info,
+            collected=CandidateField(collected),
+            tech_stack=tech_stack,
+            technical_questions=questions,
+            current_question_index=question_index,
+            technical_answers=answers,
+            assessment=json.loads(strings[pos]) if has_assessment else None,
+            state_turns={_STATES[turns[i]]: turns[i + 1] for i in range(0, len(turns), 2)}
+        )
+    except (UnicodeDecodeError, IndexError):
+        raise ValueError("Corrupt assistant state") from None
@@ -0,0 +1,101 @@
+"""
+Startup-time benchmark for TalentScout Hiring Assistant
+
+Imports app.py in fresh interpreters with -X importtime, reports the
+slowest modules, and fails if the median import time exceeds the budget
+or a module that should be deferred (pandas, openai) is imported eagerly.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 1500 --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1500
+# Heavy modules that only specific features need; importing app must not load them
+DEFERRED_MODULES = ("pandas", "openai")
+
+_SNIPPET = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+
+
+def measure_once(module: str = "app") -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Import module in a fresh interpreter; returns (seconds, {name: (self_us, cumulative_us)})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SNIPPET.replace("import app", f"import {module}")],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    seconds = float(result.stdout.strip().splitlines()[-1])
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return seconds, modules
+
+
+def run_benchmark(runs: int = 5, module: str = "app") -> Dict[str, object]:
+    """Median startup time and per-module import times over several runs"""
+    totals: List[float] = []
+    per_module: Dict[str, List[int]] = {}
+    imported = set()
+    for _ in range(runs):
+        seconds, modules = measure_once(module)
+        totals.append(seconds)
+        imported.update(modules)
+        for name, (_, cumulative_us) in modules.items():
+            per_module.setdefault(name, []).append(cumulative_us)
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) * 1000, 1),
+        "modules_ms": {
+            name: round(statistics.median(times) / 1000, 1)
+            for name, times in sorted(per_module.items(), key=lambda item: -statistics.median(item[1]))
+        },
+        "eager_deferred": sorted(m for m in DEFERRED_MODULES if m in imported)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Measure app.py import time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to print")
+    parser.add_argument("--output", help="Write the full per-module report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.runs)
+    print(f"Startup: {report['median_ms']} ms median over {args.runs} runs (budget {args.budget_ms} ms)")
+    print("Slowest imports (cumulative ms):")
+    for name, ms in list(report["modules_ms"].items())[:args.top]:
+        print(f"  {ms:>9.1f}  {name}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if report["median_ms"] > args.budget_ms:
+        print(f"FAIL: startup exceeds the {args.budget_ms} ms budget")
+        failed = True
+    if report["eager_deferred"]:
+        print(f"FAIL: deferred modules imported at startup: {', '.join(report['eager_deferred'])}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""
+Assistant state serialisation benchmark for TalentScout Hiring Assistant
+
+Compares the binary AssistantState encoding against JSON and pickle for
+a typical mid-assessment session: encode and decode throughput, encoded
+size, and the memory held per idle session.
+
+Usage:
+    python benchmarks/bench_state.py
+    python benchmarks/bench_state.py --iterations 20000 --sessions 5000 --output state.json
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant_state import AssistantState, ConversationState, CandidateField, encode_state, decode_state
+
+
+class _LegacyState:
+    """Plain-attribute state, as HiringAssistant held it before AssistantState"""
+
+    def __init__(self, data: Dict[str, object]):
+        for name, value in data.items():
+            setattr(self, name, value)
+
+
+def sample_state() -> AssistantState:
+    """A session halfway through its technical assessment"""
+    candidate_info = {
+        "name": "John Doe", "email": "john.doe@example.com", "phone": "+1 555 123 4567",
+        "experience": "5", "position": "Backend Developer", "location": "Berlin"
+    }
+    questions = [f"Question {i}: explain how you would use {tech} in production?"
+                 for i, tech in enumerate(["python", "django", "postgresql", "docker", "aws"], 1)]
+    return AssistantState(
+        conversation_state=ConversationState.TECHNICAL_ASSESSMENT,
+        candidate_info=candidate_info,
+        collected=CandidateField.collected(candidate_info),
+        tech_stack=["python", "django", "postgresql", "docker", "aws"],
+        technical_questions=questions,
+        current_question_index=3,
+        technical_answers=[{"question": q, "answer": "I would start by profiling the hot path " * 3}
+                           for q in questions[:3]],
+        state_turns={ConversationState.GREETING: 1, ConversationState.COLLECTING_INFO: 4,
+                     ConversationState.COLLECTING_TECH_STACK: 1, ConversationState.TECHNICAL_ASSESSMENT: 3}
+    )
+
+
+def _ops_per_sec(func: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def _bytes_per_session(build: Callable[[], object], sessions: int) -> float:
+    """Average traced memory held by one idle session's state"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build() for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / sessions
+
+
+def run_benchmark(iterations: int = 10000, sessions: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Throughput and size of each serialisation, plus idle memory per session"""
+    state = sample_state()
+    as_dict = state.to_dict()
+    codecs = {
+        "binary": (lambda: encode_state(state), decode_state),
+        "json": (lambda: json.dumps(state.to_dict(), separators=(",", ":")).encode("utf-8"),
+                 lambda data: AssistantState.from_dict(json.loads(data))),
+        "pickle": (lambda: pickle.dumps(_LegacyState(as_dict), pickle.HIGHEST_PROTOCOL), pickle.loads)
+    }
+    report: Dict[str, Dict[str, float]] = {}
+    for name, (encode, decode) in codecs.items():
+        data = encode()
+        report[name] = {
+            "bytes": len(data),
+            "encode_ops_per_sec": round(_ops_per_sec(encode, iterations)),
+            "decode_ops_per_sec": round(_ops_per_sec(lambda: decode(data), iterations))
+        }
+
+    report["idle_memory"] = {
+        "slotted_bytes_per_session": round(_bytes_per_session(
+            lambda: AssistantState.from_dict(as_dict), sessions)),
+        "legacy_bytes_per_session": round(_bytes_per_session(
+            lambda: _LegacyState(json.loads(json.dumps(as_dict))), sessions)),
+        "encoded_bytes_per_session": round(_bytes_per_session(lambda: encode_state(state), sessions))
+    }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the state serialisation benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark assistant state serialisation")
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=2000, help="Idle sessions for the memory measurement")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.iterations, args.sessions)
+    print(f"{'format':<8} {'bytes':>7} {'encode/s':>10} {'decode/s':>10}")
+    for name in ("binary", "json", "pickle"):
+        row = report[name]
+        print(f"{name:<8} {row['bytes']:>7} {row['encode_ops_per_sec']:>10} {row['decode_ops_per_sec']:>10}")
+    memory = report["idle_memory"]
+    print(f"Idle memory per session: slotted {memory['slotted_bytes_per_session']} B, "
+          f"plain attributes {memory['legacy_bytes_per_session']} B, "
+          f"encoded {memory['encoded_bytes_per_session']} B")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
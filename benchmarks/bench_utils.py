@@ -0,0 +1,347 @@
+"""
+Micro-benchmarks for the TalentScout utils module
+
+Runs the extraction, validation, sanitising, categorising and export
+helpers over deterministic synthetic corpora, from one-line chat
+messages to full resumes, and exports batches of 1 to 100k sessions
+through the JSON and bulk exporters. Reports operations per second (for
+session workloads, whole batches per second) and bytes allocated per
+call. Each timing is
+paired with a fixed calibration loop measured just before it, and speed
+is reported relative to that loop as the median over the repeats, so
+frequency scaling and noisy neighbours move both and cancel out. Results
+can be saved as the baseline kept in benchmarks/baselines/, and later
+runs compared against it; a comparison fails when a case's relative
+speed drops, or it allocates more, than the baseline by more than the
+threshold. Re-save baselines after changing Python versions.
+
+Usage:
+    python benchmarks/bench_utils.py
+    python benchmarks/bench_utils.py --filter extract_ --sessions 1 100 10000 100000
+    python benchmarks/bench_utils.py --save
+    python benchmarks/bench_utils.py --compare --threshold 0.25
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import TECH_KEYWORDS
+from utils import (
+    extract_email, extract_phone, extract_experience_years, extract_name, extract_position,
+    extract_location, extract_tech_stack, validate_candidate_info, sanitize_input,
+    get_tech_stack_categories, format_session_data, export_to_json, export_to_csv
+)
+from bulk_export import export_sessions_jsonl, export_sessions_csv
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines", "bench_utils.json")
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_SESSIONS = (1, 100, 1000)
+SEED = 20240601
+
+# Text sizes in words; resumes are a few pages of prose
+TEXT_SIZES = {"chat": (4, 15), "paragraph": (60, 120), "resume": (1200, 2500)}
+# Distinct items per corpus; larger workloads cycle through them
+CORPUS_ITEMS = 200
+ALLOCATION_SAMPLE = 100
+# Many short measurements, so the median shrugs off the slow ones
+DEFAULT_REPEAT = 25
+DEFAULT_MIN_TIME = 0.02
+
+_FILLER = ("the a and with on for team project built led designed improved service data users "
+           "customers platform pipeline scale latency reliability migration release review "
+           "production feature testing deployment monitoring worked managed delivered").split()
+_FIRST_NAMES = ["John", "Priya", "Wei", "Fatima", "Carlos", "Anna", "Kwame", "Yuki"]
+_LAST_NAMES = ["Doe", "Sharma", "Chen", "Khan", "Garcia", "Novak", "Mensah", "Tanaka"]
+_CITIES = ["Berlin", "Bangalore", "Austin", "Lagos", "Toronto", "Madrid"]
+_ROLES = ["backend developer", "data engineer", "frontend engineer", "devops engineer"]
+
+
+def _fact(rng: random.Random) -> str:
+    """A sentence carrying something the extractors look for"""
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    return rng.choice([
+        f"my name is {first} {last}",
+        f"you can reach me at {first.lower()}.{last.lower()}@example.com",
+        f"my phone is {rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"I have {rng.randint(1, 20)} years experience",
+        f"I am applying for the {rng.choice(_ROLES)} position",
+        f"I am based in {rng.choice(_CITIES)}",
+        f"I mostly use {rng.choice(TECH_KEYWORDS)} and {rng.choice(TECH_KEYWORDS)}",
+    ])
+
+
+def make_text(kind: str, rng: random.Random) -> str:
+    """One synthetic message of the given kind"""
+    low, high = TEXT_SIZES[kind]
+    words: List[str] = []
+    target = rng.randint(low, high)
+    while len(words) < target:
+        if rng.random() < 0.15:
+            words.extend(_fact(rng).split())
+        else:
+            words.extend(rng.choices(_FILLER, k=rng.randint(3, 10)))
+        words[-1] += "."
+    return " ".join(words[:target])
+
+
+def make_corpus(kind: str, count: int = CORPUS_ITEMS, seed: int = SEED) -> List[str]:
+    rng = random.Random(f"{seed}-{kind}")
+    return [make_text(kind, rng) for _ in range(count)]
+
+
+def make_session(rng: random.Random) -> Dict[str, Any]:
+    """Arguments for format_session_data() describing one finished screening"""
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    tech_stack = rng.sample(TECH_KEYWORDS, rng.randint(2, 8))
+    questions = [f"How have you used {tech} in production?" for tech in tech_stack[:5]]
+    messages = []
+    for _ in range(rng.randint(6, 20)):
+        messages.append({"role": "assistant", "content": make_text("chat", rng)})
+        messages.append({"role": "user", "content": make_text(rng.choice(["chat", "paragraph"]), rng)})
+    return {
+        "candidate_info": {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}@example.com",
+            "phone": f"{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            "experience": str(rng.randint(0, 25)),
+            "position": rng.choice(_ROLES),
+            "location": rng.choice(_CITIES)
+        },
+        "tech_stack": tech_stack,
+        "messages": messages,
+        "questions": questions,
+        "assessment": {"status": "graded", "average_score": round(rng.uniform(1, 5), 2)}
+    }
+
+
+def make_sessions(count: int = CORPUS_ITEMS, seed: int = SEED) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{seed}-sessions")
+    return [make_session(rng) for _ in range(count)]
+
+
+def _batch(items: Sequence[Any], count: int) -> List[Any]:
+    """count items, cycling through the corpus"""
+    return list(itertools.islice(itertools.cycle(items), count))
+
+
+_CALIBRATION_PATTERN = re.compile(r"\b(\w+?)(?:ing|ed|s)\b")
+_CALIBRATION_TEXTS = [" ".join(_FILLER[i:] + _FILLER[:i]) for i in range(0, len(_FILLER), 3)]
+
+
+def _calibration_step(text: str) -> List[Any]:
+    """Fixed regex and dict work like the helpers do; its speed tracks the host, never the code under test"""
+    counts: Dict[str, int] = {}
+    for stem in _CALIBRATION_PATTERN.findall(text):
+        counts[stem] = counts.get(stem, 0) + 1
+    return sorted(counts.items())
+
+
+class Case:
+    """One benchmark: calls fn on each of ops inputs, cycling through a corpus"""
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], corpus: Sequence[Any], ops: Optional[int] = None):
+        self.name = name
+        self.fn = fn
+        self.corpus = corpus
+        self.ops = ops or len(corpus)
+
+    def run_once(self) -> float:
+        """Seconds to perform self.ops calls"""
+        fn = self.fn
+        inputs = itertools.islice(itertools.cycle(self.corpus), self.ops)
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        return time.perf_counter() - start
+
+    def throughput(self, min_time: float) -> float:
+        """Calls per second over at least min_time"""
+        calls, elapsed = 0, 0.0
+        while elapsed < min_time:
+            elapsed += self.run_once()
+            calls += self.ops
+        return calls / elapsed
+
+    def measure(self, repeat: int, min_time: float, calibration: "Case") -> Dict[str, float]:
+        """Median throughput over repeat measurements, absolute and relative to calibration"""
+        # Warm up first, so lazy imports and regex compilation are not timed
+        self.fn(self.corpus[0])
+        speeds, relative = [], []
+        for _ in range(repeat):
+            reference = calibration.throughput(min_time)
+            speed = self.throughput(min_time)
+            speeds.append(speed)
+            relative.append(speed / reference)
+        return {"ops_per_sec": statistics.median(speeds), "relative": statistics.median(relative)}
+
+    def bytes_per_op(self) -> float:
+        """Average peak memory allocated while a call runs"""
+        sample = self.corpus[:ALLOCATION_SAMPLE]
+        tracemalloc.start()
+        total = 0
+        for item in sample:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            self.fn(item)
+            total += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+        return total / len(sample)
+
+
+def build_cases(session_counts: Sequence[int] = DEFAULT_SESSIONS) -> List[Case]:
+    """Every benchmark case, named function/workload"""
+    texts = {kind: make_corpus(kind) for kind in TEXT_SIZES}
+    extractors = [extract_email, extract_phone, extract_experience_years, extract_name,
+                  extract_position, extract_location, extract_tech_stack, sanitize_input]
+    cases = [Case(f"{fn.__name__}/{kind}", fn, corpus) for fn in extractors for kind, corpus in texts.items()]
+
+    sessions = make_sessions()
+    infos = [session["candidate_info"] for session in sessions]
+    stacks = [session["tech_stack"] + ["terraform"] for session in sessions]
+    formatted = [format_session_data(**session) for session in sessions]
+    cases += [
+        Case("validate_candidate_info", validate_candidate_info, infos),
+        Case("get_tech_stack_categories", get_tech_stack_categories, stacks),
+        Case("export_to_csv", export_to_csv, formatted),
+    ]
+    # Each call handles a whole batch of sessions, so these measure how exports scale with it
+    for count in session_counts:
+        raw, batch = [_batch(sessions, count)], [_batch(formatted, count)]
+        cases += [
+            Case(f"format_session_data/sessions={count}",
+                 lambda items: [format_session_data(**s) for s in items], raw, 1),
+            Case(f"export_to_json/sessions={count}",
+                 lambda items: export_to_json({"sessions": items}), batch, 1),
+            Case(f"export_sessions_jsonl/sessions={count}",
+                 lambda items: export_sessions_jsonl(items, io.StringIO()), batch, 1),
+            Case(f"export_sessions_csv/sessions={count}",
+                 lambda items: export_sessions_csv(items, io.StringIO()), batch, 1),
+        ]
+    return cases
+
+
+def run_benchmarks(cases: List[Case], repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME,
+                   log: Callable[[str], None] = print) -> Dict[str, Dict[str, float]]:
+    calibration = Case("calibration", _calibration_step, _CALIBRATION_TEXTS)
+    results = {}
+    for case in cases:
+        speed = case.measure(repeat, min_time, calibration)
+        results[case.name] = {
+            "ops_per_sec": round(speed["ops_per_sec"], 1),
+            # Small for heavy cases, so keep significant digits rather than decimals
+            "relative": float(f"{speed['relative']:.4g}"),
+            "bytes_per_op": round(case.bytes_per_op())
+        }
+        log(f"  {case.name:<42} {results[case.name]['ops_per_sec']:>12,.1f} ops/s "
+            f"{results[case.name]['relative']:>10.3g}x cal {results[case.name]['bytes_per_op']:>10,} B/op")
+    return results
+
+
+def _speed(result: Dict[str, float], base: Dict[str, float]) -> str:
+    """Metric to compare speeds on: relative to calibration when both runs have it"""
+    return "relative" if "relative" in result and "relative" in base else "ops_per_sec"
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Names of cases slower, or allocating more, than baseline by over threshold"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        metric = _speed(current, base)
+        slower = current[metric] < base[metric] * (1 - threshold)
+        # Allow a little slack for tiny allocations, where a few bytes are noise
+        heavier = current["bytes_per_op"] > base["bytes_per_op"] * (1 + threshold) + 64
+        if slower or heavier:
+            regressions.append(name)
+    return regressions
+
+
+def print_comparison(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     regressions: List[str]):
+    print(f"{'case':<42} {'speed change':>13} {'B/op change':>12}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<42} {'new':>13}")
+            continue
+        metric = _speed(current, base)
+        speed = current[metric] / base[metric] - 1 if base[metric] else 0.0
+        memory = current["bytes_per_op"] / base["bytes_per_op"] - 1 if base["bytes_per_op"] else 0.0
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<42} {speed:>+12.1%} {memory:>+11.1%}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the utils benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmark the utils helpers on synthetic corpora")
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS),
+                        help="Session counts for the export workloads")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Measurements per case; the median is reported")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Minimum seconds per measurement")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional slowdown or allocation growth")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases(args.sessions) if not args.filter or args.filter in case.name]
+    print(f"Running {len(cases)} cases")
+    results = run_benchmarks(cases, args.repeat, args.min_time)
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                saved = json.load(f).get("results", {})
+        saved.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(report, results=saved), f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            # Re-measure suspects once, so a noisy neighbour does not fail the run
+            print(f"Re-measuring {len(regressions)} case(s) over the threshold")
+            retry = run_benchmarks([case for case in cases if case.name in regressions],
+                                   args.repeat, args.min_time)
+            for name, current in retry.items():
+                for metric in ("ops_per_sec", "relative"):
+                    results[name][metric] = max(results[name][metric], current[metric])
+            regressions = compare(results, baseline, args.threshold)
+        print_comparison(results, baseline, regressions)
+        if regressions:
+            print(f"FAIL: {len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
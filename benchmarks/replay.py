@@ -0,0 +1,303 @@
+"""
+Record-and-replay conversation benchmark for TalentScout Hiring Assistant
+
+A fixture is a screening conversation saved as JSON: each turn's user
+input, the LLM completions the turn made with their recorded latencies,
+and the conversation state the turn should end in. Replaying drives
+HiringAssistant exactly as the turn worker does, with get_llm_client()
+returning recorded completions instead of a live model, so the time left
+per turn is our own application overhead. Replays check every state
+transition and the final candidate data against the fixture, and can
+sleep for the recorded model latency to reproduce end-to-end timings.
+
+Fixture layout (version 1):
+    {"version": 1, "name": ..., "description": ...,
+     "turns": [{"user": ..., "state": ..., "calls": [{"response": ..., "latency_ms": ...}]}],
+     "final": {"candidate_info": {...}, "tech_stack": [...], "answers": n, "assessment_status": ...}}
+
+Usage:
+    python benchmarks/replay.py run
+    python benchmarks/replay.py run benchmarks/fixtures/python_developer.json --iterations 200
+    python benchmarks/replay.py run --latency-scale 1.0 --output replay.json
+    python benchmarks/replay.py record inputs.txt --name my_screening --output benchmarks/fixtures/my_screening.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import assistant as assistant_module
+from assistant import HiringAssistant
+from coalescing import CoalescingClient
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+FIXTURE_VERSION = 1
+GRADING_TIMEOUT = 10.0
+
+
+def _completion(content: str) -> SimpleNamespace:
+    """Minimal chat completion object, as the OpenAI client returns"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class ReplayClient:
+    """chat.completions stand-in that returns queued recorded completions in order"""
+
+    def __init__(self, latency_scale: float = 0.0, sleep: Callable[[float], None] = time.sleep):
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+        self.chat = SimpleNamespace(completions=self)
+        self._lock = threading.Lock()
+        self._calls: Deque[Dict[str, Any]] = deque()
+        self._errors: List[str] = []
+        self._local = threading.local()
+
+    def queue(self, calls: List[Dict[str, Any]]):
+        """Make calls the next completions to return"""
+        with self._lock:
+            self._calls.extend(calls)
+
+    def discard(self) -> int:
+        """Drop completions that were never requested; returns how many there were"""
+        with self._lock:
+            count = len(self._calls)
+            self._calls.clear()
+        return count
+
+    def take_errors(self) -> List[str]:
+        """Requests that could not be served since the last call"""
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def thread_seconds(self) -> float:
+        """Seconds the calling thread has spent inside create()"""
+        return getattr(self._local, "seconds", 0.0)
+
+    def create(self, **params):
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                call = self._calls.popleft() if self._calls and not params.get("stream") else None
+                if call is None:
+                    error = ("streamed completions cannot be replayed" if params.get("stream")
+                             else "more LLM calls than were recorded")
+                    self._errors.append(error)
+            if call is None:
+                # generate_response() swallows exceptions, so the error is also kept for the report
+                raise RuntimeError(error)
+            if self.latency_scale:
+                self.sleep(call.get("latency_ms", 0) / 1000.0 * self.latency_scale)
+            return _completion(call["response"])
+        finally:
+            self._local.seconds = self.thread_seconds() + time.perf_counter() - start
+
+
+class RecordingClient:
+    """Wraps a live client, recording each completion's text and latency"""
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(completions=self)
+        self._lock = threading.Lock()
+        self.calls: List[Dict[str, Any]] = []
+
+    def create(self, **params):
+        start = time.perf_counter()
+        response = self._client.chat.completions.create(**params)
+        latency_ms = round((time.perf_counter() - start) * 1000)
+        with self._lock:
+            self.calls.append({"response": response.choices[0].message.content, "latency_ms": latency_ms})
+        return response
+
+
+@contextmanager
+def llm_client(client) -> Iterator[None]:
+    """Route HiringAssistant's LLM requests to client, through the usual coalescing wrapper"""
+    original = assistant_module.get_llm_client
+    wrapped = CoalescingClient(client)
+    assistant_module.get_llm_client = lambda: wrapped
+    try:
+        yield
+    finally:
+        assistant_module.get_llm_client = original
+
+
+def _wait_for_grading(assistant: HiringAssistant, timeout: float = GRADING_TIMEOUT):
+    """Let background grading finish, so its completion belongs to this turn"""
+    deadline = time.monotonic() + timeout
+    while (assistant.assessment or {}).get("status") == "pending" and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def run_turn(assistant: HiringAssistant, user_input: str) -> str:
+    """One conversation turn, as the turn worker runs it"""
+    assistant.record_message("user", user_input)
+    response = assistant.generate_response(user_input)
+    assistant.record_message("assistant", response)
+    return response
+
+
+def final_summary(assistant: HiringAssistant) -> Dict[str, Any]:
+    """What a fixture expects of the conversation once every turn has run"""
+    return {
+        "candidate_info": dict(assistant.candidate_info),
+        "tech_stack": list(assistant.tech_stack),
+        "answers": len(assistant.technical_answers),
+        "assessment_status": (assistant.assessment or {}).get("status")
+    }
+
+
+def load_fixture(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"{path}: unsupported fixture version {fixture.get('version')}")
+    return fixture
+
+
+def replay(fixture: Dict[str, Any], latency_scale: float = 0.0) -> Dict[str, Any]:
+    """Replay a fixture once; returns per-turn timings and any mismatches"""
+    client = ReplayClient(latency_scale)
+    assistant = HiringAssistant()
+    overhead: List[float] = []
+    llm: List[float] = []
+    mismatches: List[str] = []
+    with llm_client(client):
+        for number, turn in enumerate(fixture["turns"], 1):
+            client.queue(turn.get("calls", []))
+            llm_before = client.thread_seconds()
+            start = time.perf_counter()
+            run_turn(assistant, turn["user"])
+            elapsed = time.perf_counter() - start
+            llm_seconds = client.thread_seconds() - llm_before
+            _wait_for_grading(assistant)
+
+            overhead.append(elapsed - llm_seconds)
+            llm.append(llm_seconds)
+            mismatches += [f"turn {number}: {error}" for error in client.take_errors()]
+            unused = client.discard()
+            if unused:
+                mismatches.append(f"turn {number}: {unused} recorded LLM call(s) were not made")
+            if assistant.conversation_state != turn["state"]:
+                mismatches.append(f"turn {number}: expected state {turn['state']}, "
+                                  f"got {assistant.conversation_state}")
+
+    actual = final_summary(assistant)
+    for key, expected in fixture.get("final", {}).items():
+        if actual.get(key) != expected:
+            mismatches.append(f"final {key}: expected {expected!r}, got {actual.get(key)!r}")
+    return {"overhead": overhead, "llm": llm, "mismatches": mismatches}
+
+
+def benchmark_fixture(fixture: Dict[str, Any], iterations: int = 50, latency_scale: float = 0.0) -> Dict[str, Any]:
+    """Replay a fixture repeatedly; overhead statistics are per turn, in milliseconds"""
+    overhead: List[float] = []
+    llm: List[float] = []
+    mismatches: List[str] = []
+    for _ in range(iterations):
+        result = replay(fixture, latency_scale)
+        overhead += result["overhead"]
+        llm += result["llm"]
+        # Replays are deterministic, so one failing iteration's report is enough
+        if result["mismatches"] and not mismatches:
+            mismatches = result["mismatches"]
+    ordered = sorted(overhead)
+    return {
+        "name": fixture.get("name"),
+        "turns": len(fixture["turns"]),
+        "iterations": iterations,
+        "overhead_ms_mean": round(statistics.fmean(overhead) * 1000, 3),
+        "overhead_ms_p50": round(ordered[len(ordered) // 2] * 1000, 3),
+        "overhead_ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "llm_ms_per_conversation": round(sum(llm) / iterations * 1000, 1),
+        "mismatches": mismatches
+    }
+
+
+def record(inputs: List[str], name: str, description: str = "", client=None) -> Dict[str, Any]:
+    """Run inputs against a live LLM and capture the conversation as a fixture"""
+    if client is None:
+        from llm_client import get_llm_client
+        client = get_llm_client()
+    recorder = RecordingClient(client)
+    assistant = HiringAssistant()
+    turns = []
+    with llm_client(recorder):
+        for user_input in inputs:
+            already = len(recorder.calls)
+            run_turn(assistant, user_input)
+            _wait_for_grading(assistant)
+            turns.append({"user": user_input, "state": assistant.conversation_state,
+                          "calls": recorder.calls[already:]})
+    return {"version": FIXTURE_VERSION, "name": name, "description": description,
+            "turns": turns, "final": final_summary(assistant)}
+
+
+def _run(args) -> int:
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.json")))
+    if not paths:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        return 1
+    reports = [benchmark_fixture(load_fixture(path), args.iterations, args.latency_scale) for path in paths]
+
+    print(f"{'fixture':<24} {'turns':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'llm ms':>9}")
+    for report in reports:
+        print(f"{report['name']:<24} {report['turns']:>5} {report['overhead_ms_mean']:>9} "
+              f"{report['overhead_ms_p50']:>9} {report['overhead_ms_p95']:>9} {report['llm_ms_per_conversation']:>9}")
+        for mismatch in report["mismatches"]:
+            print(f"  MISMATCH {mismatch}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    return 1 if any(report["mismatches"] for report in reports) else 0
+
+
+def _record(args) -> int:
+    with open(args.inputs, "r", encoding="utf-8") as f:
+        inputs = [line.strip() for line in f if line.strip()]
+    fixture = record(inputs, args.name, args.description)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=2, ensure_ascii=False)
+    print(f"Recorded {len(fixture['turns'])} turns to {args.output}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for recording and replaying conversations"""
+    parser = argparse.ArgumentParser(description="Record and replay screening conversations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Replay fixtures and report per-turn overhead")
+    run.add_argument("fixtures", nargs="*", help=f"Fixture files (default: all in {FIXTURE_DIR})")
+    run.add_argument("--iterations", type=int, default=50)
+    run.add_argument("--latency-scale", type=float, default=0.0,
+                     help="Sleep for this fraction of each recorded LLM latency (0 disables)")
+    run.add_argument("--output", help="Write the reports as JSON")
+    run.set_defaults(handler=_run)
+
+    rec = commands.add_parser("record", help="Record a conversation against the live LLM")
+    rec.add_argument("inputs", help="Text file with one user message per line")
+    rec.add_argument("--name", required=True)
+    rec.add_argument("--description", default="")
+    rec.add_argument("--output", required=True)
+    rec.set_defaults(handler=_record)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+"""
+Bulk session export for TalentScout Hiring Assistant
+
+Streams many sessions from the session store or a directory of exports and
+writes them incrementally as compact JSONL or CSV (optionally gzipped), so
+memory use stays flat no matter how many sessions are exported. Malformed
+export files and JSONL lines are skipped and reported, never fatal.
+
+Usage:
+    python bulk_export.py --db talentscout_sessions.db --format jsonl --output sessions.jsonl.gz
+    python bulk_export.py --source exports/ --format csv --output sessions.csv
+    python bulk_export.py --db talentscout_sessions.db --format parquet --output sessions_parquet/
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO
+
+from utils import flatten_session_data, format_session_data
+
+CSV_COLUMNS = list(flatten_session_data({}).keys())
+
+
+def session_export_data(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a session store record into the format_session_data shape"""
+    state = stored.get("state", {})
+    session_data = format_session_data(
+        state.get("candidate_info", {}),
+        state.get("tech_stack", []),
+        stored.get("messages", []),
+        state.get("technical_questions", []),
+        state.get("assessment")
+    )
+    session_data["session_id"] = stored["session_id"]
+    session_data["timestamp"] = stored.get("updated_at") or session_data["timestamp"]
+    return session_data
+
+
+def iter_sessions_from_store(store, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream export-shaped sessions out of a SessionStore"""
+    for stored in store.iter_sessions(batch_size=batch_size):
+        yield session_export_data(stored)
+
+
+def _open_text(path: str, mode: str) -> TextIO:
+    """Open a text file, transparently handling .gz paths"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def iter_sessions_from_directory(directory: str,
+                                 skipped: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream sessions from .json exports and .jsonl(.gz) files in a directory
+
+    Unreadable files and lines that are not a JSON object are skipped; pass
+    a list as skipped to collect where they were ("file" or "file:line").
+    """
+    skipped = skipped if skipped is not None else []
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.join(directory, filename)
+        if filename.endswith(".json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    session_data = json.load(f)
+            except (OSError, ValueError):
+                session_data = None
+            if isinstance(session_data, dict):
+                yield session_data
+            else:
+                skipped.append(filename)
+        elif filename.endswith((".jsonl", ".jsonl.gz")):
+            line_number = 0
+            try:
+                with _open_text(path, "r") as f:
+                    for line_number, line in enumerate(f, 1):
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            session_data = json.loads(line)
+                        except ValueError:
+                            session_data = None
+                        if isinstance(session_data, dict):
+                            yield session_data
+                        else:
+                            skipped.append(f"{filename}:{line_number}")
+            except (OSError, EOFError, UnicodeDecodeError):
+                # A truncated or corrupt file; keep what was read before the damage
+                skipped.append(f"{filename}:{line_number + 1}")
+
+
+def _open_output(output, compress: Optional[bool]):
+    """Return (file, should_close) for a path or an already-open file"""
+    if not isinstance(output, str):
+        return output, False
+    if compress or (compress is None and output.endswith(".gz")):
+        return gzip.open(output, "wt", encoding="utf-8", newline=""), True
+    return open(output, "w", encoding="utf-8", newline=""), True
+
+
+def export_sessions_jsonl(sessions: Iterable[Dict[str, Any]], output,
+                          compress: Optional[bool] = None) -> int:
+    """Write sessions as compact JSON lines and return how many were written"""
+    f, should_close = _open_output(output, compress)
+    count = 0
+    try:
+        for session_data in sessions:
+            f.write(json.dumps(session_data, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    finally:
+        if should_close:
+            f.close()
+    return count
+
+
+def export_sessions_csv(sessions: Iterable[Dict[str, Any]], output,
+                        compress: Optional[bool] = None) -> int:
+    """Write one flattened CSV row per session and return how many were written"""
+    f, should_close = _open_output(output, compress)
+    count = 0
+    try:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for session_data in sessions:
+            flat_data = flatten_session_data(session_data)
+            writer.writerow([flat_data[column] for column in CSV_COLUMNS])
+            count += 1
+    finally:
+        if should_close:
+            f.close()
+    return count
+
+
+EXPORTERS = {
+    "jsonl": export_sessions_jsonl,
+    "csv": export_sessions_csv
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for bulk exports"""
+    parser = argparse.ArgumentParser(description="Bulk export TalentScout sessions")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="Path to the SQLite session store")
+    source.add_argument("--source", help="Directory of JSON/JSONL session exports")
+    parser.add_argument("--format", choices=sorted(EXPORTERS) + ["parquet"], default="jsonl")
+    parser.add_argument("--output", required=True,
+                        help="Output path (.gz to compress), or a directory for parquet")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet":
+        from columnar_export import export_sessions_columnar
+        exporter = lambda sessions, output: sum(export_sessions_columnar(sessions, output).values())
+    else:
+        exporter = EXPORTERS[args.format]
+
+    if args.db:
+        # Opening a missing path would quietly create an empty store
+        if not os.path.exists(args.db):
+            print(f"Session store {args.db} not found")
+            return 1
+        from session_store import SessionStore
+        store = SessionStore(args.db)
+        try:
+            count = exporter(iter_sessions_from_store(store), args.output)
+        finally:
+            store.close()
+    else:
+        skipped: List[str] = []
+        count = exporter(iter_sessions_from_directory(args.source, skipped), args.output)
+        if skipped:
+            print(f"Skipped {len(skipped)} malformed records: {', '.join(skipped[:10])}"
+                  + (" ..." if len(skipped) > 10 else ""))
+
+    print(f"Exported {count} sessions to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
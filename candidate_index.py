@@ -0,0 +1,263 @@
+"""
+Candidate search index for TalentScout Hiring Assistant
+
+Builds inverted postings over exported sessions (the dicts produced by
+format_session_data) so recruiters can run boolean/range queries such as
+"python AND kubernetes, experience >= 5, location Berlin" without scanning
+every JSON file.
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
+
+from utils import parse_experience_years
+
+# Operators supported on the experience field
+_RANGE_PATTERN = re.compile(r'^experience\s*(>=|<=|>|<|=|==)\s*(\d+)$')
+_FIELD_PATTERN = re.compile(r'^(location|position|tech)\s*[:=]?\s+(.+)$')
+_TOKEN_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+
+def _normalize(value: Any) -> str:
+    """Lower-case and trim a field value"""
+    return str(value).strip().lower() if value is not None else ""
+
+
+def _location_tokens(location: Any) -> List[str]:
+    """Split a free-text location into searchable tokens"""
+    return [t.strip('.') for t in _TOKEN_PATTERN.findall(_normalize(location)) if t.strip('.')]
+
+
+class CandidateIndex:
+    """In-memory inverted index over candidate sessions"""
+
+    def __init__(self):
+        self._session_ids: List[Optional[str]] = []
+        self._doc_by_session: Dict[str, int] = {}
+        self._tech: Dict[str, Set[int]] = {}
+        self._position: Dict[str, Set[int]] = {}
+        self._location: Dict[str, Set[int]] = {}
+        # Sorted (experience, doc_id) pairs plus a forward lookup by doc id.
+        # New entries are buffered and merged on the next read so bulk loads
+        # stay O(n log n) instead of paying a list shift per insert.
+        self._experience_sorted: List[Tuple[int, int]] = []
+        self._experience_pending: List[Tuple[int, int]] = []
+        self._experience: Dict[int, int] = {}
+        self._forward: Dict[int, Tuple[List[str], str, List[str]]] = {}
+        self._indexed_files: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_by_session)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._doc_by_session
+
+    def add_session(self, session_data: Dict[str, Any]) -> int:
+        """Index (or re-index) a single session and return its doc id"""
+        session_id = session_data.get("session_id")
+        if not session_id:
+            raise ValueError("Session data must include a session_id")
+
+        if session_id in self._doc_by_session:
+            self.remove_session(session_id)
+
+        doc_id = len(self._session_ids)
+        self._session_ids.append(session_id)
+        self._doc_by_session[session_id] = doc_id
+
+        candidate_info = session_data.get("candidate_info", {}) or {}
+        tech_terms = sorted({_normalize(t) for t in session_data.get("tech_stack", []) if _normalize(t)})
+        position = _normalize(candidate_info.get("position"))
+        location_terms = sorted(set(_location_tokens(candidate_info.get("location"))))
+
+        for term in tech_terms:
+            self._tech.setdefault(term, set()).add(doc_id)
+        if position:
+            self._position.setdefault(position, set()).add(doc_id)
+        for term in location_terms:
+            self._location.setdefault(term, set()).add(doc_id)
+
+        experience = parse_experience_years(candidate_info.get("experience"))
+        if experience is not None:
+            self._experience_pending.append((experience, doc_id))
+            self._experience[doc_id] = experience
+
+        self._forward[doc_id] = (tech_terms, position, location_terms)
+        return doc_id
+
+    def add_sessions(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """Index many sessions and return how many were added"""
+        count = 0
+        for session_data in sessions:
+            self.add_session(session_data)
+            count += 1
+        return count
+
+    def remove_session(self, session_id: str) -> bool:
+        """Remove a session from the index"""
+        doc_id = self._doc_by_session.pop(session_id, None)
+        if doc_id is None:
+            return False
+
+        tech_terms, position, location_terms = self._forward.pop(doc_id)
+        for term in tech_terms:
+            self._discard(self._tech, term, doc_id)
+        if position:
+            self._discard(self._position, position, doc_id)
+        for term in location_terms:
+            self._discard(self._location, term, doc_id)
+
+        experience = self._experience.pop(doc_id, None)
+        if experience is not None:
+            self._merge_pending_experience()
+            pos = bisect_left(self._experience_sorted, (experience, doc_id))
+            del self._experience_sorted[pos]
+
+        self._session_ids[doc_id] = None
+        return True
+
+    def _merge_pending_experience(self):
+        """Fold buffered experience entries into the sorted index"""
+        if not self._experience_pending:
+            return
+        if len(self._experience_pending) == 1:
+            insort(self._experience_sorted, self._experience_pending[0])
+        else:
+            self._experience_sorted.extend(self._experience_pending)
+            self._experience_sorted.sort()
+        self._experience_pending = []
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], term: str, doc_id: int):
+        """Remove a doc id from a postings list, dropping empty terms"""
+        docs = postings.get(term)
+        if docs is not None:
+            docs.discard(doc_id)
+            if not docs:
+                del postings[term]
+
+    def index_directory(self, directory: str) -> int:
+        """Index new or modified JSON session exports in a directory"""
+        added = 0
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            path = os.path.join(directory, filename)
+            mtime = os.path.getmtime(path)
+            if self._indexed_files.get(path) == mtime:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    session_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(session_data, dict) and session_data.get("session_id"):
+                self.add_session(session_data)
+                added += 1
+            self._indexed_files[path] = mtime
+        return added
+
+    def _experience_range(self, min_experience: Optional[int], max_experience: Optional[int]) -> Tuple[int, int]:
+        """Return the slice of the sorted experience index matching a range"""
+        self._merge_pending_experience()
+        lo = 0 if min_experience is None else bisect_left(self._experience_sorted, (min_experience, -1))
+        hi = (len(self._experience_sorted) if max_experience is None
+              else bisect_right(self._experience_sorted, (max_experience, float('inf'))))
+        return lo, max(lo, hi)
+
+    def search(self, tech_all: Optional[List[str]] = None, tech_any: Optional[List[str]] = None,
+               position: Optional[str] = None, location: Optional[str] = None,
+               min_experience: Optional[int] = None, max_experience: Optional[int] = None,
+               limit: Optional[int] = None) -> List[str]:
+        """Return session ids matching all given criteria"""
+        candidate_sets: List[Set[int]] = []
+
+        for term in tech_all or []:
+            candidate_sets.append(self._tech.get(_normalize(term), set()))
+        if tech_any:
+            union: Set[int] = set()
+            for term in tech_any:
+                union |= self._tech.get(_normalize(term), set())
+            candidate_sets.append(union)
+        if position:
+            candidate_sets.append(self._position.get(_normalize(position), set()))
+        for term in _location_tokens(location) if location else []:
+            candidate_sets.append(self._location.get(term, set()))
+
+        has_range = min_experience is not None or max_experience is not None
+        if has_range:
+            lo, hi = self._experience_range(min_experience, max_experience)
+        else:
+            lo, hi = 0, 0
+
+        if candidate_sets:
+            # Intersect smallest postings first so the working set shrinks fast
+            candidate_sets.sort(key=len)
+            result = set(candidate_sets[0])
+            for docs in candidate_sets[1:]:
+                if not result:
+                    break
+                result &= docs
+            if has_range and result:
+                if len(result) < hi - lo:
+                    # Cheaper to filter the survivors than to materialise the range
+                    low = min_experience if min_experience is not None else float('-inf')
+                    high = max_experience if max_experience is not None else float('inf')
+                    result = {d for d in result if low <= self._experience.get(d, float('nan')) <= high}
+                else:
+                    result &= {doc for _, doc in self._experience_sorted[lo:hi]}
+        elif has_range:
+            result = {doc for _, doc in self._experience_sorted[lo:hi]}
+        else:
+            result = set(self._doc_by_session.values())
+
+        doc_ids = sorted(result)
+        if limit is not None:
+            doc_ids = doc_ids[:limit]
+        return [self._session_ids[d] for d in doc_ids]
+
+    def query(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Run a textual query such as 'python AND kubernetes, experience >= 5, location Berlin'"""
+        return self.search(limit=limit, **parse_query(query))
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """Parse a comma-separated query string into search() keyword arguments"""
+    criteria: Dict[str, Any] = {}
+    for clause in query.split(","):
+        clause = clause.strip()
+        if not clause:
+            continue
+        clause_lower = clause.lower()
+
+        range_match = _RANGE_PATTERN.match(clause_lower)
+        if range_match:
+            op, value = range_match.group(1), int(range_match.group(2))
+            if op in ('>=', '>'):
+                low = value + 1 if op == '>' else value
+                criteria['min_experience'] = max(low, criteria.get('min_experience', low))
+            elif op in ('<=', '<'):
+                high = value - 1 if op == '<' else value
+                criteria['max_experience'] = min(high, criteria.get('max_experience', high))
+            else:
+                criteria['min_experience'] = value
+                criteria['max_experience'] = value
+            continue
+
+        field_match = _FIELD_PATTERN.match(clause_lower)
+        if field_match and field_match.group(1) in ('location', 'position'):
+            criteria[field_match.group(1)] = field_match.group(2).strip()
+            continue
+        if field_match:
+            clause_lower = field_match.group(2)
+
+        if re.search(r'\s+or\s+', clause_lower):
+            terms = [t.strip() for t in re.split(r'\s+or\s+', clause_lower) if t.strip()]
+            criteria.setdefault('tech_any', []).extend(terms)
+        else:
+            terms = [t.strip() for t in re.split(r'\s+and\s+', clause_lower) if t.strip()]
+            criteria.setdefault('tech_all', []).extend(terms)
+    return criteria
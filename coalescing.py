@@ -0,0 +1,106 @@
+"""
+LLM request coalescing for TalentScout Hiring Assistant
+
+Bursts of candidates often send the LLM byte-identical requests at the
+same moment: the same greeting, or question generation for the same tech
+stack. CoalescingClient wraps the OpenAI-compatible client so concurrent
+identical chat completions (same model, messages and parameters) share a
+single backend request, and every caller receives its result. Only calls
+that overlap in time are shared; nothing is cached afterwards, and
+streamed completions always go to the backend.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """sha256 of the request's canonical JSON, so key order and spacing do not matter"""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its outcome"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.requests = 0
+        self.backend_calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, joining an identical call already in flight"""
+        with self._lock:
+            self.requests += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.backend_calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+                self.errors += 1
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters for monitoring how much duplicate work is saved"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "backend_calls": self.backend_calls,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "coalesced_ratio": round(self.coalesced / self.requests, 4) if self.requests else 0.0
+            }
+
+
+class _CoalescingCompletions:
+    """chat.completions whose non-streaming create() calls are coalesced"""
+
+    def __init__(self, completions, flight: SingleFlight):
+        self._completions = completions
+        self._flight = flight
+
+    def create(self, **params):
+        if params.get("stream"):
+            return self._completions.create(**params)
+        return self._flight.do(request_key(params), lambda: self._completions.create(**params))
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class CoalescingClient:
+    """OpenAI-compatible client wrapper that shares concurrent identical completions"""
+
+    def __init__(self, client, flight: Optional[SingleFlight] = None):
+        self._client = client
+        self.flight = flight or SingleFlight()
+        self.chat = SimpleNamespace(completions=_CoalescingCompletions(client.chat.completions, self.flight))
+
+    def metrics(self) -> Dict[str, Any]:
+        return self.flight.metrics()
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,174 @@
+"""
+Columnar session export for TalentScout Hiring Assistant
+
+Writes sessions as date-partitioned Parquet files with typed columns
+(experience as int, tech_stack as a list, timestamps as UTC timestamps) so
+analysts no longer re-parse CSV strings. Naive timestamps are taken as the
+exporting host's local time, and partitions use the UTC date, matching the
+stored column. Rows are buffered per partition and flushed as whole row
+groups. Only the most recently used partitions keep a file open; a
+partition seen again after its file was closed continues in a new part
+file. Existing part files are never overwritten, so exporting into the
+same directory again adds files alongside the earlier ones. Without
+pyarrow, the same typed rows are written as partitioned JSONL instead.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+
+# Try to import pyarrow, but handle gracefully if not available
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+from utils import flatten_session_data
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+DEFAULT_MAX_OPEN_PARTITIONS = 32
+
+if PYARROW_AVAILABLE:
+    SESSION_SCHEMA = pa.schema([
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("session_id", pa.string()),
+        ("name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("experience", pa.int32()),
+        ("position", pa.string()),
+        ("location", pa.string()),
+        ("tech_stack", pa.list_(pa.string())),
+        ("total_messages", pa.int32()),
+        ("questions_count", pa.int32()),
+        ("assessment_score", pa.float64())
+    ])
+else:
+    SESSION_SCHEMA = None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a value to int, or None if it is blank or not numeric"""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp into UTC, or None if it is missing or malformed"""
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except (TypeError, ValueError):
+            return None
+    # astimezone() reads a naive value as local time, which is how sessions record it
+    return value.astimezone(timezone.utc)
+
+
+def typed_session_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a typed row from the export_to_csv flattening of a session"""
+    row = flatten_session_data(data)
+    score = row["assessment_score"]
+    row.update({
+        "timestamp": _to_timestamp(row["timestamp"]),
+        "experience": _to_int(row["experience"]),
+        "tech_stack": [str(t) for t in data.get("tech_stack", [])],
+        "total_messages": _to_int(row["total_messages"]),
+        "questions_count": _to_int(row["questions_count"]),
+        "assessment_score": None if score == "" else float(score)
+    })
+    for column in ("session_id", "name", "email", "phone", "position", "location"):
+        row[column] = None if row[column] in ("", None) else str(row[column])
+    return row
+
+
+def _json_default(value: Any) -> str:
+    """Serialise timestamps as ISO strings in the JSONL fallback"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _partition_key(row: Dict[str, Any]) -> str:
+    """Hive-style UTC date partition for a row"""
+    timestamp = row["timestamp"]
+    return f"date={timestamp.date().isoformat() if timestamp else 'unknown'}"
+
+
+def _next_part_path(directory: str, extension: str) -> str:
+    """First part-N file in the directory that does not exist yet"""
+    index = 0
+    while os.path.exists(os.path.join(directory, f"part-{index}{extension}")):
+        index += 1
+    return os.path.join(directory, f"part-{index}{extension}")
+
+
+class _PartitionWriter:
+    """Buffers rows for one partition and flushes them as row groups of a new part file"""
+
+    def __init__(self, directory: str, row_group_size: int, compression: str):
+        os.makedirs(directory, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.rows: List[Dict[str, Any]] = []
+        if PYARROW_AVAILABLE:
+            self.path = _next_part_path(directory, ".parquet")
+            self._writer = pq.ParquetWriter(self.path, SESSION_SCHEMA, compression=compression)
+        else:
+            self.path = _next_part_path(directory, ".jsonl")
+            self._writer = open(self.path, "x", encoding="utf-8")
+
+    def add(self, row: Dict[str, Any]):
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if PYARROW_AVAILABLE:
+            self._writer.write_table(pa.Table.from_pylist(self.rows, schema=SESSION_SCHEMA))
+        else:
+            for row in self.rows:
+                self._writer.write(json.dumps(row, default=_json_default, separators=(",", ":")))
+                self._writer.write("\n")
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+def export_sessions_columnar(sessions: Iterable[Dict[str, Any]], output_dir: str,
+                             row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                             compression: str = "snappy",
+                             max_open_partitions: int = DEFAULT_MAX_OPEN_PARTITIONS) -> Dict[str, int]:
+    """Write sessions as date-partitioned columnar files; returns rows per partition
+
+    At most max_open_partitions files are open, each buffering up to
+    row_group_size rows, however many dates the sessions span.
+    """
+    writers: "OrderedDict[str, _PartitionWriter]" = OrderedDict()
+    counts: Dict[str, int] = {}
+    try:
+        for session_data in sessions:
+            row = typed_session_row(session_data)
+            key = _partition_key(row)
+            writer = writers.get(key)
+            if writer is None:
+                if len(writers) >= max_open_partitions:
+                    # Close the partition used least recently; it reopens as a new part if needed
+                    writers.popitem(last=False)[1].close()
+                writer = writers[key] = _PartitionWriter(os.path.join(output_dir, key), row_group_size, compression)
+            else:
+                writers.move_to_end(key)
+            writer.add(row)
+            counts[key] = counts.get(key, 0) + 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return counts
@@ -23,6 +23,16 @@ STREAMLIT_ADDRESS = os.getenv("STREAMLIT_SERVER_ADDRESS", "localhost")
 # Application Configuration
 APP_TITLE = "TalentScout Hiring Assistant"
 APP_ICON = "🤖"
+WELCOME_MESSAGE = """Hello!  I'm TalentScout, your AI hiring assistant. 
+
+I'm here to help you with the initial screening process for technology positions. I'll be collecting some basic information about you and conducting a brief technical assessment.
+
+Let's get started! Please tell me your full name."""
+
+# Headless API Configuration
+API_HOST = os.getenv("TALENTSCOUT_API_HOST", "localhost")
+API_PORT = int(os.getenv("TALENTSCOUT_API_PORT", 8080))
+API_CORS_ORIGINS = [o.strip() for o in os.getenv("TALENTSCOUT_API_CORS_ORIGINS", "*").split(",") if o.strip()]
 
 # Tech Stack Keywords for Detection
 TECH_KEYWORDS = [
@@ -61,12 +71,31 @@ CONVERSATION_STATES = {
     'CONCLUSION': 'conclusion'
 }
 
+# Tech Stack Categories (anything not listed is reported as "Other")
+TECH_CATEGORIES = {
+    "Programming Languages": ['python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust'],
+    "Frameworks": ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express'],
+    "Databases": ['mysql', 'postgresql', 'mongodb', 'redis'],
+    "Cloud Platforms": ['aws', 'azure', 'gcp'],
+    "DevOps Tools": ['docker', 'kubernetes', 'jenkins', 'git']
+}
+
+# Health Check
+HEALTH_CHECK_TTL = 30  # seconds an Ollama availability probe result is reused
+
 # Required Candidate Information Fields
 REQUIRED_FIELDS = ['name', 'email', 'phone', 'experience', 'position', 'location']
 
 # Conversation Ending Keywords
 EXIT_KEYWORDS = ['goodbye', 'exit', 'quit', 'end', 'stop', 'bye', 'finish']
 
+# Conversation Summary Topics (topic -> keywords found in user messages)
+TOPIC_KEYWORDS = {
+    'Work Experience': ['experience', 'years', 'work'],
+    'Technical Skills': ['python', 'javascript', 'java', 'react', 'django'],
+    'Project Experience': ['project', 'challenge', 'problem']
+}
+
 # Fallback Technical Questions
 FALLBACK_QUESTIONS = [
     "Can you explain the difference between synchronous and asynchronous programming?",
@@ -79,6 +108,53 @@ FALLBACK_QUESTIONS = [
     "What's your experience with testing methodologies (unit testing, integration testing)?"
 ]
 
+# Session Persistence (SQLite, write-behind)
+SESSION_DB_PATH = os.getenv("TALENTSCOUT_SESSION_DB", "talentscout_sessions.db")
+SESSION_WRITE_BATCH_SIZE = 200
+SESSION_FLUSH_INTERVAL = 0.25  # seconds to wait while filling a write batch
+SESSION_WRITE_ATTEMPTS = 3  # tries per write batch before it is dropped and reported by flush()
+EVENT_SNAPSHOT_INTERVAL = 50  # events between full state snapshots
+
+# Shared Live Session State (lets any app process serve any turn)
+STATE_BACKEND = os.getenv("TALENTSCOUT_STATE_BACKEND", "sqlite")  # "sqlite" or "file"
+STATE_BACKEND_PATH = os.getenv("TALENTSCOUT_STATE_PATH", "talentscout_state.db")  # database file, or directory for "file"
+GRADING_LEASE_TTL = int(os.getenv("TALENTSCOUT_GRADING_LEASE_TTL", 600))  # seconds before an abandoned grading is retried
+GRADING_COMMIT_ATTEMPTS = 3  # saves of a grading result retried after racing another process's turn
+
+# Chat History Rendering
+CHAT_HISTORY_RECENT = 20  # latest messages rendered as individual chat bubbles
+CHAT_HISTORY_PAGE_SIZE = 50  # older messages per collapsed history page
+
+# Background Turn Execution
+TURN_WORKER_THREADS = 4  # chat turns generated concurrently across all sessions
+TURN_POLL_INTERVAL = 0.5  # seconds between UI status checks while a turn is running
+TURN_JOB_TTL = 600  # seconds a finished turn waits to be collected before it is discarded
+
+# Rate Limiting and Admission Control
+SESSION_RATE_PER_MINUTE = 12  # sustained messages per session
+SESSION_RATE_BURST = 5  # messages a session may send back to back
+IP_RATE_PER_MINUTE = 60  # sustained messages per client IP, across its sessions
+IP_RATE_BURST = 20
+LLM_MAX_ACTIVE = 2  # chat turns sent to the LLM at once across all sessions
+LLM_MAX_QUEUED = 50  # turns allowed to wait for the LLM before new ones are turned away
+
+# Opt-in Profiling (off unless TALENTSCOUT_PROFILE is "cpu", "memory" or "all")
+PROFILE_MODE = os.getenv("TALENTSCOUT_PROFILE", "").lower()
+PROFILE_DIR = os.getenv("TALENTSCOUT_PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("TALENTSCOUT_PROFILE_KEEP", 20))  # slowest calls kept per kind
+PROFILE_SAMPLE_RATE = float(os.getenv("TALENTSCOUT_PROFILE_SAMPLE", 1.0))  # fraction of calls profiled
+
+# Bounded Session Memory
+TRANSCRIPT_RESIDENT_MESSAGES = 100  # messages a session keeps in memory before older ones spill to the state backend
+TRANSCRIPT_RESIDENT_BYTES = 256 * 1024  # ... or once its in-memory messages take this many bytes
+SESSION_IDLE_TTL = int(os.getenv("TALENTSCOUT_SESSION_IDLE_TTL", 1800))  # idle seconds before a session's memory is released
+SESSION_SWEEP_INTERVAL = 60  # seconds between sweeps for idle sessions
+
+# Technical Assessment Grading
+ASSESSMENT_MAX_TOKENS = 800
+ASSESSMENT_TEMPERATURE = 0.0  # Deterministic grading
+ASSESSMENT_MAX_SCORE = 10
+
 def validate_config():
     """Validate that all required configuration is set"""
     # For local LLMs, we don't need an API key
@@ -140,6 +216,16 @@ STREAMLIT_ADDRESS = os.getenv("STREAMLIT_SERVER_ADDRESS", "localhost")
 # Application Configuration
 APP_TITLE = "TalentScout Hiring Assistant"
 APP_ICON = "🤖"
+WELCOME_MESSAGE = """Hello!  I'm TalentScout, your AI hiring assistant. 
+
+I'm here to help you with the initial screening process for technology positions. I'll be collecting some basic information about you and conducting a brief technical assessment.
+
+Let's get started! Please tell me your full name."""
+
+# Headless API Configuration
+API_HOST = os.getenv("TALENTSCOUT_API_HOST", "localhost")
+API_PORT = int(os.getenv("TALENTSCOUT_API_PORT", 8080))
+API_CORS_ORIGINS = [o.strip() for o in os.getenv("TALENTSCOUT_API_CORS_ORIGINS", "*").split(",") if o.strip()]
 
 # Tech Stack Keywords for Detection
 TECH_KEYWORDS = [
@@ -178,12 +264,31 @@ CONVERSATION_STATES = {
     'CONCLUSION': 'conclusion'
 }
 
+# Tech Stack Categories (anything not listed is reported as "Other")
+TECH_CATEGORIES = {
+    "Programming Languages": ['python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust'],
+    "Frameworks": ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express'],
+    "Databases": ['mysql', 'postgresql', 'mongodb', 'redis'],
+    "Cloud Platforms": ['aws', 'azure', 'gcp'],
+    "DevOps Tools": ['docker', 'kubernetes', 'jenkins', 'git']
+}
+
+# Health Check
+HEALTH_CHECK_TTL = 30  # seconds an Ollama availability probe result is reused
+
 # Required Candidate Information Fields
 REQUIRED_FIELDS = ['name', 'email', 'phone', 'experience', 'position', 'location']
 
 # Conversation Ending Keywords
 EXIT_KEYWORDS = ['goodbye', 'exit', 'quit', 'end', 'stop', 'bye', 'finish']
 
+# Conversation Summary Topics (topic -> keywords found in user messages)
+TOPIC_KEYWORDS = {
+    'Work Experience': ['experience', 'years', 'work'],
+    'Technical Skills': ['python', 'javascript', 'java', 'react', 'django'],
+    'Project Experience': ['project', 'challenge', 'problem']
+}
+
 # Fallback Technical Questions
 FALLBACK_QUESTIONS = [
     "Can you explain the difference between synchronous and asynchronous programming?",
@@ -196,6 +301,53 @@ FALLBACK_QUESTIONS = [
     "What's your experience with testing methodologies (unit testing, integration testing)?"
 ]
 
+# Session Persistence (SQLite, write-behind)
+SESSION_DB_PATH = os.getenv("TALENTSCOUT_SESSION_DB", "talentscout_sessions.db")
+SESSION_WRITE_BATCH_SIZE = 200
+SESSION_FLUSH_INTERVAL = 0.25  # seconds to wait while filling a write batch
+SESSION_WRITE_ATTEMPTS = 3  # tries per write batch before it is dropped and reported by flush()
+EVENT_SNAPSHOT_INTERVAL = 50  # events between full state snapshots
+
+# Shared Live Session State (lets any app process serve any turn)
+STATE_BACKEND = os.getenv("TALENTSCOUT_STATE_BACKEND", "sqlite")  # "sqlite" or "file"
+STATE_BACKEND_PATH = os.getenv("TALENTSCOUT_STATE_PATH", "talentscout_state.db")  # database file, or directory for "file"
+GRADING_LEASE_TTL = int(os.getenv("TALENTSCOUT_GRADING_LEASE_TTL", 600))  # seconds before an abandoned grading is retried
+GRADING_COMMIT_ATTEMPTS = 3  # saves of a grading result retried after racing another process's turn
+
+# Chat History Rendering
+CHAT_HISTORY_RECENT = 20  # latest messages rendered as individual chat bubbles
+CHAT_HISTORY_PAGE_SIZE = 50  # older messages per collapsed history page
+
+# Background Turn Execution
+TURN_WORKER_THREADS = 4  # chat turns generated concurrently across all sessions
+TURN_POLL_INTERVAL = 0.5  # seconds between UI status checks while a turn is running
+TURN_JOB_TTL = 600  # seconds a finished turn waits to be collected before it is discarded
+
+# Rate Limiting and Admission Control
+SESSION_RATE_PER_MINUTE = 12  # sustained messages per session
+SESSION_RATE_BURST = 5  # messages a session may send back to back
+IP_RATE_PER_MINUTE = 60  # sustained messages per client IP, across its sessions
+IP_RATE_BURST = 20
+LLM_MAX_ACTIVE = 2  # chat turns sent to the LLM at once across all sessions
+LLM_MAX_QUEUED = 50  # turns allowed to wait for the LLM before new ones are turned away
+
+# Opt-in Profiling (off unless TALENTSCOUT_PROFILE is "cpu", "memory" or "all")
+PROFILE_MODE = os.getenv("TALENTSCOUT_PROFILE", "").lower()
+PROFILE_DIR = os.getenv("TALENTSCOUT_PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("TALENTSCOUT_PROFILE_KEEP", 20))  # slowest calls kept per kind
+PROFILE_SAMPLE_RATE = float(os.getenv("TALENTSCOUT_PROFILE_SAMPLE", 1.0))  # fraction of calls profiled
+
+# Bounded Session Memory
+TRANSCRIPT_RESIDENT_MESSAGES = 100  # messages a session keeps in memory before older ones spill to the state backend
+TRANSCRIPT_RESIDENT_BYTES = 256 * 1024  # ... or once its in-memory messages take this many bytes
+SESSION_IDLE_TTL = int(os.getenv("TALENTSCOUT_SESSION_IDLE_TTL", 1800))  # idle seconds before a session's memory is released
+SESSION_SWEEP_INTERVAL = 60  # seconds between sweeps for idle sessions
+
+# Technical Assessment Grading
+ASSESSMENT_MAX_TOKENS = 800
+ASSESSMENT_TEMPERATURE = 0.0  # Deterministic grading
+ASSESSMENT_MAX_SCORE = 10
+
 def validate_config():
     """Validate that all required configuration is set"""
     # For local LLMs, we don't need an API key
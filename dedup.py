@@ -0,0 +1,199 @@
+"""
+Near-duplicate candidate detection for TalentScout Hiring Assistant
+
+Fingerprints exported sessions on normalised email, phone, name and tech
+stack with MinHash signatures and buckets them with locality-sensitive
+hashing, so repeat applications can be clustered without comparing every
+pair of sessions.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Any, Iterable, Set, Tuple
+
+# MinHash / LSH defaults: 16 bands of 4 rows puts the S-curve midpoint near
+# a Jaccard similarity of 0.5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+DUPLICATE_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_email(email: Any) -> str:
+    """Lower-case an email and drop any +tag from the local part"""
+    email = str(email or "").strip().lower()
+    if "@" not in email:
+        return ""
+    local, _, domain = email.partition("@")
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_phone(phone: Any) -> str:
+    """Keep the last ten digits of a phone number"""
+    digits = re.sub(r'\D', '', str(phone or ""))
+    return digits[-10:]
+
+
+def normalize_name(name: Any) -> str:
+    """Lower-case a name and collapse whitespace"""
+    return " ".join(re.findall(r'[a-z]+', str(name or "").lower()))
+
+
+def fingerprint_features(session_data: Dict[str, Any]) -> Set[str]:
+    """Build the shingle set used to fingerprint a session"""
+    candidate_info = session_data.get("candidate_info", {}) or {}
+    features: Set[str] = set()
+
+    email = normalize_email(candidate_info.get("email"))
+    if email:
+        features.add(f"email:{email}")
+        features.add(f"email_user:{email.split('@')[0]}")
+
+    phone = normalize_phone(candidate_info.get("phone"))
+    if phone:
+        features.add(f"phone:{phone}")
+
+    name = normalize_name(candidate_info.get("name"))
+    if name:
+        features.update(f"name:{token}" for token in name.split())
+        padded = f" {name} "
+        features.update(f"name3:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+    for tech in session_data.get("tech_stack", []) or []:
+        tech = str(tech).strip().lower()
+        if tech:
+            features.add(f"tech:{tech}")
+    return features
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    """Deterministic (a, b) coefficients for the universal hash family"""
+    coefficients = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"talentscout-minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % _MERSENNE_PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+
+def _base_hash(feature: str) -> int:
+    """Stable 32-bit hash of a feature string"""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def minhash_signature(features: Iterable[str], permutations: List[Tuple[int, int]]) -> Tuple[int, ...]:
+    """Compute the MinHash signature of a feature set"""
+    hashes = [_base_hash(f) for f in features]
+    if not hashes:
+        return tuple([_MAX_HASH] * len(permutations))
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in permutations
+    )
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two signatures"""
+    if not sig_a:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class SessionDeduplicator:
+    """Incremental MinHash/LSH index that clusters duplicate sessions"""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, bands: int = LSH_BANDS,
+                 threshold: float = DUPLICATE_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._permutations = _permutations(num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[Tuple[int, ...]] = []
+        self._session_ids: List[str] = []
+        self._row_by_session: Dict[str, int] = {}
+        self._parent: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._session_ids)
+
+    def _find(self, row: int) -> int:
+        """Union-find root lookup with path halving"""
+        parent = self._parent
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    def _union(self, a: int, b: int):
+        """Merge the clusters containing two rows"""
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            # Keep the earliest session as the cluster representative
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self._parent[root_b] = root_a
+
+    def add(self, session_data: Dict[str, Any]) -> List[str]:
+        """Insert a session and return the ids of earlier sessions it duplicates"""
+        session_id = session_data.get("session_id")
+        if not session_id:
+            raise ValueError("Session data must include a session_id")
+        if session_id in self._row_by_session:
+            return []
+
+        features = fingerprint_features(session_data)
+        signature = minhash_signature(features, self._permutations)
+        row = len(self._session_ids)
+        self._session_ids.append(session_id)
+        self._row_by_session[session_id] = row
+        self._signatures.append(signature)
+        self._parent.append(row)
+        if not features:
+            # Nothing to fingerprint; never bucket empty sessions together
+            return []
+
+        candidates: Set[int] = set()
+        for band in range(self.bands):
+            key = signature[band * self.rows:(band + 1) * self.rows]
+            bucket = self._buckets[band].setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(row)
+
+        matches = []
+        for other in sorted(candidates):
+            # Rows already merged into this cluster need no further verification
+            if self._find(other) == self._find(row) or \
+                    estimate_similarity(signature, self._signatures[other]) >= self.threshold:
+                self._union(row, other)
+                matches.append(self._session_ids[other])
+        return matches
+
+    def add_many(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """Insert many sessions and return how many were added"""
+        count = 0
+        for session_data in sessions:
+            self.add(session_data)
+            count += 1
+        return count
+
+    def cluster_of(self, session_id: str) -> List[str]:
+        """Return every session id in the same duplicate cluster"""
+        row = self._row_by_session.get(session_id)
+        if row is None:
+            return []
+        root = self._find(row)
+        return [sid for r, sid in enumerate(self._session_ids) if self._find(r) == root]
+
+    def clusters(self) -> List[List[str]]:
+        """Return all duplicate clusters with more than one session"""
+        groups: Dict[int, List[str]] = {}
+        for row, session_id in enumerate(self._session_ids):
+            groups.setdefault(self._find(row), []).append(session_id)
+        return [members for _, members in sorted(groups.items()) if len(members) > 1]
@@ -0,0 +1,122 @@
+"""
+Append-only conversation event log for TalentScout Hiring Assistant
+
+Every change to a session is recorded as a small event (message added,
+field extracted, state transition, questions generated, ...). Persisting a
+turn appends only that turn's events; full state snapshots are written
+periodically and state is rebuilt by replaying events from the last one.
+"""
+
+import copy
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Iterable
+
+from config import CONVERSATION_STATES
+
+# Event types
+MESSAGE_ADDED = "message_added"
+FIELD_EXTRACTED = "field_extracted"
+STATE_TRANSITION = "state_transition"
+QUESTIONS_GENERATED = "questions_generated"
+TECH_ADDED = "tech_added"
+ANSWER_RECORDED = "answer_recorded"
+ASSESSMENT_UPDATED = "assessment_updated"
+
+EVENT_TYPES = (
+    MESSAGE_ADDED, FIELD_EXTRACTED, STATE_TRANSITION, QUESTIONS_GENERATED,
+    TECH_ADDED, ANSWER_RECORDED, ASSESSMENT_UPDATED
+)
+
+
+def empty_state() -> Dict[str, Any]:
+    """State of a brand-new session, in HiringAssistant.to_dict() shape"""
+    return {
+        "conversation_state": CONVERSATION_STATES['GREETING'],
+        "candidate_info": {},
+        "tech_stack": [],
+        "technical_questions": [],
+        "current_question_index": 0,
+        "technical_answers": [],
+        "assessment": None,
+        "state_turns": {}
+    }
+
+
+class EventLog:
+    """Thread-safe, append-only log of events not yet persisted"""
+
+    def __init__(self, last_seq: int = 0, snapshot_seq: int = 0):
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self.last_seq = last_seq
+        self.snapshot_seq = snapshot_seq
+
+    def append(self, event_type: str, **data) -> Dict[str, Any]:
+        """Record an event and return it"""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+        with self._lock:
+            self.last_seq += 1
+            event = {
+                "seq": self.last_seq,
+                "type": event_type,
+                "ts": datetime.now().isoformat(),
+                "data": data
+            }
+            self._pending.append(event)
+        return event
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return and clear the events recorded since the last drain"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def should_snapshot(self, interval: int) -> bool:
+        """Whether enough events have accumulated since the last snapshot"""
+        return self.last_seq - self.snapshot_seq >= interval
+
+    def mark_snapshot(self, seq: int):
+        """Record that state up to seq has been snapshotted"""
+        self.snapshot_seq = seq
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one event to a state dict in place and return it"""
+    event_type, data = event["type"], event["data"]
+    if event_type == STATE_TRANSITION:
+        state["conversation_state"] = data["to"]
+    elif event_type == FIELD_EXTRACTED:
+        state["candidate_info"][data["field"]] = data["value"]
+    elif event_type == TECH_ADDED:
+        state["tech_stack"].append(data["tech"])
+    elif event_type == QUESTIONS_GENERATED:
+        state["technical_questions"] = list(data["questions"])
+    elif event_type == ANSWER_RECORDED:
+        state["technical_answers"].append({"question": data["question"], "answer": data["answer"]})
+        state["current_question_index"] = state.get("current_question_index", 0) + 1
+    elif event_type == ASSESSMENT_UPDATED:
+        state["assessment"] = data["assessment"]
+    elif event_type == MESSAGE_ADDED and data["role"] == "user":
+        # Messages themselves feed the transcript; only the turn count is state
+        turns = state.setdefault("state_turns", {})
+        turns[state["conversation_state"]] = turns.get(state["conversation_state"], 0) + 1
+    return state
+
+
+def replay(snapshot: Dict[str, Any], events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild assistant state from a snapshot and the events after it"""
+    state = copy.deepcopy(snapshot) if snapshot else empty_state()
+    for event in events:
+        apply_event(state, event)
+    return state
+
+
+def replay_messages(messages: List[Dict[str, str]], events: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Extend a transcript with the messages recorded in events"""
+    messages = list(messages)
+    for event in events:
+        if event["type"] == MESSAGE_ADDED:
+            messages.append({"role": event["data"]["role"], "content": event["data"]["content"]})
+    return messages
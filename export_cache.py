@@ -0,0 +1,45 @@
+"""
+Memoized session export payloads for TalentScout Hiring Assistant
+
+Serialised exports are cached per (session, version, format), where the
+version is the session's event sequence number, and built only when first
+requested. The sequence number is saved with the session, so a reloaded
+session never matches a payload built before it changed elsewhere.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+
+def session_version_key(session_id: str, assistant, messages: Sequence[Any]) -> Tuple:
+    """Cheap key identifying the current state of a session"""
+    return (session_id, assistant.version, len(messages))
+
+
+class ExportCache:
+    """Thread-safe cache of export payloads for the current session version"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Any] = {}
+        self.builds = 0
+
+    def get(self, version_key: Tuple, fmt: str, build: Callable[[], Any]) -> Any:
+        """Return the payload for (version_key, fmt), building it at most once"""
+        key = version_key + (fmt,)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            # Payloads for older versions can never be requested again
+            for stale in [k for k in self._entries if k[:-1] != version_key]:
+                del self._entries[stale]
+            self._entries[key] = value
+            self.builds += 1
+        return value
+
+    def clear(self):
+        """Drop every cached payload, e.g. when the session goes idle"""
+        with self._lock:
+            self._entries.clear()
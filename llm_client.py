@@ -0,0 +1,38 @@
+"""
+Process-wide LLM client for TalentScout Hiring Assistant
+
+One OpenAI-compatible client per process, shared by every session, the
+headless API and the background graders. It is a plain module-level
+singleton so it can be used without a Streamlit runtime; the Streamlit
+app reaches it through resources, whose invalidate_resources() resets it.
+"""
+
+import threading
+from typing import Optional
+
+from config import OPENAI_BASE_URL
+from coalescing import CoalescingClient
+
+
+_client: Optional[CoalescingClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> CoalescingClient:
+    """OpenAI-compatible client for the local LLM, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import openai  # deferred until the first LLM call; it is slow to import
+            _client = CoalescingClient(openai.OpenAI(
+                api_key="local",  # Not needed for local LLMs
+                base_url=OPENAI_BASE_URL
+            ))
+        return _client
+
+
+def reset_llm_client():
+    """Drop the shared client so the next call builds one from the current config"""
+    global _client
+    with _client_lock:
+        _client = None
@@ -0,0 +1,252 @@
+"""
+Candidate-to-job matching for TalentScout Hiring Assistant
+
+Ranks stored candidate sessions against job descriptions using the tech
+stack, experience and position fields collected by HiringAssistant. All
+candidates are scored against a batch of jobs with a single sparse matrix
+product (SciPy, listed in requirements.txt). Installs without SciPy fall
+back to an equivalent postings-based scorer, which loops over candidates
+in Python and is only meant for small candidate pools.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+
+# Try to import numpy/scipy, but handle gracefully if not available
+try:
+    import numpy as np
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    np = None
+    sparse = None
+
+from utils import extract_tech_stack, extract_position, parse_experience_years
+
+# Relative weight of skill overlap vs. matching the requested position
+SKILL_WEIGHT = 0.8
+POSITION_WEIGHT = 0.2
+
+# Score multiplier applied to candidates below the job's minimum experience
+EXPERIENCE_SHORTFALL_PENALTY = 0.5
+
+JobSpec = Union[str, Dict[str, Any]]
+
+
+def job_requirements(job: JobSpec) -> Dict[str, Any]:
+    """Normalise a job description string or dict into match requirements"""
+    if isinstance(job, str):
+        job = {"description": job}
+
+    description = job.get("description", "")
+    tech_stack = job.get("tech_stack") or extract_tech_stack(description)
+    position = job.get("position") or (extract_position(description) if description else None)
+    return {
+        "tech_stack": sorted({t.strip().lower() for t in tech_stack if t and t.strip()}),
+        "position": position.strip().lower() if position else None,
+        "min_experience": job.get("min_experience")
+    }
+
+
+class CandidateMatcher:
+    """TF-IDF weighted skill matcher over candidate sessions"""
+
+    def __init__(self, skill_weight: float = SKILL_WEIGHT, position_weight: float = POSITION_WEIGHT):
+        self.skill_weight = skill_weight
+        self.position_weight = position_weight
+        self.session_ids: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: List[float] = []
+        self._experience: List[int] = []
+        self._positions: Dict[str, List[int]] = defaultdict(list)
+        # Row of each fitted session id, and the position each row was indexed under
+        self._row_of: Dict[str, int] = {}
+        self._row_positions: List[Optional[str]] = []
+        # Skill features of every fitted candidate, by row, and how many rows have each skill
+        self._rows: List[List[int]] = []
+        self._document_frequency: Dict[int, int] = defaultdict(int)
+        # Sparse candidate x skill matrix (SciPy) or skill -> [(row, weight)] postings
+        self._matrix = None
+        self._experience_array = None
+        self._postings: Dict[int, List[Tuple[int, float]]] = {}
+
+    def fit(self, sessions: Iterable[Dict[str, Any]]) -> "CandidateMatcher":
+        """Add exported sessions and rebuild the weighted skill matrix
+
+        Calling fit() again adds candidates to those already fitted; idf
+        weights change with every batch, so all rows are re-weighted. A
+        session fitted again replaces its earlier entry in place.
+        """
+        rows = self._rows
+        document_frequency = self._document_frequency
+
+        for session_data in sessions:
+            candidate_info = session_data.get("candidate_info", {}) or {}
+            session_id = session_data.get("session_id", f"row_{len(self.session_ids)}")
+            # Unknown experience counts as none, so it never meets a minimum
+            experience = parse_experience_years(candidate_info.get("experience")) or 0
+            row = self._row_of.get(session_id)
+            if row is None:
+                row = self._row_of[session_id] = len(self.session_ids)
+                self.session_ids.append(session_id)
+                self._experience.append(experience)
+                self._row_positions.append(None)
+                rows.append([])
+            else:
+                self._unindex(row)
+                self._experience[row] = experience
+
+            position = candidate_info.get("position")
+            if position:
+                position = str(position).strip().lower()
+                self._positions[position].append(row)
+                self._row_positions[row] = position
+
+            features = []
+            for tech in {str(t).strip().lower() for t in session_data.get("tech_stack", []) if t}:
+                feature = self.vocabulary.setdefault(tech, len(self.vocabulary))
+                document_frequency[feature] += 1
+                features.append(feature)
+            rows[row] = sorted(features)
+
+        total = len(rows)
+        self.idf = [0.0] * len(self.vocabulary)
+        for feature, df in document_frequency.items():
+            self.idf[feature] = math.log((1 + total) / (1 + df)) + 1.0
+
+        if SCIPY_AVAILABLE:
+            self._build_matrix(rows)
+        else:
+            self._build_postings(rows)
+        return self
+
+    def _unindex(self, row: int):
+        """Remove a row's position and skill counts before it is fitted again"""
+        position = self._row_positions[row]
+        if position is not None:
+            self._positions[position].remove(row)
+            self._row_positions[row] = None
+        for feature in self._rows[row]:
+            self._document_frequency[feature] -= 1
+
+    def _row_weights(self, features: List[int], unseen: int = 0) -> List[float]:
+        """L2-normalised idf weights for one row; unseen skills count in the norm only"""
+        weights = [self.idf[f] for f in features]
+        # A skill no candidate has gets the idf of document frequency 0
+        unseen_idf = math.log(1 + len(self._rows)) + 1.0
+        norm = math.sqrt(sum(w * w for w in weights) + unseen * unseen_idf * unseen_idf) or 1.0
+        return [w / norm for w in weights]
+
+    def _build_matrix(self, rows: List[List[int]]):
+        """Assemble the CSR candidate matrix in one allocation"""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for features in rows:
+            indices.extend(features)
+            data.extend(self._row_weights(features))
+            indptr.append(len(indices))
+        self._matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(rows), len(self.vocabulary))
+        )
+        self._experience_array = np.asarray(self._experience, dtype=np.int32)
+
+    def _build_postings(self, rows: List[List[int]]):
+        """Assemble skill postings for the pure-Python scorer"""
+        postings: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+        for row, features in enumerate(rows):
+            for feature, weight in zip(features, self._row_weights(features)):
+                postings[feature].append((row, weight))
+        self._postings = dict(postings)
+
+    def _job_vector(self, requirements: Dict[str, Any]) -> Dict[int, float]:
+        """Sparse idf-weighted job skill vector, normalised over all of the job's skills"""
+        skills = requirements["tech_stack"]
+        # Skills no fitted candidate has (including ones only a replaced entry had) still dilute the match
+        features = [self.vocabulary[t] for t in skills
+                    if t in self.vocabulary and self._document_frequency.get(self.vocabulary[t])]
+        return dict(zip(features, self._row_weights(features, unseen=len(skills) - len(features))))
+
+    def rank(self, job: JobSpec, k: int = 10) -> List[Tuple[str, float]]:
+        """Return the top-k (session_id, score) pairs for one job"""
+        return self.rank_many([job], k=k)[0]
+
+    def rank_many(self, jobs: List[JobSpec], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Score all candidates against several jobs and return top-k per job"""
+        if not self.session_ids or not jobs:
+            return [[] for _ in jobs]
+
+        requirements = [job_requirements(job) for job in jobs]
+        vectors = [self._job_vector(r) for r in requirements]
+        if SCIPY_AVAILABLE:
+            return self._rank_matrix(requirements, vectors, k)
+        return [self._rank_postings(r, v, k) for r, v in zip(requirements, vectors)]
+
+    def _rank_matrix(self, requirements: List[Dict[str, Any]], vectors: List[Dict[int, float]],
+                     k: int) -> List[List[Tuple[str, float]]]:
+        """Batched scoring: one sparse product for every job at once"""
+        job_rows, job_cols, job_data = [], [], []
+        for col, vector in enumerate(vectors):
+            for feature, weight in vector.items():
+                job_rows.append(feature)
+                job_cols.append(col)
+                job_data.append(weight)
+        jobs_matrix = sparse.csc_matrix(
+            (np.asarray(job_data, dtype=np.float64), (job_rows, job_cols)),
+            shape=(len(self.vocabulary), len(vectors))
+        )
+        scores = (self._matrix @ jobs_matrix).tocsc() * self.skill_weight
+        scores.sort_indices()
+
+        results = []
+        for col, req in enumerate(requirements):
+            start, end = scores.indptr[col], scores.indptr[col + 1]
+            rows = scores.indices[start:end]
+            values = scores.data[start:end]
+
+            position_rows = self._positions.get(req["position"], []) if req["position"] else []
+            if position_rows:
+                bonus = np.zeros(len(self.session_ids), dtype=np.float64)
+                bonus[rows] = values
+                bonus[position_rows] += self.position_weight
+                rows = np.flatnonzero(bonus)
+                values = bonus[rows]
+
+            if req["min_experience"] is not None and len(rows):
+                short = self._experience_array[rows] < int(req["min_experience"])
+                values = np.where(short, values * EXPERIENCE_SHORTFALL_PENALTY, values)
+
+            if len(rows) > k:
+                # Partial selection; ties at the cut-off keep the earliest rows
+                kth = np.partition(values, len(values) - k)[len(values) - k]
+                above = np.flatnonzero(values > kth)
+                tied = np.flatnonzero(values == kth)[:k - len(above)]
+                top = np.concatenate([above, tied])
+                rows, values = rows[top], values[top]
+            order = np.lexsort((rows, -values))
+            results.append([(self.session_ids[rows[i]], float(values[i])) for i in order])
+        return results
+
+    def _rank_postings(self, req: Dict[str, Any], vector: Dict[int, float],
+                       k: int) -> List[Tuple[str, float]]:
+        """Pure-Python scoring via skill postings and a bounded heap"""
+        scores: Dict[int, float] = defaultdict(float)
+        for feature, job_weight in vector.items():
+            for row, weight in self._postings.get(feature, []):
+                scores[row] += self.skill_weight * job_weight * weight
+        if req["position"]:
+            for row in self._positions.get(req["position"], []):
+                scores[row] += self.position_weight
+
+        min_experience = req["min_experience"]
+        if min_experience is not None:
+            for row in scores:
+                if self._experience[row] < int(min_experience):
+                    scores[row] *= EXPERIENCE_SHORTFALL_PENALTY
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.session_ids[row], score) for row, score in top]
@@ -0,0 +1,231 @@
+"""
+Opt-in turn and export profiling for TalentScout Hiring Assistant
+
+Set TALENTSCOUT_PROFILE to "cpu", "memory" or "all" to profile every
+chat turn (HiringAssistant.generate_response) and every JSON/CSV export:
+"cpu" runs each call under cProfile, "memory" diffs tracemalloc
+snapshots taken around it. TALENTSCOUT_PROFILE_SAMPLE profiles only that
+fraction of calls. Only the slowest TALENTSCOUT_PROFILE_KEEP calls of each
+kind are kept in TALENTSCOUT_PROFILE_DIR; faster ones are discarded. When
+profiling is off, profiled() returns functions unwrapped, so it costs
+nothing.
+
+Usage:
+    TALENTSCOUT_PROFILE=all streamlit run app.py
+    python profiling.py report
+    python profiling.py report --kind turn --sort tottime --top 30
+"""
+
+import argparse
+import cProfile
+import functools
+import glob
+import heapq
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import PROFILE_MODE, PROFILE_DIR, PROFILE_KEEP, PROFILE_SAMPLE_RATE
+
+PROFILE_MODES = ("cpu", "memory", "all")
+# Allocation sites kept per memory profile
+MEMORY_TOP = 25
+
+# <kind>-<elapsed microseconds>us-<id>; the elapsed time is zero padded so names sort by it
+_PROFILE_NAME = re.compile(r"^(?P<kind>[a-z_]+)-(?P<elapsed_us>\d+)us-(?P<id>[0-9a-f]+)$")
+
+
+def _profile_stem(kind: str, elapsed: float) -> str:
+    return f"{kind}-{round(elapsed * 1e6):012d}us-{uuid.uuid4().hex[:8]}"
+
+
+def _parse_stem(path: str) -> Optional[Tuple[str, float]]:
+    """(kind, elapsed seconds) from a profile file name"""
+    match = _PROFILE_NAME.match(os.path.basename(path).split(".", 1)[0])
+    if not match:
+        return None
+    return match.group("kind"), int(match.group("elapsed_us")) / 1e6
+
+
+class Profiler:
+    """Profiles calls and keeps the slowest keep of each kind on disk"""
+
+    def __init__(self, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP, cpu: bool = True,
+                 memory: bool = False, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.directory = directory
+        self.keep = keep
+        self.cpu = cpu
+        self.memory = memory
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Per kind, a min-heap of (elapsed, stem), so the fastest kept profile is evicted first
+        self._kept: Dict[str, List[Tuple[float, str]]] = {}
+        os.makedirs(directory, exist_ok=True)
+        # Profiles kept by earlier runs still count towards the slowest
+        for stem in {os.path.basename(path).split(".", 1)[0] for path in os.listdir(directory)}:
+            parsed = _parse_stem(stem)
+            if parsed:
+                heapq.heappush(self._kept.setdefault(parsed[0], []), (parsed[1], stem))
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def run(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn, profiling it unless sampled out or already inside a profiled call"""
+        if getattr(self._local, "active", False) or random.random() >= self.sample_rate:
+            return fn(*args, **kwargs)
+        self._local.active = True
+        profile = cProfile.Profile() if self.cpu else None
+        before = tracemalloc.take_snapshot() if self.memory else None
+        start = time.perf_counter()
+        try:
+            if profile:
+                profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if profile:
+                    profile.disable()
+                elapsed = time.perf_counter() - start
+                if self._is_slow(kind, elapsed):
+                    after = tracemalloc.take_snapshot() if before else None
+                    self._save(kind, elapsed, profile, before, after)
+        finally:
+            self._local.active = False
+
+    def _is_slow(self, kind: str, elapsed: float) -> bool:
+        with self._lock:
+            kept = self._kept.get(kind, [])
+            return len(kept) < self.keep or elapsed > kept[0][0]
+
+    def _save(self, kind: str, elapsed: float, profile: Optional[cProfile.Profile],
+              before: Optional[tracemalloc.Snapshot], after: Optional[tracemalloc.Snapshot]):
+        stem = _profile_stem(kind, elapsed)
+        base = os.path.join(self.directory, stem)
+        if profile:
+            profile.dump_stats(base + ".prof")
+        if before and after:
+            # Leave out the snapshots' own bookkeeping
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")[:MEMORY_TOP]
+            with open(base + ".mem.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "kind": kind,
+                    "elapsed": elapsed,
+                    "allocations": [{"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                                     "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                                    for stat in stats]
+                }, f, indent=2)
+        with self._lock:
+            kept = self._kept.setdefault(kind, [])
+            heapq.heappush(kept, (elapsed, stem))
+            evicted = [heapq.heappop(kept)[1] for _ in range(len(kept) - self.keep)]
+        for old in evicted:
+            for path in glob.glob(os.path.join(self.directory, old + ".*")):
+                os.remove(path)
+
+    def kept(self, kind: str) -> List[Tuple[float, str]]:
+        """Kept profiles of a kind as (elapsed, stem), slowest first"""
+        with self._lock:
+            return sorted(self._kept.get(kind, []), reverse=True)
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the process-wide profiler, or None when profiling is off"""
+    global _profiler
+    if PROFILE_MODE not in PROFILE_MODES:
+        return None
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler(cpu=PROFILE_MODE in ("cpu", "all"), memory=PROFILE_MODE in ("memory", "all"))
+        return _profiler
+
+
+def profiled(kind: str, profiler: Optional[Profiler] = None) -> Callable[[Callable], Callable]:
+    """Decorator profiling calls as kind; leaves the function untouched when profiling is off"""
+    def decorate(fn: Callable) -> Callable:
+        active = profiler or get_profiler()
+        if active is None:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return active.run(kind, fn, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Reports
+
+def cpu_report(paths: List[str], sort: str = "cumulative", top: int = 25) -> str:
+    """Top functions across cProfile dumps, merged"""
+    out = io.StringIO()
+    stats = pstats.Stats(*paths, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return out.getvalue()
+
+
+def memory_report(paths: List[str], top: int = 25) -> List[Dict[str, Any]]:
+    """Allocation sites summed across tracemalloc diffs, largest growth first"""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for allocation in json.load(f)["allocations"]:
+                entry = totals.setdefault(allocation["location"],
+                                          {"location": allocation["location"], "size_diff": 0, "count_diff": 0, "profiles": 0})
+                entry["size_diff"] += allocation["size_diff"]
+                entry["count_diff"] += allocation["count_diff"]
+                entry["profiles"] += 1
+    return sorted(totals.values(), key=lambda entry: entry["size_diff"], reverse=True)[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for profile reports"""
+    parser = argparse.ArgumentParser(description="Summarise TalentScout turn and export profiles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="Aggregate kept profiles into top-function reports")
+    report.add_argument("--dir", default=PROFILE_DIR)
+    report.add_argument("--kind", help="Only profiles of this kind (turn, export_json, export_csv)")
+    report.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "ncalls"])
+    report.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    profiles: Dict[str, List[Tuple[float, str]]] = {}
+    for path in glob.glob(os.path.join(args.dir, "*.*")):
+        parsed = _parse_stem(path)
+        if parsed and (not args.kind or parsed[0] == args.kind):
+            profiles.setdefault(parsed[0], []).append((parsed[1], path))
+    if not profiles:
+        print(f"No profiles found in {args.dir}")
+        return 1
+
+    for kind, entries in sorted(profiles.items()):
+        prof = sorted(path for _, path in entries if path.endswith(".prof"))
+        mem = sorted(path for _, path in entries if path.endswith(".mem.json"))
+        times = sorted({elapsed for elapsed, _ in entries}, reverse=True)
+        print(f"== {kind}: {len(times)} profiles, slowest {times[0] * 1000:.1f} ms, "
+              f"fastest kept {times[-1] * 1000:.1f} ms")
+        if prof:
+            print(cpu_report(prof, args.sort, args.top))
+        if mem:
+            print(f"{'allocated':>12} {'blocks':>8} {'profiles':>8}  location")
+            for entry in memory_report(mem, args.top):
+                print(f"{entry['size_diff']:>12,} {entry['count_diff']:>8} {entry['profiles']:>8}  {entry['location']}")
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
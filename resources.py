@@ -0,0 +1,115 @@
+"""
+Shared resources for TalentScout Hiring Assistant
+
+Expensive objects (the tech taxonomy and the Ollama health monitor) are
+built once per process and shared by every session through Streamlit's
+resource cache, instead of per rerun or per call. The shared LLM client
+lives in llm_client, outside Streamlit, so the headless API can use it
+too; it coalesces concurrent identical completions. Pure derived values
+use Streamlit's data cache. Call invalidate_resources() after changing
+configuration.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from config import HEALTH_CHECK_TTL, validate_config, get_config_info
+from utils import build_tech_taxonomy, get_tech_stack_categories
+from assessment import build_rubric_prompt
+from llm_client import get_llm_client, reset_llm_client
+
+
+class HealthMonitor:
+    """Shares one background Ollama availability probe across reruns and sessions"""
+
+    def __init__(self, ttl: float = HEALTH_CHECK_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._error: Optional[str] = None
+        self._probe_done: Optional[threading.Event] = None
+
+    @property
+    def known(self) -> bool:
+        """Whether at least one probe has completed"""
+        return self._checked_at is not None
+
+    def check(self, wait: bool = False) -> Optional[str]:
+        """Return the last probe's error (None if reachable or not yet known)
+
+        A stale result is refreshed on a background thread, so page renders
+        never wait on the network unless wait=True.
+        """
+        with self._lock:
+            stale = self._checked_at is None or time.monotonic() - self._checked_at >= self.ttl
+            if stale and self._probe_done is None:
+                self._probe_done = threading.Event()
+                threading.Thread(target=self._probe, args=(self._probe_done,),
+                                 name="ollama-health", daemon=True).start()
+            probe_done = self._probe_done
+        if wait and probe_done is not None:
+            probe_done.wait()
+        return self._error
+
+    def _probe(self, done: threading.Event):
+        try:
+            validate_config()
+            error = None
+        except ValueError as e:
+            error = str(e)
+        with self._lock:
+            self._error = error
+            self._checked_at = time.monotonic()
+            self._probe_done = None
+        done.set()
+
+
+# Process-wide singletons
+
+@st.cache_resource(show_spinner=False)
+def get_taxonomy() -> Dict[str, str]:
+    """Technology to category index for TECH_CATEGORIES"""
+    return build_tech_taxonomy()
+
+
+@st.cache_resource(show_spinner=False)
+def get_health_monitor() -> HealthMonitor:
+    """Health monitor shared by every session on this process"""
+    return HealthMonitor()
+
+
+# Derived values
+
+@st.cache_data(show_spinner=False)
+def config_info() -> Dict[str, object]:
+    """Configuration summary shown in the sidebar"""
+    return get_config_info()
+
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def tech_stack_categories(tech_stack: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """Categorised tech stack, computed once per distinct stack"""
+    return get_tech_stack_categories(list(tech_stack), get_taxonomy())
+
+
+# Invalidation
+
+_invalidation_hooks: List[Callable[[], None]] = [build_rubric_prompt.cache_clear, reset_llm_client]
+
+
+def register_invalidation_hook(hook: Callable[[], None]) -> Callable[[], None]:
+    """Run hook whenever shared resources are invalidated"""
+    _invalidation_hooks.append(hook)
+    return hook
+
+
+def invalidate_resources():
+    """Drop every cached resource and derived value, e.g. after a config change"""
+    for cached in (get_taxonomy, get_health_monitor,
+                   config_info, tech_stack_categories):
+        cached.clear()
+    for hook in list(_invalidation_hooks):
+        hook()
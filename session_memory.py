@@ -0,0 +1,413 @@
+"""
+Bounded per-session memory for TalentScout Hiring Assistant
+
+A session's transcript is a Transcript rather than a plain list: only the
+newest messages stay in memory, and older ones spill in fixed-size chunks
+that are read back only when they are displayed or exported. Chunks are
+kept in the shared state backend beside the session's state, which
+records how many messages have been spilled, so any process that can
+load a session can also read its spilled messages, and deleting the
+session deletes them. Only full chunks are ever written, before any state
+that counts them, so a chunk's contents never change once written.
+SessionMemory tracks the sessions a process is serving, accounts for the
+memory they hold, and releases sessions idle for longer than the TTL:
+their transcripts spill every full chunk and pack the rest, their
+assistant state is packed into its binary form and their caches are
+cleared. A released session loads back transparently when it is next used.
+"""
+
+import json
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from config import (
+    TRANSCRIPT_RESIDENT_MESSAGES, TRANSCRIPT_RESIDENT_BYTES,
+    CHAT_HISTORY_RECENT, CHAT_HISTORY_PAGE_SIZE, SESSION_IDLE_TTL, SESSION_SWEEP_INTERVAL
+)
+
+
+class MissingTranscriptChunk(LookupError):
+    """Raised when spilled messages cannot be found in the state backend, or a chunk is short"""
+
+    def __init__(self, session_id: str, chunk: int):
+        super().__init__(f"Spilled messages of session {session_id} (chunk {chunk}) are missing or incomplete")
+        self.session_id = session_id
+        self.chunk = chunk
+
+
+def message_size(message: Dict[str, str]) -> int:
+    """Bytes a transcript message holds in memory"""
+    return sys.getsizeof(message) + sum(sys.getsizeof(value) for value in message.values())
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate bytes held by obj and the containers and objects it references"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class SpillStore:
+    """Spilled transcript chunks, compressed, in a state backend's chunk storage"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def write(self, session_id: str, chunk: int, messages: List[Dict[str, str]]):
+        """Store (or replace) one chunk of a session's messages"""
+        data = zlib.compress(json.dumps(messages, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        self.backend.write_chunk(session_id, chunk, data)
+
+    def read(self, session_id: str, chunk: int) -> Optional[List[Dict[str, str]]]:
+        data = self.backend.read_chunk(session_id, chunk)
+        return json.loads(zlib.decompress(data).decode("utf-8")) if data is not None else None
+
+
+_spill_store: Optional[SpillStore] = None
+_spill_store_lock = threading.Lock()
+
+
+def get_spill_store() -> SpillStore:
+    """Return the spill store over the process-wide shared state backend"""
+    global _spill_store
+    with _spill_store_lock:
+        if _spill_store is None:
+            from state_backend import get_shared_state  # deferred: state_backend imports this module
+            _spill_store = get_shared_state().spill_store
+        return _spill_store
+
+
+class Transcript:
+    """A session's messages as a list-like sequence; older messages spill to disk in chunks
+
+    Messages are spilled a chunk at a time, oldest first, while more than
+    max_messages (or max_bytes) are in memory, always keeping at least
+    keep_recent resident for the chat view. Chunks line up with the chat
+    history pages, so showing an older page reads one chunk.
+    """
+
+    def __init__(self, session_id: str, messages: Iterable[Dict[str, str]] = (), spilled: int = 0,
+                 store: Optional[SpillStore] = None, max_messages: int = TRANSCRIPT_RESIDENT_MESSAGES,
+                 max_bytes: int = TRANSCRIPT_RESIDENT_BYTES, chunk_size: int = CHAT_HISTORY_PAGE_SIZE,
+                 keep_recent: int = CHAT_HISTORY_RECENT):
+        if spilled % chunk_size:
+            raise ValueError("Spilled messages must be a whole number of chunks")
+        self.session_id = session_id
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.keep_recent = keep_recent
+        self._store = store
+        self._lock = threading.RLock()
+        # Messages [0, spilled) are on disk only; the rest are resident
+        self.spilled = spilled
+        self._resident: Optional[List[Dict[str, str]]] = []
+        self._resident_bytes = 0
+        # While released: the messages after the last full chunk, compressed, and the length
+        self._packed: Optional[bytes] = None
+        self._length = spilled
+        self.extend(messages)
+
+    @property
+    def store(self) -> SpillStore:
+        if self._store is None:
+            self._store = get_spill_store()
+        return self._store
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the resident messages, or by the packed ones while released"""
+        return self._resident_bytes if self._packed is None else len(self._packed)
+
+    @property
+    def released(self) -> bool:
+        return self._resident is None
+
+    def tail(self) -> List[Dict[str, str]]:
+        """The resident messages, from position spilled on, unpacking them if released"""
+        with self._lock:
+            if self._resident is None:
+                self._resident = json.loads(zlib.decompress(self._packed).decode("utf-8"))
+                self._resident_bytes = sum(map(message_size, self._resident))
+                self._packed = None
+            return self._resident
+
+    def split(self):
+        """(spilled, copy of the resident messages), taken together so a concurrent spill cannot skew them"""
+        with self._lock:
+            return self.spilled, list(self.tail())
+
+    def _read_chunk(self, chunk: int) -> List[Dict[str, str]]:
+        messages = self.store.read(self.session_id, chunk)
+        if messages is None or len(messages) != self.chunk_size:
+            # Never stand in for lost messages: exports would silently differ from what was said
+            raise MissingTranscriptChunk(self.session_id, chunk)
+        return messages
+
+    def _spill(self):
+        # Caller holds self._lock and the messages are resident
+        resident = self._resident
+        while len(resident) - self.chunk_size >= self.keep_recent and (
+                len(resident) > self.max_messages or self._resident_bytes > self.max_bytes):
+            chunk = resident[:self.chunk_size]
+            self.store.write(self.session_id, self.spilled // self.chunk_size, chunk)
+            del resident[:self.chunk_size]
+            self._resident_bytes -= sum(map(message_size, chunk))
+            self.spilled += self.chunk_size
+
+    def append(self, message: Dict[str, str]):
+        with self._lock:
+            self.tail().append(message)
+            self._resident_bytes += message_size(message)
+            self._spill()
+
+    def extend(self, messages: Iterable[Dict[str, str]]):
+        with self._lock:
+            tail = self.tail()
+            for message in messages:
+                tail.append(message)
+                self._resident_bytes += message_size(message)
+            self._spill()
+
+    def release(self) -> int:
+        """Spill every full chunk of resident messages and pack the rest; returns bytes freed
+
+        A partial chunk is never written: another process may later spill
+        the full chunk under the same index, and a stale partial one must
+        not be able to replace it.
+        """
+        with self._lock:
+            if self._resident is None:
+                return 0
+            resident, freed = self._resident, self._resident_bytes
+            full = len(resident) - len(resident) % self.chunk_size
+            for start in range(0, full, self.chunk_size):
+                self.store.write(self.session_id, (self.spilled + start) // self.chunk_size,
+                                 resident[start:start + self.chunk_size])
+            self.spilled += full
+            self._packed = zlib.compress(
+                json.dumps(resident[full:], ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            self._length = self.spilled + len(resident) - full
+            self._resident, self._resident_bytes = None, 0
+            return freed - len(self._packed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._length if self._resident is None else self.spilled + len(self._resident)
+
+    def _range(self, start: int, stop: int) -> List[Dict[str, str]]:
+        with self._lock:
+            spilled = self.spilled
+            messages = []
+            for chunk in range(start // self.chunk_size, -(-min(stop, spilled) // self.chunk_size)):
+                offset = chunk * self.chunk_size
+                messages += self._read_chunk(chunk)[max(start - offset, 0):min(stop, spilled) - offset]
+            if stop > spilled:
+                messages += self.tail()[max(start - spilled, 0):stop - spilled]
+            return messages
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+            if positions.step != 1:
+                return [self[i] for i in positions]
+            return self._range(positions.start, positions.stop) if positions else []
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("transcript index out of range")
+        return self._range(index, index + 1)[0]
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        # Spilled chunks are read one at a time, so iterating never loads the whole transcript
+        for chunk in range(self.spilled // self.chunk_size):
+            yield from self._read_chunk(chunk)
+        yield from list(self.tail())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Transcript)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Transcript({self.session_id!r}, {len(self)} messages, {self.spilled} spilled)"
+
+
+def as_transcript(session_id: str, messages: Iterable[Dict[str, str]]) -> Transcript:
+    """messages as a Transcript for session_id, wrapping a plain list if needed"""
+    if isinstance(messages, Transcript) and messages.session_id == session_id:
+        return messages
+    return Transcript(session_id, messages)
+
+
+class _TrackedSession:
+    """What SessionMemory knows about one session"""
+
+    def __init__(self, last_active: float):
+        self.last_active = last_active
+        self.transcript: Optional[Transcript] = None
+        self.assistant = None
+        self.caches: List[Any] = []
+        self.on_release: Optional[Callable[[], None]] = None
+        # Held while the session is in use; a sweep only releases sessions it can take it from
+        self.lock: Any = threading.RLock()
+
+
+class SessionMemory:
+    """Accounts for the memory of sessions served here and releases idle ones"""
+
+    def __init__(self, ttl: float = SESSION_IDLE_TTL, sweep_interval: float = SESSION_SWEEP_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _TrackedSession] = {}
+        self._last_sweep = clock()
+        self.released_total = 0
+        self.released_bytes = 0
+
+    def _tracked(self, session_id: str) -> _TrackedSession:
+        # Caller holds self._lock
+        tracked = self._sessions.get(session_id)
+        if tracked is None:
+            tracked = self._sessions[session_id] = _TrackedSession(self.clock())
+        return tracked
+
+    def touch(self, session_id: str, transcript: Optional[Transcript] = None, assistant=None,
+              caches: Iterable[Any] = (), on_release: Optional[Callable[[], None]] = None, lock=None):
+        """Record activity for a session and the objects holding its memory
+
+        lock, if given, is the owner's own lock for the session (e.g. the one
+        its turns hold); sweeps then skip the session while it is held.
+        """
+        with self._lock:
+            tracked = self._tracked(session_id)
+            tracked.last_active = self.clock()
+            tracked.transcript = transcript or tracked.transcript
+            tracked.assistant = assistant or tracked.assistant
+            tracked.caches = [cache for cache in caches if cache is not None] or tracked.caches
+            tracked.on_release = on_release or tracked.on_release
+            tracked.lock = lock or tracked.lock
+
+    @contextmanager
+    def in_use(self, session_id: str) -> Iterator[None]:
+        """Hold the session's lock, so it is not released while e.g. a script run uses it"""
+        while True:
+            with self._lock:
+                tracked = self._tracked(session_id)
+            with tracked.lock:
+                with self._lock:
+                    current = self._sessions.get(session_id) is tracked
+                if current:
+                    yield
+                    return
+            # Released while we waited; its objects reload on use, so take the new entry's lock
+
+    def forget(self, session_id: str):
+        """Stop tracking a deleted session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def usage(self) -> Dict[str, Dict[str, float]]:
+        """Approximate bytes held per tracked session, and how long each has been idle"""
+        with self._lock:
+            tracked = list(self._sessions.items())
+        now = self.clock()
+        usage = {}
+        for session_id, session in tracked:
+            transcript_bytes = session.transcript.memory_bytes if session.transcript else 0
+            assistant_bytes = session.assistant.memory_bytes() if session.assistant else 0
+            usage[session_id] = {
+                "transcript_bytes": transcript_bytes,
+                "assistant_bytes": assistant_bytes,
+                "total_bytes": transcript_bytes + assistant_bytes,
+                "idle_seconds": round(now - session.last_active, 1)
+            }
+        return usage
+
+    def sweep(self, busy: Callable[[str], bool] = lambda session_id: False, force: bool = False) -> List[str]:
+        """Release sessions idle longer than the TTL, at most once per sweep interval
+
+        A session is skipped while busy() says so or while its lock is held
+        by a script run, turn or grading that is using it.
+        """
+        now = self.clock()
+        with self._lock:
+            if not force and now - self._last_sweep < self.sweep_interval:
+                return []
+            self._last_sweep = now
+            idle = [(session_id, session) for session_id, session in self._sessions.items()
+                    if now - session.last_active >= self.ttl]
+        released = []
+        for session_id, session in idle:
+            if busy(session_id) or not session.lock.acquire(blocking=False):
+                continue
+            try:
+                with self._lock:
+                    if self._sessions.get(session_id) is not session or now - session.last_active < self.ttl:
+                        continue
+                    del self._sessions[session_id]
+                self.released_bytes += self._release(session)
+                self.released_total += 1
+                released.append(session_id)
+            finally:
+                session.lock.release()
+        return released
+
+    @staticmethod
+    def _release(session: _TrackedSession) -> int:
+        freed = 0
+        if session.transcript is not None:
+            freed += session.transcript.release()
+        if session.assistant is not None:
+            freed += session.assistant.release()
+        for cache in session.caches:
+            cache.clear()
+        if session.on_release is not None:
+            session.on_release()
+        return freed
+
+    def metrics(self) -> Dict[str, int]:
+        """Counters for monitoring memory held by live sessions"""
+        usage = self.usage()
+        return {
+            "tracked_sessions": len(usage),
+            "resident_bytes": sum(entry["total_bytes"] for entry in usage.values()),
+            "released_total": self.released_total,
+            "released_bytes": self.released_bytes
+        }
+
+
+_session_memory: Optional[SessionMemory] = None
+_session_memory_lock = threading.Lock()
+
+
+def get_session_memory() -> SessionMemory:
+    """Return the process-wide session memory tracker, creating it on first use"""
+    global _session_memory
+    with _session_memory_lock:
+        if _session_memory is None:
+            _session_memory = SessionMemory()
+        return _session_memory
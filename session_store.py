@@ -0,0 +1,389 @@
+"""
+Durable session storage for TalentScout Hiring Assistant
+
+Persists sessions to a WAL-mode SQLite database as an append-only event
+log plus periodic state snapshots; messages and extracted candidate fields
+are projected from the events into their own tables. Writes are queued and
+applied in batches by a background writer thread, so a chat turn never
+waits on a synchronous disk write. A batch that keeps failing is logged
+and dropped, and the next flush() raises SessionStoreError.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from config import (
+    SESSION_DB_PATH, SESSION_WRITE_BATCH_SIZE, SESSION_FLUSH_INTERVAL, SESSION_WRITE_ATTEMPTS,
+    EVENT_SNAPSHOT_INTERVAL
+)
+from event_log import MESSAGE_ADDED, FIELD_EXTRACTED, STATE_TRANSITION, replay
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    conversation_state TEXT,
+    state_json TEXT NOT NULL,
+    snapshot_seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS candidate_fields (
+    session_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (session_id, field)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+"""
+
+_UPSERT_SESSION = """
+INSERT INTO sessions (session_id, created_at, updated_at, conversation_state, state_json, snapshot_seq)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(session_id) DO UPDATE SET
+    updated_at = excluded.updated_at,
+    conversation_state = excluded.conversation_state,
+    state_json = excluded.state_json,
+    snapshot_seq = excluded.snapshot_seq
+WHERE excluded.snapshot_seq >= sessions.snapshot_seq
+"""
+
+_INSERT_EVENT = """
+INSERT OR IGNORE INTO events (session_id, seq, type, payload_json, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_TOUCH_SESSION = """
+UPDATE sessions SET updated_at = ?, conversation_state = COALESCE(?, conversation_state)
+WHERE session_id = ?
+"""
+
+_UPSERT_MESSAGE = """
+INSERT OR REPLACE INTO messages (session_id, seq, role, content, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPSERT_FIELD = """
+INSERT OR REPLACE INTO candidate_fields (session_id, field, value, updated_at)
+VALUES (?, ?, ?, ?)
+"""
+
+# Sentinel used to stop the writer thread
+_STOP = object()
+
+
+class SessionStoreError(Exception):
+    """Raised by flush() when queued writes could not be committed"""
+
+
+def _decode_events(rows: List[tuple]) -> List[Dict[str, Any]]:
+    """Turn (seq, type, payload_json) rows back into event dicts"""
+    return [{"seq": seq, "type": event_type, "data": json.loads(payload)} for seq, event_type, payload in rows]
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection configured for WAL-mode concurrent access"""
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SessionStore:
+    """SQLite session store with a write-behind batching queue"""
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, batch_size: int = SESSION_WRITE_BATCH_SIZE,
+                 flush_interval: float = SESSION_FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._read_lock = threading.Lock()
+        # Writes dropped since the last flush(), and the error that dropped the latest of them
+        self._error_lock = threading.Lock()
+        self._failed_writes = 0
+        self._write_error: Optional[sqlite3.Error] = None
+
+        with _connect(db_path) as conn:
+            conn.executescript(_SCHEMA)
+        self._reader = _connect(db_path)
+
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+
+    # Write path: enqueue only, never touches the disk on the caller's thread
+
+    def save_session(self, session_id: str, state: Dict[str, Any], snapshot_seq: int = 0):
+        """Queue a snapshot of the assistant state covering events up to snapshot_seq"""
+        now = datetime.now().isoformat()
+        self._queue.put(("session", (session_id, now, now, state.get("conversation_state"),
+                                     json.dumps(state, ensure_ascii=False), snapshot_seq)))
+
+    def append_events(self, session_id: str, events: List[Dict[str, Any]]):
+        """Queue new events for a session; cost is independent of session length"""
+        for event in events:
+            self._queue.put(("event", (session_id, event["seq"], event["type"],
+                                       json.dumps(event["data"], ensure_ascii=False), event["ts"])))
+
+    def delete_session(self, session_id: str):
+        """Queue removal of a session with its events, messages and fields"""
+        self._queue.put(("delete", session_id))
+
+    def flush(self):
+        """Block until every queued write has been applied; raises SessionStoreError if any were dropped"""
+        self._queue.join()
+        with self._error_lock:
+            failed, error = self._failed_writes, self._write_error
+            self._failed_writes, self._write_error = 0, None
+        if failed:
+            raise SessionStoreError(f"{failed} queued session writes were not committed: {error}")
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._reader.close()
+
+    def _write_loop(self):
+        """Drain the queue in batches, one transaction per batch"""
+        conn = _connect(self.db_path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            if any(item is _STOP for item in batch):
+                running = False
+            writes = [item for item in batch if item is not _STOP]
+            try:
+                self._apply_with_retries(conn, writes)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _apply_with_retries(self, conn: sqlite3.Connection, writes: List[Tuple[str, tuple]]):
+        """Apply a batch, retrying transient errors; a batch that keeps failing is recorded for flush()"""
+        for attempt in range(1, SESSION_WRITE_ATTEMPTS + 1):
+            try:
+                self._apply(conn, writes)
+                return
+            except sqlite3.Error as e:
+                if attempt < SESSION_WRITE_ATTEMPTS:
+                    logger.warning("Session store write failed (attempt %d of %d): %s",
+                                   attempt, SESSION_WRITE_ATTEMPTS, e)
+                    time.sleep(self.flush_interval * attempt)
+                    continue
+                logger.error("Session store dropped %d queued writes: %s", len(writes), e)
+                with self._error_lock:
+                    self._failed_writes += len(writes)
+                    self._write_error = e
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, writes: List[Tuple[str, tuple]]):
+        """Apply a batch of queued writes in queue order, in a single transaction"""
+        if not writes:
+            return
+        with conn:
+            upserts: List[Tuple[str, tuple]] = []
+            for kind, row in writes:
+                if kind != "delete":
+                    upserts.append((kind, row))
+                    continue
+                # Writes queued before a delete land first; writes queued after it recreate the session
+                SessionStore._apply_upserts(conn, upserts)
+                upserts = []
+                for table in ("sessions", "events", "messages", "candidate_fields"):
+                    conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (row,))
+            SessionStore._apply_upserts(conn, upserts)
+
+    @staticmethod
+    def _apply_upserts(conn: sqlite3.Connection, writes: List[Tuple[str, tuple]]):
+        """Apply a run of snapshot and event writes, coalesced; caller holds the transaction"""
+        sessions: Dict[str, tuple] = {}
+        events: List[tuple] = []
+        messages: List[tuple] = []
+        fields: Dict[tuple, tuple] = {}
+        touched: Dict[str, List[Any]] = {}
+        for kind, row in writes:
+            if kind == "session":
+                # Later snapshots supersede earlier ones unless they cover fewer events
+                previous = sessions.pop(row[0], None)
+                sessions[row[0]] = row if previous is None or row[5] >= previous[5] else previous
+                continue
+            events.append(row)
+            session_id, seq, event_type, payload_json, created_at = row
+            touch = touched.setdefault(session_id, [created_at, None])
+            touch[0] = created_at
+            if event_type == MESSAGE_ADDED:
+                payload = json.loads(payload_json)
+                messages.append((session_id, seq, payload["role"], payload["content"], created_at))
+            elif event_type == FIELD_EXTRACTED:
+                payload = json.loads(payload_json)
+                value = payload["value"]
+                fields[(session_id, payload["field"])] = (
+                    session_id, payload["field"], None if value is None else str(value), created_at
+                )
+            elif event_type == STATE_TRANSITION:
+                touch[1] = json.loads(payload_json)["to"]
+        if sessions:
+            conn.executemany(_UPSERT_SESSION, sessions.values())
+        if events:
+            conn.executemany(_INSERT_EVENT, events)
+        if messages:
+            conn.executemany(_UPSERT_MESSAGE, messages)
+        if fields:
+            conn.executemany(_UPSERT_FIELD, fields.values())
+        if touched:
+            conn.executemany(_TOUCH_SESSION, [
+                (updated_at, state, session_id) for session_id, (updated_at, state) in touched.items()
+            ])
+
+    def save_assistant(self, session_id: str, assistant, snapshot: bool = False):
+        """Queue an assistant's new events, plus a snapshot every EVENT_SNAPSHOT_INTERVAL events"""
+        self.append_events(session_id, assistant.events.drain())
+        if snapshot or assistant.events.should_snapshot(EVENT_SNAPSHOT_INTERVAL):
+            seq = assistant.events.last_seq
+            self.save_session(session_id, assistant.to_dict(), snapshot_seq=seq)
+            assistant.events.mark_snapshot(seq)
+
+    # Read path
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load a session, replaying events recorded after its last snapshot"""
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT state_json, created_at, updated_at, snapshot_seq FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            event_rows = self._reader.execute(
+                "SELECT seq, type, payload_json FROM events WHERE session_id = ? AND seq > ? ORDER BY seq",
+                (session_id, row[3])
+            ).fetchall()
+            last_seq = self._reader.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM events WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            messages = self._reader.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq",
+                (session_id,)
+            ).fetchall()
+            fields = self._reader.execute(
+                "SELECT field, value FROM candidate_fields WHERE session_id = ?",
+                (session_id,)
+            ).fetchall()
+        return {
+            "session_id": session_id,
+            "created_at": row[1],
+            "updated_at": row[2],
+            "state": replay(json.loads(row[0]), _decode_events(event_rows)),
+            "snapshot_seq": row[3],
+            "last_seq": max(last_seq, row[3]),
+            "messages": [{"role": role, "content": content} for role, content in messages],
+            "candidate_info": dict(fields)
+        }
+
+    def list_sessions(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """List the most recently updated sessions"""
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT session_id, conversation_state, created_at, updated_at FROM sessions "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [
+            {"session_id": r[0], "conversation_state": r[1], "created_at": r[2], "updated_at": r[3]}
+            for r in rows
+        ]
+
+    def iter_sessions(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream every stored session in pages, in session_id order"""
+        last_id = ""
+        while True:
+            with self._read_lock:
+                rows = self._reader.execute(
+                    "SELECT session_id, state_json, created_at, updated_at, snapshot_seq FROM sessions "
+                    "WHERE session_id > ? ORDER BY session_id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    return
+                ids = [r[0] for r in rows]
+                placeholders = ",".join("?" * len(ids))
+                message_rows = self._reader.execute(
+                    f"SELECT session_id, role, content FROM messages "
+                    f"WHERE session_id IN ({placeholders}) ORDER BY session_id, seq",
+                    ids
+                ).fetchall()
+                event_rows = self._reader.execute(
+                    f"SELECT e.session_id, e.seq, e.type, e.payload_json FROM events e "
+                    f"JOIN sessions s ON s.session_id = e.session_id "
+                    f"WHERE e.session_id IN ({placeholders}) AND e.seq > s.snapshot_seq "
+                    f"ORDER BY e.session_id, e.seq",
+                    ids
+                ).fetchall()
+
+            messages: Dict[str, List[Dict[str, str]]] = {}
+            for session_id, role, content in message_rows:
+                messages.setdefault(session_id, []).append({"role": role, "content": content})
+            events: Dict[str, List[tuple]] = {}
+            for session_id, seq, event_type, payload_json in event_rows:
+                events.setdefault(session_id, []).append((seq, event_type, payload_json))
+            for session_id, state_json, created_at, updated_at, _ in rows:
+                yield {
+                    "session_id": session_id,
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                    "state": replay(json.loads(state_json), _decode_events(events.get(session_id, []))),
+                    "messages": messages.get(session_id, [])
+                }
+            last_id = ids[-1]
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store, creating it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+            atexit.register(_store.close)
+        return _store
@@ -0,0 +1,474 @@
+"""
+Shared live session state for TalentScout Hiring Assistant
+
+Keeps each session's HiringAssistant state and transcript in a store that
+every app process can reach, so any worker can serve any turn and nodes
+can restart without losing conversations. State is saved as a compact
+blob (binary assistant state plus the compressed transcript) with a
+version number; transcript messages already spilled are kept as separate
+chunks in the same backend and referenced by count rather than copied; a
+save names the version it was based on and fails with VersionConflict if
+another worker saved first (optimistic concurrency). Backends also hold
+short per-session leases, so work such as grading an assessment runs on
+one worker only. Backends
+are pluggable: SQLite (default) and a directory of files ship here, others
+can be added with register_backend().
+"""
+
+import abc
+import glob
+import json
+import os
+import re
+import socket
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from config import STATE_BACKEND, STATE_BACKEND_PATH, GRADING_LEASE_TTL
+from assistant_state import encode_state, decode_state
+from session_memory import SpillStore, Transcript
+
+# First byte of every encoded blob, so the format can evolve
+STATE_FORMAT_BINARY = 2
+STATE_FORMAT_SPILLED = 3
+
+_BINARY_HEADER = struct.Struct(">BIII")  # format, last_seq, snapshot_seq, state length
+_SPILLED_HEADER = struct.Struct(">BIIII")  # as above, then messages held as spilled chunks
+
+# Lease held while a session's assessment is graded
+GRADING_LEASE = "grading"
+
+
+class VersionConflict(Exception):
+    """Raised when a save is based on a version that is no longer current"""
+
+    def __init__(self, session_id: str, expected: int, actual: int):
+        super().__init__(f"Session {session_id} is at version {actual}, not {expected}")
+        self.session_id = session_id
+        self.expected = expected
+        self.actual = actual
+
+
+def encode_session(assistant, messages: List[Dict[str, str]]) -> bytes:
+    """Serialise an assistant and its transcript (a list or Transcript) into a compact blob"""
+    spilled = 0
+    if isinstance(messages, Transcript):
+        # Spilled chunks never change, so only the resident tail is written
+        spilled, messages = messages.split()
+    state = encode_state(assistant.state)
+    transcript = json.dumps(messages, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header = _SPILLED_HEADER.pack(STATE_FORMAT_SPILLED, assistant.events.last_seq,
+                                  assistant.events.snapshot_seq, len(state), spilled)
+    return header + state + zlib.compress(transcript)
+
+
+def decode_session(data: bytes) -> Dict[str, Any]:
+    """Decode a blob into a record HiringAssistant.from_stored() accepts
+
+    "messages" holds the resident messages only; the first "spilled"
+    messages are in the backend's transcript chunks.
+    """
+    if data and data[0] in (STATE_FORMAT_BINARY, STATE_FORMAT_SPILLED):
+        if data[0] == STATE_FORMAT_SPILLED:
+            _, last_seq, snapshot_seq, state_length, spilled = _SPILLED_HEADER.unpack_from(data)
+            start = _SPILLED_HEADER.size
+        else:
+            _, last_seq, snapshot_seq, state_length = _BINARY_HEADER.unpack_from(data)
+            start, spilled = _BINARY_HEADER.size, 0
+        return {
+            "state": decode_state(data[start:start + state_length]).to_dict(),
+            "messages": json.loads(zlib.decompress(data[start + state_length:]).decode("utf-8")),
+            "spilled": spilled,
+            "last_seq": last_seq,
+            "snapshot_seq": snapshot_seq
+        }
+    raise ValueError("Unknown session state format")
+
+
+class StateBackend(abc.ABC):
+    """Versioned blob storage keyed by session id; version 0 means absent"""
+
+    @abc.abstractmethod
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        """Return (version, data), or None if the session is unknown"""
+
+    @abc.abstractmethod
+    def version(self, session_id: str) -> int:
+        """Current version of a session, without reading its data"""
+
+    @abc.abstractmethod
+    def save(self, session_id: str, data: bytes, expected_version: int) -> int:
+        """Store data if the session is still at expected_version; returns the new version"""
+
+    @abc.abstractmethod
+    def delete(self, session_id: str):
+        """Remove a session with its transcript chunks and leases"""
+
+    @abc.abstractmethod
+    def write_chunk(self, session_id: str, chunk: int, data: bytes):
+        """Store (or replace) one spilled transcript chunk"""
+
+    @abc.abstractmethod
+    def read_chunk(self, session_id: str, chunk: int) -> Optional[bytes]:
+        """Return a spilled transcript chunk, or None if it is missing"""
+
+    @abc.abstractmethod
+    def acquire_lease(self, session_id: str, name: str, owner: str, ttl: float) -> bool:
+        """Take the named lease for ttl seconds; False while anyone holds it unexpired"""
+
+    @abc.abstractmethod
+    def release_lease(self, session_id: str, name: str, owner: str):
+        """Give up a lease taken by owner (a no-op if it expired and was taken over)"""
+
+    def close(self):
+        """Release any open resources"""
+
+
+class SQLiteStateBackend(StateBackend):
+    """State in a WAL-mode SQLite database shared by processes on one host"""
+
+    def __init__(self, path: str = STATE_BACKEND_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_state (
+                session_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS transcript_chunks (
+                session_id TEXT NOT NULL,
+                chunk INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (session_id, chunk)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_leases (
+                session_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (session_id, name)
+            )
+        """)
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, data FROM session_state WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def version(self, session_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM session_state WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def save(self, session_id: str, data: bytes, expected_version: int) -> int:
+        now = datetime.now().isoformat()
+        with self._lock:
+            if expected_version == 0:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO session_state (session_id, version, data, updated_at) VALUES (?, 1, ?, ?)",
+                    (session_id, data, now)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE session_state SET version = version + 1, data = ?, updated_at = ? "
+                    "WHERE session_id = ? AND version = ?",
+                    (data, now, session_id, expected_version)
+                )
+            if cursor.rowcount == 1:
+                return expected_version + 1
+            row = self._conn.execute(
+                "SELECT version FROM session_state WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        raise VersionConflict(session_id, expected_version, row[0] if row else 0)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM session_state WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM transcript_chunks WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM session_leases WHERE session_id = ?", (session_id,))
+
+    def write_chunk(self, session_id: str, chunk: int, data: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcript_chunks (session_id, chunk, data) VALUES (?, ?, ?)",
+                (session_id, chunk, data)
+            )
+
+    def read_chunk(self, session_id: str, chunk: int) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM transcript_chunks WHERE session_id = ? AND chunk = ?", (session_id, chunk)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def acquire_lease(self, session_id: str, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO session_leases (session_id, name, owner, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id, name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE session_leases.expires_at <= ?",
+                (session_id, name, owner, now + ttl, now)
+            )
+        return cursor.rowcount == 1
+
+    def release_lease(self, session_id: str, name: str, owner: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM session_leases WHERE session_id = ? AND name = ? AND owner = ?",
+                (session_id, name, owner)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FileStateBackend(StateBackend):
+    """State as one file per session in a directory, e.g. on a shared volume
+
+    Each file holds an 8-byte version followed by the data and is replaced
+    atomically; spilled transcript chunks and leases are files beside it.
+    Writes are serialised across processes with fcntl locks where
+    available, otherwise only within this process.
+    """
+
+    _SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+    _LEASE_NAME = re.compile(r"^[a-z_]{1,32}$")
+
+    def __init__(self, directory: str = STATE_BACKEND_PATH):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> Optional[str]:
+        # Session ids come from URLs; never let one escape the directory
+        if not self._SESSION_ID.match(session_id):
+            return None
+        return os.path.join(self.directory, f"{session_id}.state")
+
+    def _checked_path(self, session_id: str) -> str:
+        path = self._path(session_id)
+        if not path:
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return path
+
+    @contextmanager
+    def _locked(self, path: str) -> Iterator[None]:
+        """Hold the write lock of a session's state file (its leases share it)"""
+        with self._lock, open(path + ".lock", "a") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # The lock is released when lock_file closes
+            yield
+
+    def _write(self, path: str, content: bytes):
+        """Replace a file atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read(self, path: str) -> Optional[Tuple[int, bytes]]:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        return int.from_bytes(content[:8], "big"), content[8:]
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        path = self._path(session_id)
+        return self._read(path) if path else None
+
+    def version(self, session_id: str) -> int:
+        path = self._path(session_id)
+        if not path:
+            return 0
+        try:
+            with open(path, "rb") as f:
+                return int.from_bytes(f.read(8), "big")
+        except FileNotFoundError:
+            return 0
+
+    def save(self, session_id: str, data: bytes, expected_version: int) -> int:
+        path = self._checked_path(session_id)
+        with self._locked(path):
+            current = self._read(path)
+            actual = current[0] if current else 0
+            if actual != expected_version:
+                raise VersionConflict(session_id, expected_version, actual)
+            self._write(path, (actual + 1).to_bytes(8, "big") + data)
+        return actual + 1
+
+    def delete(self, session_id: str):
+        path = self._path(session_id)
+        if path:
+            base = glob.escape(path[:-len(".state")])
+            for stale in [path] + glob.glob(base + ".*.chunk") + glob.glob(base + ".*.lease"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    def _chunk_path(self, session_id: str, chunk: int) -> str:
+        return self._checked_path(session_id)[:-len(".state")] + f".{int(chunk)}.chunk"
+
+    def write_chunk(self, session_id: str, chunk: int, data: bytes):
+        self._write(self._chunk_path(session_id, chunk), data)
+
+    def read_chunk(self, session_id: str, chunk: int) -> Optional[bytes]:
+        try:
+            with open(self._chunk_path(session_id, chunk), "rb") as f:
+                return f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _lease_path(self, session_id: str, name: str) -> str:
+        if not self._LEASE_NAME.match(name):
+            raise ValueError(f"Invalid lease name: {name!r}")
+        return self._checked_path(session_id)[:-len(".state")] + f".{name}.lease"
+
+    def acquire_lease(self, session_id: str, name: str, owner: str, ttl: float) -> bool:
+        path = self._lease_path(session_id, name)
+        with self._locked(self._checked_path(session_id)):
+            now = time.time()
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if json.load(f)["expires_at"] > now:
+                        return False
+            except (FileNotFoundError, ValueError, KeyError):
+                pass
+            self._write(path, json.dumps({"owner": owner, "expires_at": now + ttl}).encode("utf-8"))
+        return True
+
+    def release_lease(self, session_id: str, name: str, owner: str):
+        path = self._lease_path(session_id, name)
+        with self._locked(self._checked_path(session_id)):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    held_by = json.load(f).get("owner")
+            except (FileNotFoundError, ValueError):
+                return
+            if held_by == owner:
+                os.remove(path)
+
+
+_BACKENDS: Dict[str, Callable[[str], StateBackend]] = {
+    "sqlite": SQLiteStateBackend,
+    "file": FileStateBackend
+}
+
+
+def register_backend(name: str, factory: Callable[[str], StateBackend]):
+    """Make a backend available to create_backend() and TALENTSCOUT_STATE_BACKEND"""
+    _BACKENDS[name] = factory
+
+
+def create_backend(name: str = STATE_BACKEND, path: str = STATE_BACKEND_PATH) -> StateBackend:
+    """Instantiate a registered backend"""
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown state backend: {name} (available: {', '.join(sorted(_BACKENDS))})")
+    return _BACKENDS[name](path)
+
+
+class SharedSessionState:
+    """Loads and saves HiringAssistant sessions through a state backend"""
+
+    def __init__(self, backend: Optional[StateBackend] = None, owner: Optional[str] = None):
+        self.backend = backend or create_backend()
+        # Spilled transcript chunks live in the same backend as the state that counts them
+        self.spill_store = SpillStore(self.backend)
+        # Names this process in the leases it takes
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Latest record for a session (with its "version" and messages as a Transcript), or None"""
+        found = self.backend.load(session_id)
+        if found is None:
+            return None
+        version, data = found
+        stored = decode_session(data)
+        stored["messages"] = Transcript(session_id, stored["messages"], stored.pop("spilled", 0),
+                                        store=self.spill_store)
+        stored["session_id"] = session_id
+        stored["version"] = version
+        return stored
+
+    def version(self, session_id: str) -> int:
+        """Current version of a session (0 if unknown)"""
+        return self.backend.version(session_id)
+
+    def save(self, session_id: str, assistant, messages: List[Dict[str, str]], expected_version: int) -> int:
+        """Save a session based on expected_version; raises VersionConflict if it moved on"""
+        return self.backend.save(session_id, encode_session(assistant, messages), expected_version)
+
+    def claim_grading(self, session_id: str, based_on_version: Optional[int] = None,
+                      ttl: float = GRADING_LEASE_TTL) -> bool:
+        """Take the session's grading lease, so no other worker grades it too
+
+        With based_on_version (the version a pending assessment was loaded
+        from), the claim also fails if a newer version has been saved since,
+        e.g. by the worker that just finished grading it.
+        """
+        if not self.backend.acquire_lease(session_id, GRADING_LEASE, self.owner, ttl):
+            return False
+        if based_on_version is not None and self.backend.version(session_id) != based_on_version:
+            self.release_grading(session_id)
+            return False
+        return True
+
+    def release_grading(self, session_id: str):
+        """Give up the grading lease once the result is saved (or grading failed)"""
+        self.backend.release_lease(session_id, GRADING_LEASE, self.owner)
+
+    def delete(self, session_id: str):
+        """Remove a session's state, spilled messages and leases"""
+        self.backend.delete(session_id)
+
+    def close(self):
+        self.backend.close()
+
+
+_shared_state: Optional[SharedSessionState] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedSessionState:
+    """Return the process-wide shared session state, creating it on first use"""
+    global _shared_state
+    with _shared_state_lock:
+        if _shared_state is None:
+            _shared_state = SharedSessionState()
+        return _shared_state
@@ -0,0 +1,168 @@
+"""
+Test script for TalentScout rate limiting and admission control
+This script checks token buckets, per-session and per-IP limits and the LLM queue without requiring Ollama.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from admission import TokenBucket, RateLimiter, RateLimits, AdmissionController, Overloaded, ordinal
+from turn_worker import TurnWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket():
+    """Test bursts, refill and retry hints"""
+    print("Testing token bucket...")
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=3, clock=clock)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.retry_after() == 2.0
+    clock.now = 2.0
+    assert bucket.try_acquire() and not bucket.try_acquire()
+    clock.now = 100.0
+    assert bucket.try_acquire() and bucket.tokens == 2
+
+
+def test_session_and_ip_limits():
+    """Test that sessions are limited separately and share their IP's budget"""
+    print("Testing rate limits...")
+
+    clock = FakeClock()
+    limits = RateLimits(RateLimiter(per_minute=6, burst=2, clock=clock),
+                        RateLimiter(per_minute=6, burst=3, clock=clock))
+    assert limits.check("a", "10.0.0.1") == 0 and limits.check("a", "10.0.0.1") == 0
+    assert limits.check("a", "10.0.0.1") == 10.0
+    assert limits.check("b", "10.0.0.1") == 0
+    # The IP is out of tokens; b's own token is refunded
+    assert limits.check("b", "10.0.0.1") > 0
+    assert limits.sessions.bucket("b").tokens == 1
+    assert limits.check("c", "10.0.0.2") == 0
+    assert limits.rejected == 2
+
+    small = RateLimiter(per_minute=60, burst=1, max_keys=2, clock=clock)
+    for key in ("x", "y", "z"):
+        small.bucket(key)
+    assert list(small._buckets) == ["y", "z"]
+
+
+def test_admission_queue():
+    """Test slot caps, first-come admission, positions and overload"""
+    print("Testing admission controller...")
+
+    controller = AdmissionController(max_active=1, max_queued=2)
+    first = controller.enter("a")
+    second = controller.enter("b")
+    third = controller.enter("c")
+    assert first.admitted and controller.position(first) == 0
+    assert [controller.position(t) for t in (second, third)] == [1, 2]
+    try:
+        controller.enter("d")
+        assert False, "a full queue should turn new turns away"
+    except Overloaded:
+        pass
+
+    controller.release(second)  # gave up while waiting
+    assert controller.position(third) == 1
+    controller.release(first)
+    assert third.admitted and controller.active == 1 and controller.queued == 0
+    controller.release(third)
+    controller.release(third)
+    assert controller.active == 0
+    assert ordinal(1) == "1st" and ordinal(2) == "2nd" and ordinal(3) == "3rd" and ordinal(12) == "12th"
+
+
+def test_async_wait():
+    """Test that an event loop waits for admission without a thread, and can give up its place"""
+    print("Testing async admission...")
+
+    controller = AdmissionController(max_active=1, max_queued=2)
+    first = controller.enter("a")
+
+    async def scenario():
+        await asyncio.wait_for(controller.wait_async(first), 1)
+        second, third = controller.enter("b"), controller.enter("c")
+        waiting = asyncio.ensure_future(controller.wait_async(second))
+        abandoned = asyncio.ensure_future(controller.wait_async(third))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        abandoned.cancel()
+        controller.release(third)
+        # Released from another thread, as a finished turn would be
+        threading.Thread(target=controller.release, args=(first,)).start()
+        await asyncio.wait_for(waiting, 1)
+        assert second.admitted and controller.queued == 0
+        controller.release(second)
+
+    asyncio.run(scenario())
+    assert controller.active == 0
+
+
+class GatedAssistant:
+    """Stand-in assistant whose responses wait until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def record_message(self, role, content):
+        pass
+
+    def generate_response(self, prompt):
+        self.release.wait(5)
+        return f"reply to {prompt}"
+
+
+def test_turn_worker_waits_for_admission():
+    """Test that turns beyond the LLM cap wait in line and report their place"""
+    print("Testing queued turns...")
+
+    controller = AdmissionController(max_active=1, max_queued=10)
+    worker = TurnWorker(max_workers=4, admission=controller)
+    busy, waiting = GatedAssistant(), GatedAssistant()
+    waiting.release.set()
+    running, _ = worker.submit("busy", busy, "hello")
+    queued, _ = worker.submit("waiting", waiting, "hello")
+    assert worker.position(running) == 0
+    assert worker.position(queued) == 1
+    assert not queued.done.wait(0.2)
+
+    busy.release.set()
+    assert queued.done.wait(5)
+    assert queued.response == "reply to hello" and worker.position(queued) == 0
+    assert controller.active == 0
+    worker.shutdown()
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Admission Tests")
+    print("=" * 50)
+
+    try:
+        test_token_bucket()
+        test_session_and_ip_limits()
+        test_admission_queue()
+        test_async_wait()
+        test_turn_worker_waits_for_admission()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,144 @@
+"""
+Test script for TalentScout session analytics
+This script checks the funnel, skill and experience reports and incremental updates.
+"""
+
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from analytics import SessionAnalytics, main as analytics_main
+from config import CONVERSATION_STATES
+from utils import format_session_data
+
+
+def make_record(session_id, state, position, experience, tech_stack, state_turns, updated_at="1"):
+    """Build a session store record"""
+    return {
+        "session_id": session_id,
+        "updated_at": updated_at,
+        "state": {
+            "conversation_state": CONVERSATION_STATES[state],
+            "candidate_info": {"position": position, "experience": experience},
+            "tech_stack": tech_stack,
+            "state_turns": state_turns
+        }
+    }
+
+
+RECORDS = [
+    make_record("a", "CONCLUSION", "Backend Engineer", "5", ["python", "django", "docker"],
+                {"greeting": 1, "collecting_info": 3, "technical_assessment": 2}),
+    make_record("b", "COLLECTING_INFO", "backend engineer", "2", ["python"],
+                {"greeting": 1, "collecting_info": 5}),
+    make_record("c", "CONCLUSION", "Data Scientist", "7", ["python", "docker"],
+                {"greeting": 1, "collecting_info": 2})
+]
+
+
+def test_reports():
+    """Test the aggregate reports over a small corpus"""
+    print("Testing analytics reports...")
+
+    analytics = SessionAnalytics()
+    assert analytics.update(RECORDS) == 3
+
+    drop_off = analytics.drop_off().set_index("state")
+    print(drop_off)
+    assert drop_off.loc["conclusion", "ended"] == 2
+    assert drop_off.loc["collecting_info", "ended"] == 1
+    assert drop_off.loc["greeting", "reached"] == 3
+    assert drop_off.loc["collecting_info", "reached"] == 3
+    # "c" ended in conclusion without passing the tech stack or assessment states
+    assert drop_off.loc["collecting_tech_stack", "reached"] == 0
+    assert drop_off.loc["technical_assessment", "reached"] == 1
+    assert drop_off.loc["conclusion", "reached"] == 2
+
+    tech = analytics.tech_frequency().set_index("tech")["sessions"].to_dict()
+    assert tech == {"python": 3, "docker": 2, "django": 1}
+    pairs = analytics.tech_cooccurrence(min_sessions=2)
+    assert pairs.values.tolist() == [["docker", "python", 2]]
+
+    experience = analytics.experience_by_position().set_index("position")
+    assert experience.loc["backend engineer", "candidates"] == 2
+    assert experience.loc["backend engineer", "mean"] == 3.5
+
+    turns = analytics.turns_per_state().set_index("state")
+    assert turns.loc["collecting_info", "avg_turns"] == 10 / 3
+    assert turns.loc["technical_assessment", "sessions"] == 1
+
+
+def test_incremental_update():
+    """Test that only new or changed sessions are folded in"""
+    print("Testing incremental updates...")
+
+    analytics = SessionAnalytics()
+    analytics.update(RECORDS)
+    first = analytics.drop_off()
+    assert analytics.update(RECORDS) == 0
+    assert analytics.drop_off() is first  # cached until something changes
+
+    changed = make_record("b", "CONCLUSION", "backend engineer", "2", ["python", "docker"],
+                          {"greeting": 1, "collecting_info": 5}, updated_at="2")
+    assert analytics.update([changed]) == 1
+
+    fresh = SessionAnalytics()
+    fresh.update(RECORDS[:1] + [changed] + RECORDS[2:])
+    for name, frame in analytics.report().items():
+        assert frame.equals(fresh.report()[name]), name
+    assert analytics.drop_off().set_index("state").loc["conclusion", "ended"] == 3
+    assert len(analytics) == 3
+
+
+def test_exports_have_no_state_reports():
+    """Test that sessions read from exports are left out of the state reports, with a warning"""
+    print("Testing analytics over exports...")
+
+    exports = [format_session_data({"position": "Backend Engineer", "experience": "4"}, ["python", "go"],
+                                   [{"role": "user", "content": "hi"}], ["What is a goroutine?"])
+               for _ in range(2)]
+    exports[1]["session_id"] = exports[0]["session_id"] + "-2"
+
+    analytics = SessionAnalytics()
+    analytics.update(exports + RECORDS[:1])
+    assert len(analytics) == 3 and analytics.state_sessions == 1
+    drop_off = analytics.drop_off().set_index("state")
+    assert drop_off.loc["conclusion", "ended_share"] == 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "sessions.jsonl"), "w", encoding="utf-8") as f:
+            for session_data in exports:
+                f.write(json.dumps(session_data) + "\n")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert analytics_main(["--source", tmp]) == 0
+        printed = output.getvalue()
+        print(printed)
+        assert "Sessions: 2" in printed and "Warning: 2 sessions" in printed
+        assert "Tech Frequency" in printed
+        assert "Drop Off" not in printed and "Turns Per State" not in printed
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Analytics Tests")
+    print("=" * 50)
+
+    try:
+        test_reports()
+        test_incremental_update()
+        test_exports_have_no_state_reports()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
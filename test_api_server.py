@@ -0,0 +1,313 @@
+"""
+Test script for the TalentScout headless HTTP API
+This script drives screenings over HTTP against a local server without requiring Ollama.
+"""
+
+import sys
+import os
+import json
+import re
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+
+import assistant as assistant_module
+from api_server import ScreeningService, make_app
+from session_store import SessionStore
+from state_backend import SharedSessionState, SQLiteStateBackend
+from admission import AdmissionController, RateLimits, RateLimiter
+from config import WELCOME_MESSAGE
+
+
+class StubCompletions:
+    """Returns a canned reply, as a whole or in chunks when stream=True"""
+
+    reply = "Nice to meet you, John! How many years of experience do you have?"
+
+    def create(self, stream=False, **kwargs):
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply))])
+        return iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+            for word in re.findall(r"\S+\s*", self.reply)
+        ])
+
+
+class StubClient:
+    chat = SimpleNamespace(completions=StubCompletions())
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(base_url, method, path, body=None, timeout=10):
+    """Send a request; returns (status, content type, body text)"""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, resp.headers.get("Content-Type", ""), resp.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get("Content-Type", ""), e.read().decode("utf-8")
+
+
+def test_api_round_trip():
+    """Test session creation, plain and streamed turns, state, export and resumption"""
+    print("Testing headless API...")
+
+    original = assistant_module.get_llm_client
+    assistant_module.get_llm_client = lambda: StubClient()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        shared = SharedSessionState(SQLiteStateBackend(os.path.join(tmp, "state.db")))
+        port = free_port()
+        # Two messages per session, then the rate limit applies
+        service = ScreeningService(store, shared, AdmissionController(),
+                                   RateLimits(RateLimiter(per_minute=1, burst=2), RateLimiter(per_minute=60, burst=10)))
+        server = uvicorn.Server(uvicorn.Config(make_app(service), host="127.0.0.1",
+                                               port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.time() + 10
+            while not server.started and time.time() < deadline:
+                time.sleep(0.05)
+            assert server.started
+
+            status, _, body = request(base_url, "POST", "/sessions")
+            assert status == 201
+            created = json.loads(body)
+            session_id = created["session_id"]
+            assert created["messages"] == [{"role": "assistant", "content": WELCOME_MESSAGE}]
+
+            status, _, body = request(base_url, "POST", f"/sessions/{session_id}/messages",
+                                      {"message": "My name is John Doe"})
+            assert status == 200
+            assert json.loads(body)["response"] == StubCompletions.reply
+
+            status, content_type, body = request(base_url, "POST", f"/sessions/{session_id}/messages?stream=1",
+                                                 {"message": "I have 5 years of experience"})
+            assert status == 200 and content_type.startswith("text/event-stream")
+            deltas = [json.loads(line[len("data: "):])["delta"] for line in body.splitlines()
+                      if line.startswith("data: {\"delta\"")]
+            print(f"Streamed chunks: {deltas}")
+            assert len(deltas) > 1 and "".join(deltas) == StubCompletions.reply
+            assert "event: done" in body
+
+            status, _, body = request(base_url, "GET", f"/sessions/{session_id}")
+            state = json.loads(body)
+            assert [m["role"] for m in state["messages"]] == ["assistant", "user", "assistant", "user", "assistant"]
+            assert state["messages"][-1]["content"] == StubCompletions.reply
+
+            status, content_type, body = request(base_url, "GET", f"/sessions/{session_id}/export")
+            assert status == 200 and content_type.startswith("application/json")
+            assert json.loads(body)["session_id"] == session_id
+            status, content_type, body = request(base_url, "GET", f"/sessions/{session_id}/export?format=csv")
+            assert status == 200 and content_type.startswith("text/csv") and session_id in body
+
+            assert request(base_url, "GET", "/sessions/missing")[0] == 404
+            assert request(base_url, "POST", f"/sessions/{session_id}/messages", {"message": " "})[0] == 400
+            assert request(base_url, "GET", f"/sessions/{session_id}/export?format=xml")[0] == 400
+            assert request(base_url, "POST", f"/sessions/{session_id}/messages", {"message": "again"})[0] == 429
+
+            status, _, body = request(base_url, "GET", "/metrics")
+            metrics = json.loads(body)
+            assert status == 200 and "coalesced" in metrics["llm"]
+            assert metrics["admission"]["active"] == 0 and metrics["rate_limited_total"] == 1
+
+            # Another server picks the session up from the shared state
+            other = ScreeningService(store, shared)
+            resumed = other.get_session(session_id)
+            assert resumed.messages == state["messages"] and resumed.version == state["version"]
+            other.send_message(resumed, "I am a backend developer")
+            status, _, body = request(base_url, "GET", f"/sessions/{session_id}")
+            assert len(json.loads(body)["messages"]) == 7
+
+            # Deleting removes the session everywhere
+            assert request(base_url, "DELETE", f"/sessions/{session_id}")[0] == 204
+            assert request(base_url, "GET", f"/sessions/{session_id}")[0] == 404
+            assert request(base_url, "DELETE", f"/sessions/{session_id}")[0] == 404
+            assert shared.load(session_id) is None
+        finally:
+            server.should_exit = True
+            thread.join(10)
+            store.close()
+            shared.close()
+            assistant_module.get_llm_client = original
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_background_grading_is_committed_once():
+    """Test that a finished grading reaches every server and the store, and a reload never regrades it"""
+    print("Testing background grading persistence...")
+
+    calls, release = [], threading.Event()
+
+    def slow_grading(client, answers, tech_stack):
+        calls.append(answers)
+        release.wait(10)
+        return {"status": "graded", "average_score": 7.0, "grades": []}
+
+    originals = assistant_module.get_llm_client, assistant_module.grade_answers
+    assistant_module.get_llm_client = lambda: StubClient()
+    assistant_module.grade_answers = slow_grading
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        state_path = os.path.join(tmp, "state.db")
+        shared = SharedSessionState(SQLiteStateBackend(state_path))
+        # A second server with its own connection and lease owner
+        other_shared = SharedSessionState(SQLiteStateBackend(state_path))
+        try:
+            service = ScreeningService(store, shared)
+            other = ScreeningService(store, other_shared)
+
+            session = service.create_session()
+            session.assistant.technical_answers.append({"question": "What is the GIL?", "answer": "A lock"})
+            service.send_message(session, "goodbye")
+            assert wait_for(lambda: len(calls) == 1)
+            assert shared.load(session.session_id)["state"]["assessment"] == {"status": "pending"}
+
+            # Another server loading the pending session leaves it to the grading server
+            resumed = other.get_session(session.session_id)
+            assert resumed.assistant.grading_pending
+            release.set()
+            assert wait_for(lambda: shared.load(session.session_id)["state"]["assessment"]["status"] == "graded")
+
+            assert other.state(resumed)["state"]["assessment"]["average_score"] == 7.0
+            assert json.loads(other.export(resumed))["technical_assessment"]["status"] == "graded"
+            store.flush()
+            assert store.load_session(session.session_id)["state"]["assessment"]["status"] == "graded"
+            assert not shared.claim_grading(session.session_id, based_on_version=resumed.version - 1)
+
+            # Reloading on a fresh server does not grade again
+            reloaded = ScreeningService(store, SharedSessionState(SQLiteStateBackend(state_path)))
+            assert reloaded.get_session(session.session_id).assistant.assessment["status"] == "graded"
+            time.sleep(0.1)
+            print(f"Grading calls: {len(calls)}")
+            assert len(calls) == 1
+
+            # A grading abandoned by a server that went away is picked up by the next server to load it
+            abandoned = service.create_session()
+            abandoned.assistant.technical_answers.append({"question": "What is a decorator?", "answer": "A wrapper"})
+            abandoned.assistant.set_assessment({"status": "pending"})
+            service._commit(abandoned)
+            fresh = ScreeningService(store, SharedSessionState(SQLiteStateBackend(state_path)))
+            fresh.get_session(abandoned.session_id)
+            assert wait_for(lambda: shared.load(abandoned.session_id)["state"]["assessment"]["status"] == "graded")
+            assert len(calls) == 2
+        finally:
+            release.set()
+            store.close()
+            shared.close()
+            other_shared.close()
+            assistant_module.get_llm_client, assistant_module.grade_answers = originals
+
+
+class BlockingCompletions(StubCompletions):
+    """Holds every LLM call until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def create(self, stream=False, **kwargs):
+        self.release.wait(20)
+        return super().create(stream=stream, **kwargs)
+
+
+def test_queued_turns_leave_threads_free():
+    """Test that more queued turns than worker threads still leave state, metrics and creation responsive"""
+    print("Testing queued turns...")
+
+    completions = BlockingCompletions()
+    original = assistant_module.get_llm_client
+    assistant_module.get_llm_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        shared = SharedSessionState(SQLiteStateBackend(os.path.join(tmp, "state.db")))
+        # Well past the 40 worker threads Starlette hands blocking calls to
+        turns = 50
+        service = ScreeningService(store, shared, AdmissionController(max_active=1, max_queued=turns - 1),
+                                   RateLimits(RateLimiter(per_minute=60, burst=10),
+                                              RateLimiter(per_minute=6000, burst=1000)))
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(make_app(service), host="127.0.0.1",
+                                               port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{port}"
+        senders = []
+        try:
+            assert wait_for(lambda: server.started)
+            session_ids = [json.loads(request(base_url, "POST", "/sessions")[2])["session_id"]
+                           for _ in range(turns + 1)]
+            statuses = []
+
+            def send(session_id, stream):
+                path = f"/sessions/{session_id}/messages" + ("?stream=1" if stream else "")
+                statuses.append(request(base_url, "POST", path, {"message": "hello"}, timeout=30)[0])
+
+            for i, session_id in enumerate(session_ids[:turns]):
+                senders.append(threading.Thread(target=send, args=(session_id, i % 5 == 0), daemon=True))
+                senders[-1].start()
+            assert wait_for(lambda: service.admission.queued == turns - 1)
+
+            started = time.time()
+            assert request(base_url, "GET", f"/sessions/{session_ids[-1]}")[0] == 200
+            assert json.loads(request(base_url, "GET", "/metrics")[2])["admission"]["queued"] == turns - 1
+            assert request(base_url, "POST", "/sessions")[0] == 201
+            print(f"Answered in {time.time() - started:.2f}s with {turns - 1} turns queued")
+            assert time.time() - started < 5
+            # The queue is full, so one more turn is turned away at once
+            assert request(base_url, "POST", f"/sessions/{session_ids[-1]}/messages", {"message": "hi"})[0] == 503
+
+            completions.release.set()
+            for sender in senders:
+                sender.join(30)
+            assert statuses == [200] * turns
+            assert service.admission.active == 0 and service.admission.queued == 0
+        finally:
+            completions.release.set()
+            server.should_exit = True
+            thread.join(10)
+            store.close()
+            shared.close()
+            assistant_module.get_llm_client = original
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout API Server Tests")
+    print("=" * 50)
+
+    try:
+        test_api_round_trip()
+        test_background_grading_is_committed_once()
+        test_queued_turns_leave_threads_free()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -11,7 +11,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils import (
     extract_email, extract_phone, extract_experience_years, extract_name,
     extract_position, extract_location, extract_tech_stack, validate_candidate_info,
-    format_session_data, sanitize_input, get_tech_stack_categories
+    format_session_data, sanitize_input, get_tech_stack_categories,
+    generate_conversation_summary, TopicClassifier, ConversationStats
 )
 from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS
 
@@ -173,6 +174,31 @@ def test_sanitization():
         result = sanitize_input(test_case)
         print(f"Original: '{test_case[:50]}...' -> Sanitized: '{result[:50]}...'")
 
+def test_conversation_summary():
+    """Test topic classification and running conversation stats"""
+    print("Testing conversation summary...")
+    
+    classifier = TopicClassifier({"Frontend": ["javascript"], "Backend": ["java", "go"]})
+    assert classifier.classify("I write JavaScript") == {"Frontend", "Backend"}
+    assert classifier.classify("Nothing relevant") == set()
+    
+    messages = [
+        {"role": "assistant", "content": "Tell me about yourself"},
+        {"role": "user", "content": "I have 5 years of Python"},
+        {"role": "user", "content": "My last project was a chat bot"}
+    ]
+    stats = ConversationStats()
+    for message in messages:
+        stats.add_message(message["role"], message["content"])
+    print(f"Topic counts: {stats.topic_counts}")
+    assert stats.topic_counts["Work Experience"] == 1
+    assert stats.topics() == ["Work Experience", "Technical Skills", "Project Experience"]
+    
+    summary = generate_conversation_summary(messages, stats)
+    assert summary == generate_conversation_summary(messages)
+    assert "- User Messages: 2" in summary
+    assert generate_conversation_summary([]) == "No conversation data available."
+
 def main():
     """Run all tests"""
     print(" Running TalentScout Hiring Assistant Tests")
@@ -187,6 +213,7 @@ def main():
         test_tech_categorization()
         test_data_formatting()
         test_sanitization()
+        test_conversation_summary()
         
         print(" All tests completed successfully!")
         print("\n Configuration Summary:")
@@ -214,7 +241,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils import (
     extract_email, extract_phone, extract_experience_years, extract_name,
     extract_position, extract_location, extract_tech_stack, validate_candidate_info,
-    format_session_data, sanitize_input, get_tech_stack_categories
+    format_session_data, sanitize_input, get_tech_stack_categories,
+    generate_conversation_summary, TopicClassifier, ConversationStats
 )
 from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS
 
@@ -376,6 +404,31 @@ def test_sanitization():
         result = sanitize_input(test_case)
         print(f"Original: '{test_case[:50]}...' -> Sanitized: '{result[:50]}...'")
 
+def test_conversation_summary():
+    """Test topic classification and running conversation stats"""
+    print("Testing conversation summary...")
+    
+    classifier = TopicClassifier({"Frontend": ["javascript"], "Backend": ["java", "go"]})
+    assert classifier.classify("I write JavaScript") == {"Frontend", "Backend"}
+    assert classifier.classify("Nothing relevant") == set()
+    
+    messages = [
+        {"role": "assistant", "content": "Tell me about yourself"},
+        {"role": "user", "content": "I have 5 years of Python"},
+        {"role": "user", "content": "My last project was a chat bot"}
+    ]
+    stats = ConversationStats()
+    for message in messages:
+        stats.add_message(message["role"], message["content"])
+    print(f"Topic counts: {stats.topic_counts}")
+    assert stats.topic_counts["Work Experience"] == 1
+    assert stats.topics() == ["Work Experience", "Technical Skills", "Project Experience"]
+    
+    summary = generate_conversation_summary(messages, stats)
+    assert summary == generate_conversation_summary(messages)
+    assert "- User Messages: 2" in summary
+    assert generate_conversation_summary([]) == "No conversation data available."
+
 def main():
     """Run all tests"""
     print(" Running TalentScout Hiring Assistant Tests")
@@ -390,6 +443,7 @@ def main():
         test_tech_categorization()
         test_data_formatting()
         test_sanitization()
+        test_conversation_summary()
         
         print(" All tests completed successfully!")
         print("\n Configuration Summary:")
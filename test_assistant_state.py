@@ -0,0 +1,118 @@
+"""
+Test script for the TalentScout typed assistant state
+This script checks state flags and the binary encoding round trip without requiring Ollama.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from assistant_state import (
+    AssistantState, ConversationState, CandidateField, encode_state, decode_state
+)
+from assistant import HiringAssistant
+from config import CONVERSATION_STATES, REQUIRED_FIELDS
+
+
+def full_state():
+    """A state exercising every field of the encoding"""
+    candidate_info = {
+        "name": "Zoë Müller", "email": "zoe@example.com", "experience": "7",
+        "location": "Zürich", "linkedin": "zoe-m"
+    }
+    return AssistantState(
+        conversation_state=ConversationState.CONCLUSION,
+        candidate_info=candidate_info,
+        collected=CandidateField.collected(candidate_info),
+        tech_stack=["python", "c++", "kubernetes"],
+        technical_questions=["What is the GIL?", "Explain RAII"],
+        current_question_index=2,
+        technical_answers=[{"question": "What is the GIL?", "answer": "A lock " * 200}],
+        assessment={"status": "graded", "average_score": 3.5, "answers": [{"score": 4}]},
+        state_turns={ConversationState.COLLECTING_INFO: 3, ConversationState.TECHNICAL_ASSESSMENT: 130}
+    )
+
+
+def test_binary_round_trip():
+    """Test that every field survives encode/decode"""
+    print("Testing binary round trip...")
+
+    state = full_state()
+    data = encode_state(state)
+    print(f"Encoded size: {len(data)} bytes")
+    assert decode_state(data) == state
+    assert decode_state(encode_state(AssistantState())) == AssistantState()
+    assert AssistantState.from_dict(state.to_dict()) == state
+
+    for bad in (b"", b"XX\x01", b"TA\x09" + data[3:], data[:-5]):
+        try:
+            decode_state(bad)
+            assert False, f"decoding {bad[:8]!r} should fail"
+        except ValueError:
+            pass
+
+    # Values the format cannot store item by item are rejected, not reshaped
+    for name, bad in [("technical_questions", {"questions": ["Q1?"]}), ("technical_questions", "Q1?"),
+                      ("technical_questions", ["Q1?", {"question": "Q2?"}]), ("tech_stack", "python")]:
+        bad_state = full_state()
+        setattr(bad_state, name, bad)
+        try:
+            encode_state(bad_state)
+            assert False, f"encoding {name}={bad!r} should fail"
+        except TypeError:
+            pass
+
+
+def test_enums_and_flags():
+    """Test state labels and required-field flags"""
+    print("Testing enums and flags...")
+
+    for name, label in CONVERSATION_STATES.items():
+        assert ConversationState[name].label == label
+        assert ConversationState.from_label(label) == ConversationState[name]
+
+    state = AssistantState()
+    for name in REQUIRED_FIELDS:
+        assert not state.has_required_fields
+        state.collected |= CandidateField.for_name(name)
+    assert state.has_required_fields
+    assert CandidateField.for_name("linkedin") == CandidateField.NONE
+
+
+def test_hiring_assistant_uses_state():
+    """Test that HiringAssistant reads and writes through its AssistantState"""
+    print("Testing HiringAssistant state...")
+
+    assistant = HiringAssistant()
+    assistant.record_message("user", "hello")
+    assistant.conversation_state = CONVERSATION_STATES['COLLECTING_INFO']
+    for name in REQUIRED_FIELDS:
+        assistant.set_candidate_field(name, f"{name} value")
+    assert assistant.state.conversation_state == ConversationState.COLLECTING_INFO
+    assert assistant.state.has_required_fields
+    assert assistant.state_turns == {CONVERSATION_STATES['GREETING']: 1}
+
+    restored = HiringAssistant.from_state(decode_state(encode_state(assistant.state)))
+    assert restored.to_dict() == assistant.to_dict()
+    assert HiringAssistant.from_dict(assistant.to_dict()).state == assistant.state
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Assistant State Tests")
+    print("=" * 50)
+
+    try:
+        test_binary_round_trip()
+        test_enums_and_flags()
+        test_hiring_assistant_uses_state()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
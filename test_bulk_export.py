@@ -0,0 +1,167 @@
+"""
+Test script for TalentScout bulk session export
+This script checks the streaming JSONL and CSV exporters, gzip output and reading sessions from the store or an exports directory, without requiring Ollama.
+"""
+
+import sys
+import os
+import csv
+import gzip
+import io
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bulk_export import (
+    CSV_COLUMNS, export_sessions_jsonl, export_sessions_csv,
+    iter_sessions_from_directory, iter_sessions_from_store, main as bulk_export_main
+)
+from session_store import SessionStore
+from assistant import HiringAssistant
+from utils import format_session_data
+
+
+def make_session(index):
+    session_data = format_session_data(
+        {"name": f"Candidate {index}", "email": f"candidate{index}@example.com"},
+        ["python", "docker"],
+        [{"role": "user", "content": f"hello {index}"}],
+        ["What is a decorator?"],
+        {"status": "graded", "average_score": 7.5}
+    )
+    session_data["session_id"] = f"session-{index}"
+    return session_data
+
+
+def test_jsonl_and_csv_exporters():
+    """Test that both formats stream every session, plain or gzipped"""
+    print("Testing JSONL and CSV exporters...")
+
+    sessions = [make_session(i) for i in range(3)]
+    buffer = io.StringIO()
+    # Generators are consumed one session at a time
+    assert export_sessions_jsonl((s for s in sessions), buffer) == 3
+    lines = buffer.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == sessions
+    assert all(": " not in line for line in lines)
+
+    buffer = io.StringIO()
+    assert export_sessions_csv(iter(sessions), buffer) == 3
+    rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+    print(f"CSV header: {rows[0]}")
+    assert rows[0] == CSV_COLUMNS and len(rows) == 4
+    row = dict(zip(CSV_COLUMNS, rows[2]))
+    assert row["session_id"] == "session-1" and row["name"] == "Candidate 1"
+    assert row["assessment_score"] == "7.5"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "sessions.jsonl.gz")
+        csv_path = os.path.join(tmp, "sessions.csv.gz")
+        assert export_sessions_jsonl(sessions, jsonl_path) == 3
+        assert export_sessions_csv(sessions, csv_path) == 3
+        with gzip.open(jsonl_path, "rt", encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == sessions
+        with gzip.open(csv_path, "rt", encoding="utf-8", newline="") as f:
+            assert len(list(csv.reader(f))) == 4
+
+        # compress=False wins over the file name
+        plain_path = os.path.join(tmp, "plain.jsonl.gz")
+        export_sessions_jsonl(sessions, plain_path, compress=False)
+        with open(plain_path, "r", encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 3
+
+
+def test_sessions_from_directory_skip_malformed_records():
+    """Test that malformed .json files and .jsonl lines are skipped and counted alike"""
+    print("Testing directory sources...")
+
+    sessions = [make_session(i) for i in range(4)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "a.json"), "w", encoding="utf-8") as f:
+            json.dump(sessions[0], f)
+        with open(os.path.join(tmp, "b.json"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        with open(os.path.join(tmp, "c.jsonl"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(sessions[1]) + "\n\n{truncated\n[1, 2]\n" + json.dumps(sessions[2]) + "\n")
+        export_sessions_jsonl([sessions[3]], os.path.join(tmp, "d.jsonl.gz"))
+        with open(os.path.join(tmp, "notes.txt"), "w", encoding="utf-8") as f:
+            f.write("ignored")
+
+        skipped = []
+        found = list(iter_sessions_from_directory(tmp, skipped))
+        print(f"Skipped: {skipped}")
+        assert found == sessions
+        assert skipped == ["b.json", "c.jsonl:3", "c.jsonl:4"]
+        # Without a list the bad records are still skipped
+        assert list(iter_sessions_from_directory(tmp)) == sessions
+
+        # A truncated gzip keeps the sessions read before the damage
+        with gzip.open(os.path.join(tmp, "e.jsonl.gz"), "wt", encoding="utf-8") as f:
+            for session_data in sessions:
+                f.write(json.dumps(session_data) + "\n")
+        with open(os.path.join(tmp, "e.jsonl.gz"), "rb") as f:
+            data = f.read()
+        with open(os.path.join(tmp, "e.jsonl.gz"), "wb") as f:
+            f.write(data[:-12])
+        skipped = []
+        found = list(iter_sessions_from_directory(tmp, skipped))
+        assert found[:4] == sessions and len(found) >= 4
+        assert len(skipped) == 4 and skipped[-1].startswith("e.jsonl.gz:")
+
+        output = os.path.join(tmp, "out", "all.csv")
+        os.makedirs(os.path.dirname(output))
+        assert bulk_export_main(["--source", tmp, "--format", "csv", "--output", output]) == 0
+        with open(output, "r", encoding="utf-8", newline="") as f:
+            assert len(list(csv.reader(f))) == 1 + len(found)
+
+
+def test_sessions_from_store():
+    """Test streaming stored sessions in the export shape"""
+    print("Testing store sources...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        try:
+            for i in range(5):
+                assistant = HiringAssistant()
+                assistant.set_candidate_field("name", f"Candidate {i}")
+                assistant.record_message("user", f"hello {i}")
+                store.save_assistant(f"session-{i}", assistant, snapshot=True)
+            store.flush()
+
+            exported = list(iter_sessions_from_store(store, batch_size=2))
+            assert [s["session_id"] for s in exported] == [f"session-{i}" for i in range(5)]
+            assert exported[3]["candidate_info"]["name"] == "Candidate 3"
+            assert exported[3]["conversation_summary"]["total_messages"] == 1
+        finally:
+            store.close()
+
+        output = os.path.join(tmp, "sessions.jsonl.gz")
+        assert bulk_export_main(["--db", os.path.join(tmp, "sessions.db"), "--output", output]) == 0
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 5
+
+        missing = os.path.join(tmp, "missing.db")
+        assert bulk_export_main(["--db", missing, "--output", os.path.join(tmp, "none.jsonl")]) == 1
+        assert not os.path.exists(missing)
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Bulk Export Tests")
+    print("=" * 50)
+
+    try:
+        test_jsonl_and_csv_exporters()
+        test_sessions_from_directory_skip_malformed_records()
+        test_sessions_from_store()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,105 @@
+"""
+Test script for the TalentScout candidate search index
+This script checks postings, range queries and incremental updates without requiring OpenAI API calls.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from candidate_index import CandidateIndex, parse_query
+
+
+def _session(session_id, tech_stack, experience, position, location):
+    return {
+        "session_id": session_id,
+        "candidate_info": {
+            "experience": experience,
+            "position": position,
+            "location": location
+        },
+        "tech_stack": tech_stack
+    }
+
+
+def _build_index():
+    index = CandidateIndex()
+    index.add_sessions([
+        _session("s1", ["python", "kubernetes"], "7", "engineer", "Berlin"),
+        _session("s2", ["python", "django"], "3", "developer", "Berlin"),
+        _session("s3", ["python", "kubernetes", "aws"], "5", "engineer", "New York"),
+        _session("s4", ["java", "spring"], "10", "architect", "Berlin"),
+    ])
+    return index
+
+
+def test_query_parsing():
+    """Test parsing of textual queries"""
+    print("Testing query parsing...")
+
+    criteria = parse_query("python AND kubernetes, experience >= 5, location Berlin")
+    print(f"Parsed: {criteria}")
+    assert criteria == {
+        "tech_all": ["python", "kubernetes"],
+        "min_experience": 5,
+        "location": "berlin"
+    }
+
+    criteria = parse_query("go OR rust, experience < 4")
+    print(f"Parsed: {criteria}")
+    assert criteria == {"tech_any": ["go", "rust"], "max_experience": 3}
+
+
+def test_boolean_and_range_queries():
+    """Test combined boolean and experience range queries"""
+    print("Testing boolean and range queries...")
+
+    index = _build_index()
+    cases = [
+        ("python AND kubernetes, experience >= 5, location Berlin", ["s1"]),
+        ("python AND kubernetes", ["s1", "s3"]),
+        ("experience >= 5", ["s1", "s3", "s4"]),
+        ("java OR django", ["s2", "s4"]),
+        ("position engineer, location new york", ["s3"]),
+        ("rust", []),
+    ]
+    for query, expected in cases:
+        result = index.query(query)
+        print(f"Query: '{query}' -> {result}")
+        assert result == expected
+
+
+def test_incremental_updates():
+    """Test re-indexing and removal of sessions"""
+    print("Testing incremental updates...")
+
+    index = _build_index()
+    index.add_session(_session("s2", ["python", "kubernetes"], "6", "engineer", "Berlin"))
+    assert index.query("python AND kubernetes, experience >= 5, location Berlin") == ["s1", "s2"]
+    assert len(index) == 4
+
+    assert index.remove_session("s1")
+    assert not index.remove_session("s1")
+    assert index.query("kubernetes") == ["s3", "s2"]
+    assert "s1" not in index
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Candidate Index Tests")
+    print("=" * 50)
+
+    try:
+        test_query_parsing()
+        test_boolean_and_range_queries()
+        test_incremental_updates()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,128 @@
+"""
+Test script for TalentScout LLM request coalescing
+This script checks that concurrent identical completions share one backend request without requiring Ollama.
+"""
+
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from coalescing import CoalescingClient, SingleFlight, request_key
+
+
+class GatedCompletions:
+    """Backend stand-in that blocks until released and counts requests"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.fail = False
+
+    def create(self, **params):
+        self.calls.append(params)
+        if params.get("stream"):
+            return iter(["chunk"])
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return SimpleNamespace(content=f"reply {len(self.calls)}")
+
+
+def run_concurrently(func, count):
+    """Call func from count threads at once; returns results (or exceptions) in order"""
+    results = [None] * count
+    started = threading.Barrier(count + 1)
+
+    def worker(i):
+        started.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    return threads, results
+
+
+def test_request_key():
+    """Test that keys ignore dict ordering but not content"""
+    print("Testing request keys...")
+
+    messages = [{"role": "user", "content": "hello"}]
+    key = request_key({"model": "llama2", "messages": messages, "temperature": 0.7})
+    assert key == request_key({"temperature": 0.7, "messages": [{"content": "hello", "role": "user"}], "model": "llama2"})
+    assert key != request_key({"model": "llama2", "messages": messages, "temperature": 0.2})
+    assert len(key) == 64
+
+
+def test_identical_requests_share_one_call():
+    """Test that concurrent identical completions reach the backend once"""
+    print("Testing coalescing...")
+
+    backend = GatedCompletions()
+    client = CoalescingClient(SimpleNamespace(chat=SimpleNamespace(completions=backend)))
+    params = {"model": "llama2", "messages": [{"role": "user", "content": "python, django"}], "max_tokens": 500}
+
+    threads, results = run_concurrently(lambda: client.chat.completions.create(**params), 8)
+    while client.metrics()["requests"] < 8:
+        time.sleep(0.001)
+    backend.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    metrics = client.metrics()
+    print(f"Metrics: {metrics}")
+    assert len(backend.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert metrics["backend_calls"] == 1 and metrics["coalesced"] == 7 and metrics["in_flight"] == 0
+    assert metrics["coalesced_ratio"] == 0.875
+
+    # Once finished nothing is cached; streams always go to the backend
+    client.chat.completions.create(**params)
+    list(client.chat.completions.create(stream=True, **params))
+    assert len(backend.calls) == 3
+
+
+def test_errors_reach_every_caller():
+    """Test that a failed shared request fails all of its callers"""
+    print("Testing shared failures...")
+
+    backend = GatedCompletions()
+    backend.fail = True
+    flight = SingleFlight()
+    threads, results = run_concurrently(lambda: flight.do("key", lambda: backend.create(model="x")), 4)
+    while flight.metrics()["requests"] < 4:
+        time.sleep(0.001)
+    backend.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(backend.calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.metrics()["errors"] == 1 and flight.metrics()["in_flight"] == 0
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Coalescing Tests")
+    print("=" * 50)
+
+    try:
+        test_request_key()
+        test_identical_requests_share_one_call()
+        test_errors_reach_every_caller()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,175 @@
+"""
+Test script for TalentScout columnar session export
+This script checks typed rows and UTC date partitioning for the Parquet export and its JSONL fallback, without requiring Ollama.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import columnar_export
+from columnar_export import typed_session_row, export_sessions_columnar, PYARROW_AVAILABLE
+from utils import format_session_data
+
+
+def make_session(session_id, timestamp, experience="5", assessment=None):
+    session_data = format_session_data(
+        {"name": "Jane Doe", "email": "jane@example.com", "experience": experience, "position": ""},
+        ["python", "docker"],
+        [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi"}],
+        ["What is a decorator?", "What is the GIL?"],
+        assessment
+    )
+    session_data["session_id"] = session_id
+    session_data["timestamp"] = timestamp
+    return session_data
+
+
+class local_timezone:
+    """Run a block with the process's local timezone set to tz"""
+
+    def __init__(self, tz):
+        self.tz = tz
+
+    def __enter__(self):
+        self.original = os.environ.get("TZ")
+        os.environ["TZ"] = self.tz
+        time.tzset()
+
+    def __exit__(self, *exc):
+        if self.original is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = self.original
+        time.tzset()
+
+
+def test_typed_rows():
+    """Test that rows carry typed values and blanks become nulls"""
+    print("Testing typed rows...")
+
+    row = typed_session_row(make_session("s1", "2024-06-01T12:00:00+00:00",
+                                         assessment={"status": "graded", "average_score": 7.5}))
+    print(f"Row: {row}")
+    assert row["timestamp"] == datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+    assert row["experience"] == 5 and row["total_messages"] == 2 and row["questions_count"] == 2
+    assert row["tech_stack"] == ["python", "docker"]
+    assert row["assessment_score"] == 7.5
+    assert row["position"] is None and row["location"] is None
+
+    row = typed_session_row(make_session("s2", "not a date", experience="five"))
+    assert row["timestamp"] is None and row["experience"] is None and row["assessment_score"] is None
+
+
+def test_partitions_use_the_utc_date():
+    """Test that sessions near midnight land in the partition of their UTC date"""
+    print("Testing UTC date partitions...")
+
+    with local_timezone("America/New_York"):
+        # 22:30 local on June 1st is 02:30 UTC on June 2nd
+        assert typed_session_row(make_session("s1", "2024-06-01T22:30:00"))["timestamp"] == \
+            datetime(2024, 6, 2, 2, 30, tzinfo=timezone.utc)
+        sessions = [
+            make_session("late-local", "2024-06-01T22:30:00"),
+            make_session("late-offset", "2024-06-01T23:30:00-05:00"),
+            make_session("early-utc", "2024-06-02T00:10:00+00:00"),
+            make_session("midday", "2024-06-01T12:00:00+00:00"),
+            make_session("undated", ""),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            counts = export_sessions_columnar(sessions, tmp, row_group_size=2)
+            print(f"Partitions: {counts}")
+            assert counts == {"date=2024-06-02": 3, "date=2024-06-01": 1, "date=unknown": 1}
+            assert sorted(os.listdir(tmp)) == sorted(counts)
+
+            if PYARROW_AVAILABLE:
+                import pyarrow.parquet as pq
+                table = pq.read_table(os.path.join(tmp, "date=2024-06-02", "part-0.parquet"))
+                assert table.schema.equals(columnar_export.SESSION_SCHEMA)
+                assert table.column("session_id").to_pylist() == ["late-local", "late-offset", "early-utc"]
+                # The stored timestamps fall on the partition's date
+                assert {ts.date().isoformat() for ts in table.column("timestamp").to_pylist()} == {"2024-06-02"}
+                assert table.column("tech_stack").to_pylist()[0] == ["python", "docker"]
+
+
+def test_jsonl_fallback():
+    """Test that the same typed rows are written as partitioned JSONL without pyarrow"""
+    print("Testing JSONL fallback...")
+
+    original = columnar_export.PYARROW_AVAILABLE
+    columnar_export.PYARROW_AVAILABLE = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            counts = export_sessions_columnar([make_session("s1", "2024-06-01T23:59:59-00:30")], tmp)
+            assert counts == {"date=2024-06-02": 1}
+            with open(os.path.join(tmp, "date=2024-06-02", "part-0.jsonl"), "r", encoding="utf-8") as f:
+                row = json.loads(f.readline())
+            assert row["timestamp"] == "2024-06-02T00:29:59+00:00"
+            assert row["experience"] == 5 and row["tech_stack"] == ["python", "docker"]
+    finally:
+        columnar_export.PYARROW_AVAILABLE = original
+
+
+def read_partition(directory):
+    """Session ids in a partition directory, part by part"""
+    parts = sorted(os.listdir(directory), key=lambda name: int(name.split("-")[1].split(".")[0]))
+    ids = []
+    for name in parts:
+        path = os.path.join(directory, name)
+        if name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            ids.append(pq.read_table(path).column("session_id").to_pylist())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                ids.append([json.loads(line)["session_id"] for line in f])
+    return ids
+
+
+def test_open_partitions_are_capped():
+    """Test that partitions beyond the open-file cap reopen as new parts, and re-runs never overwrite"""
+    print("Testing open partition cap...")
+
+    sessions = [make_session(f"{day}-{i}", f"2024-06-0{day}T12:00:00+00:00")
+                for i in range(3) for day in (1, 2, 3)]
+    for pyarrow_available in sorted({False, PYARROW_AVAILABLE}):
+        original = columnar_export.PYARROW_AVAILABLE
+        columnar_export.PYARROW_AVAILABLE = pyarrow_available
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                counts = export_sessions_columnar(sessions, tmp, max_open_partitions=2)
+                assert counts == {"date=2024-06-01": 3, "date=2024-06-02": 3, "date=2024-06-03": 3}
+                # Days cycle through two open files, so every day is closed and reopened per round
+                parts = read_partition(os.path.join(tmp, "date=2024-06-01"))
+                print(f"Parts: {parts}")
+                assert parts == [["1-0"], ["1-1"], ["1-2"]]
+
+                export_sessions_columnar(sessions[:1], tmp)
+                assert read_partition(os.path.join(tmp, "date=2024-06-01")) == parts + [["1-0"]]
+        finally:
+            columnar_export.PYARROW_AVAILABLE = original
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Columnar Export Tests")
+    print("=" * 50)
+
+    try:
+        test_typed_rows()
+        test_partitions_use_the_utc_date()
+        test_jsonl_fallback()
+        test_open_partitions_are_capped()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,77 @@
+"""
+Test script for TalentScout near-duplicate detection
+This script checks MinHash fingerprinting and LSH clustering without requiring OpenAI API calls.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dedup import SessionDeduplicator, normalize_email, normalize_phone
+
+
+def _session(session_id, name, email, phone, tech_stack):
+    return {
+        "session_id": session_id,
+        "candidate_info": {"name": name, "email": email, "phone": phone},
+        "tech_stack": tech_stack
+    }
+
+
+def test_normalization():
+    """Test email and phone normalisation"""
+    print("Testing normalisation...")
+
+    assert normalize_email(" John.Doe+jobs@Example.com ") == "john.doe@example.com"
+    assert normalize_email("not-an-email") == ""
+    assert normalize_phone("(123) 456-7890") == "1234567890"
+    assert normalize_phone("+1 123.456.7890") == "1234567890"
+
+
+def test_duplicate_clusters():
+    """Test that repeat applications cluster together"""
+    print("Testing duplicate clustering...")
+
+    dedup = SessionDeduplicator()
+    dedup.add(_session("s1", "John Doe", "john@example.com", "123-456-7890", ["python", "django"]))
+    dedup.add(_session("s2", "Jane Smith", "jane@company.org", "987-654-3210", ["java", "spring"]))
+    matches = dedup.add(_session("s3", "John  Doe", "JOHN+2@example.com", "1234567890",
+                                 ["python", "django", "aws"]))
+    dedup.add(_session("s4", "Bob Johnson", "bob@test.com", "555-123-4567", ["python", "django"]))
+
+    print(f"Matches for s3: {matches}")
+    print(f"Clusters: {dedup.clusters()}")
+    assert matches == ["s1"]
+    assert dedup.clusters() == [["s1", "s3"]]
+    assert dedup.cluster_of("s2") == ["s2"]
+
+
+def test_empty_sessions_not_clustered():
+    """Test that sessions without any fingerprint data stay separate"""
+    print("Testing empty sessions...")
+
+    dedup = SessionDeduplicator()
+    dedup.add({"session_id": "e1"})
+    dedup.add({"session_id": "e2"})
+    assert dedup.clusters() == []
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Deduplication Tests")
+    print("=" * 50)
+
+    try:
+        test_normalization()
+        test_duplicate_clusters()
+        test_empty_sessions_not_clustered()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,190 @@
+"""
+Test script for TalentScout candidate-to-job matching
+This script checks ranking, batched ranking, ties and experience/position weighting on both scorers without requiring OpenAI API calls.
+"""
+
+import sys
+import os
+import math
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import matching
+from matching import CandidateMatcher, SKILL_WEIGHT, POSITION_WEIGHT, EXPERIENCE_SHORTFALL_PENALTY
+
+
+def _session(session_id, tech_stack, experience="3", position=None):
+    return {
+        "session_id": session_id,
+        "candidate_info": {"experience": experience, "position": position},
+        "tech_stack": tech_stack
+    }
+
+
+SESSIONS = [
+    _session("s1", ["python", "django"], "5", "backend engineer"),
+    _session("s2", ["python"], "2", "data scientist"),
+    _session("s3", ["java", "spring"], "8", "backend engineer"),
+    _session("s4", ["Python", "Django"], "5", "backend engineer"),
+    _session("s5", ["go"], "1", None),
+]
+
+
+def scorers():
+    """Run a check against the SciPy scorer (when installed) and the postings scorer"""
+    modes = [True, False] if matching.SCIPY_AVAILABLE else [False]
+    original = matching.SCIPY_AVAILABLE
+    try:
+        for mode in modes:
+            matching.SCIPY_AVAILABLE = mode
+            yield "matrix" if mode else "postings"
+    finally:
+        matching.SCIPY_AVAILABLE = original
+
+
+def assert_ranking(actual, expected):
+    assert [session_id for session_id, _ in actual] == [session_id for session_id, _ in expected], actual
+    for (_, score), (_, want) in zip(actual, expected):
+        assert math.isclose(score, want, rel_tol=1e-9), (score, want)
+
+
+def test_rank():
+    """Test skill-only ranking of one job"""
+    print("Testing ranking...")
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(SESSIONS)
+        result = matcher.rank({"tech_stack": ["python", "django"]})
+        print(f"{scorer}: {result}")
+        # s1 and s4 match the job exactly; s2 has only one of the two skills
+        assert [session_id for session_id, _ in result] == ["s1", "s4", "s2"]
+        assert math.isclose(result[0][1], SKILL_WEIGHT) and math.isclose(result[1][1], SKILL_WEIGHT)
+        assert 0 < result[2][1] < SKILL_WEIGHT
+        assert matcher.rank({"tech_stack": ["rust"]}) == []
+
+
+def test_rank_many_matches_rank():
+    """Test batched ranking returns the same results as ranking jobs one by one"""
+    print("Testing batched ranking...")
+    jobs = [
+        {"tech_stack": ["python"]},
+        {"tech_stack": ["java"], "position": "backend engineer"},
+        {"tech_stack": ["go", "python"], "min_experience": 3},
+        {"tech_stack": []},
+    ]
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(SESSIONS)
+        batched = matcher.rank_many(jobs, k=3)
+        print(f"{scorer}: {batched}")
+        assert len(batched) == len(jobs)
+        for job, ranked in zip(jobs, batched):
+            assert_ranking(ranked, matcher.rank(job, k=3))
+        assert batched[3] == []
+        assert CandidateMatcher().rank_many(jobs) == [[], [], [], []]
+
+
+def test_top_k_ties():
+    """Test ties at the top-k cut-off keep the earliest fitted candidates"""
+    print("Testing top-k ties...")
+    sessions = [_session(f"t{i}", ["python"]) for i in range(6)]
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(sessions)
+        result = matcher.rank({"tech_stack": ["python"]}, k=3)
+        print(f"{scorer}: {result}")
+        assert_ranking(result, [("t0", SKILL_WEIGHT), ("t1", SKILL_WEIGHT), ("t2", SKILL_WEIGHT)])
+        assert len(matcher.rank({"tech_stack": ["python"]}, k=10)) == 6
+
+
+def test_experience_and_position():
+    """Test the minimum experience penalty and the position bonus"""
+    print("Testing experience and position weighting...")
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(SESSIONS)
+
+        # s2 (2 years) falls below s1 and s4 (5 years) once a minimum is set
+        result = matcher.rank({"tech_stack": ["python"], "min_experience": 4})
+        print(f"{scorer}: {result}")
+        plain = dict(matcher.rank({"tech_stack": ["python"]}))
+        assert [session_id for session_id, _ in result] == ["s1", "s4", "s2"]
+        assert math.isclose(dict(result)["s2"], plain["s2"] * EXPERIENCE_SHORTFALL_PENALTY)
+        assert math.isclose(dict(result)["s1"], plain["s1"])
+
+        # The position bonus also ranks candidates without any of the skills
+        result = matcher.rank({"tech_stack": ["java"], "position": "Backend Engineer"})
+        print(f"{scorer}: {result}")
+        skill_only = dict(matcher.rank({"tech_stack": ["java"]}))
+        assert_ranking(result, [("s3", skill_only["s3"] + POSITION_WEIGHT),
+                                ("s1", POSITION_WEIGHT), ("s4", POSITION_WEIGHT)])
+
+
+def test_incremental_fit():
+    """Test fitting a second batch adds candidates without disturbing the first"""
+    print("Testing incremental fit...")
+    for scorer in scorers():
+        matcher = CandidateMatcher()
+        matcher.fit([_session("a", ["python"], "1")])
+        matcher.fit([_session("b", ["java"], "9")])
+        print(f"{scorer}: {matcher.rank({'tech_stack': ['java']})}")
+        assert_ranking(matcher.rank({"tech_stack": ["java"]}), [("b", SKILL_WEIGHT)])
+        assert_ranking(matcher.rank({"tech_stack": ["python"]}), [("a", SKILL_WEIGHT)])
+        assert [s for s, _ in matcher.rank({"tech_stack": ["java"], "min_experience": 5})] == ["b"]
+
+        # Fitting in batches scores exactly like fitting everything at once
+        batched = CandidateMatcher().fit(SESSIONS[:2]).fit(SESSIONS[2:])
+        whole = CandidateMatcher().fit(SESSIONS)
+        job = {"tech_stack": ["python", "spring"], "position": "backend engineer", "min_experience": 4}
+        assert_ranking(batched.rank(job), whole.rank(job))
+
+
+def test_refit_replaces_candidate():
+    """Test that fitting a session again replaces it rather than adding a duplicate"""
+    print("Testing refitted candidates...")
+    updated = _session("s2", ["java", "spring"], "9 years", "backend engineer")
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(SESSIONS).fit([updated])
+        whole = CandidateMatcher().fit(SESSIONS[:1] + [updated] + SESSIONS[2:])
+        print(f"{scorer}: {matcher.rank({'tech_stack': ['java']})}")
+        assert len(matcher.session_ids) == len(SESSIONS)
+        for job in ({"tech_stack": ["python"]}, {"tech_stack": ["java"], "position": "data scientist"},
+                    {"tech_stack": ["spring"], "position": "backend engineer", "min_experience": 6}):
+            assert_ranking(matcher.rank(job), whole.rank(job))
+        assert "s2" not in dict(matcher.rank({"tech_stack": ["python"]}))
+        # "9 years" parses like the candidate index parses it
+        assert [s for s, _ in matcher.rank({"tech_stack": ["java"], "min_experience": 9})][0] == "s2"
+
+
+def test_unknown_job_skills_count():
+    """Test that job skills no candidate has still lower the skill score"""
+    print("Testing unknown job skills...")
+    for scorer in scorers():
+        matcher = CandidateMatcher().fit(SESSIONS)
+        full = dict(matcher.rank({"tech_stack": ["go"]}))
+        diluted = dict(matcher.rank({"tech_stack": ["go", "rust"]}))
+        print(f"{scorer}: {full} -> {diluted}")
+        # rust weighs in with the idf of a skill no candidate has
+        go_idf, rust_idf = math.log(6 / 2) + 1, math.log(6) + 1
+        assert math.isclose(full["s5"], SKILL_WEIGHT)
+        assert math.isclose(diluted["s5"], SKILL_WEIGHT * go_idf / math.hypot(go_idf, rust_idf))
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Matching Tests")
+    print("=" * 50)
+
+    try:
+        test_rank()
+        test_rank_many_matches_rank()
+        test_top_k_ties()
+        test_experience_and_position()
+        test_incremental_fit()
+        test_refit_replaces_candidate()
+        test_unknown_job_skills_count()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,94 @@
+"""
+Test script for TalentScout conversation replay
+This script checks that recorded conversation fixtures replay with matching state transitions without requiring Ollama.
+"""
+
+import sys
+import os
+import copy
+import glob
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from replay import FIXTURE_DIR, ReplayClient, load_fixture, replay, record
+
+
+def fixtures():
+    return [load_fixture(path) for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.json")))]
+
+
+def test_fixtures_replay_cleanly():
+    """Test every shipped fixture replays with the recorded states and calls"""
+    print("Testing fixture replay...")
+    assert fixtures(), "no fixtures found"
+    for fixture in fixtures():
+        result = replay(fixture)
+        print(f"{fixture['name']}: {len(result['overhead'])} turns, {result['mismatches']}")
+        assert result["mismatches"] == []
+        assert len(result["overhead"]) == len(fixture["turns"])
+
+
+def test_mismatches_are_reported():
+    """Test wrong states and missing or unused completions are reported"""
+    print("Testing mismatch reporting...")
+    fixture = load_fixture(os.path.join(FIXTURE_DIR, "python_developer.json"))
+
+    wrong_state = copy.deepcopy(fixture)
+    wrong_state["turns"][1]["state"] = "conclusion"
+    assert any("turn 2: expected state conclusion" in m for m in replay(wrong_state)["mismatches"])
+
+    missing_call = copy.deepcopy(fixture)
+    missing_call["turns"][5]["calls"].pop()
+    mismatches = replay(missing_call)["mismatches"]
+    assert any("more LLM calls than were recorded" in m for m in mismatches)
+
+    extra_call = copy.deepcopy(fixture)
+    extra_call["turns"][0]["calls"].append({"response": "unused", "latency_ms": 1})
+    assert "turn 1: 1 recorded LLM call(s) were not made" in replay(extra_call)["mismatches"]
+
+
+def test_recorded_latency():
+    """Test replayed completions sleep for the scaled recorded latency"""
+    print("Testing recorded latency...")
+    slept = []
+    client = ReplayClient(latency_scale=0.5, sleep=slept.append)
+    client.queue([{"response": "hello", "latency_ms": 800}])
+    response = client.create(model="x", messages=[])
+    assert response.choices[0].message.content == "hello"
+    assert slept == [0.4]
+    assert client.thread_seconds() > 0
+
+
+def test_record_round_trip():
+    """Test a recorded conversation replays against itself"""
+    print("Testing recording...")
+    fixture = load_fixture(os.path.join(FIXTURE_DIR, "python_developer.json"))
+    responses = [call["response"] for turn in fixture["turns"] for call in turn["calls"]]
+    scripted = ReplayClient()
+    scripted.queue([{"response": response} for response in responses])
+    recorded = record([turn["user"] for turn in fixture["turns"]], "copy", client=scripted)
+    assert [turn["state"] for turn in recorded["turns"]] == [turn["state"] for turn in fixture["turns"]]
+    assert recorded["final"] == fixture["final"]
+    assert replay(recorded)["mismatches"] == []
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Replay Tests")
+    print("=" * 50)
+
+    try:
+        test_fixtures_replay_cleanly()
+        test_mismatches_are_reported()
+        test_recorded_latency()
+        test_record_round_trip()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
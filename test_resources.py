@@ -0,0 +1,80 @@
+"""
+Test script for the TalentScout shared resource layer
+This script checks resource reuse, cached derived values and invalidation without requiring Ollama.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import resources
+from utils import get_tech_stack_categories
+
+
+def test_health_monitor_reuses_probe():
+    """Test that the background Ollama probe runs once per TTL window"""
+    print("Testing health monitor...")
+
+    calls = []
+
+    def failing_probe():
+        calls.append(1)
+        raise ValueError("Cannot connect to Ollama!")
+
+    original = resources.validate_config
+    resources.validate_config = failing_probe
+    try:
+        monitor = resources.HealthMonitor(ttl=60)
+        assert not monitor.known
+        assert monitor.check(wait=True) == "Cannot connect to Ollama!"
+        assert monitor.known
+        assert monitor.check() == "Cannot connect to Ollama!"
+        assert len(calls) == 1
+
+        expired = resources.HealthMonitor(ttl=0)
+        expired.check(wait=True)
+        expired.check(wait=True)
+        assert len(calls) == 3
+    finally:
+        resources.validate_config = original
+
+
+def test_shared_resources_and_invalidation():
+    """Test that resources are built once and rebuilt after invalidation"""
+    print("Testing shared resources...")
+
+    assert resources.get_taxonomy() is resources.get_taxonomy()
+    assert resources.get_health_monitor() is resources.get_health_monitor()
+
+    stack = ("python", "django", "docker", "terraform")
+    categories = resources.tech_stack_categories(stack)
+    print(f"Categories: {categories}")
+    assert categories == get_tech_stack_categories(list(stack))
+    assert categories["Other"] == ["terraform"]
+
+    hook_calls = []
+    resources.register_invalidation_hook(lambda: hook_calls.append(1))
+    taxonomy = resources.get_taxonomy()
+    resources.invalidate_resources()
+    assert resources.get_taxonomy() is not taxonomy
+    assert hook_calls == [1]
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Resource Tests")
+    print("=" * 50)
+
+    try:
+        test_health_monitor_reuses_probe()
+        test_shared_resources_and_invalidation()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,270 @@
+"""
+Test script for TalentScout bounded session memory
+This script checks transcript spilling, idle session release and shared state round trips across hosts without requiring Ollama.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from session_memory import SpillStore, Transcript, SessionMemory, MissingTranscriptChunk
+from state_backend import SharedSessionState, SQLiteStateBackend, FileStateBackend, decode_session
+from assistant import HiringAssistant
+from export_cache import ExportCache
+from config import CONVERSATION_STATES
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_messages(count, start=0):
+    return [{"role": "user" if i % 2 else "assistant", "content": f"message {i}"} for i in range(start, start + count)]
+
+
+def make_store(tmp):
+    return SpillStore(SQLiteStateBackend(os.path.join(tmp, "state.db")))
+
+
+def make_transcript(store, messages=(), **limits):
+    options = dict(store=store, max_messages=30, max_bytes=10 ** 9, chunk_size=10, keep_recent=5)
+    options.update(limits)
+    return Transcript("session-1", messages, **options)
+
+
+def test_spill_and_read_back():
+    """Test that old messages spill in chunks and read back in order"""
+    print("Testing transcript spilling...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        messages = make_messages(95)
+        transcript = make_transcript(store)
+        for message in messages:
+            transcript.append(message)
+
+        print(f"{transcript}: {transcript.memory_bytes} resident bytes")
+        assert len(transcript) == 95
+        assert transcript.spilled == 70 and len(transcript.tail()) == 25
+        assert transcript == messages
+        assert transcript[3] == messages[3] and transcript[-1] == messages[-1]
+        assert transcript[8:23] == messages[8:23]
+        assert transcript[60:] == messages[60:]
+        assert transcript[::10] == messages[::10]
+        assert store.read("session-1", 0) == messages[:10]
+
+        # A byte cap spills too, but never the most recent messages
+        small = make_transcript(store, make_messages(40), max_bytes=1)
+        assert small.spilled == 30 and len(small.tail()) == 10
+        store.backend.close()
+
+
+def test_release_and_reload():
+    """Test that a released transcript frees memory and reloads transparently"""
+    print("Testing transcript release...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        messages = make_messages(47)
+        transcript = make_transcript(store, messages)
+        resident_bytes = transcript.memory_bytes
+        assert transcript.release() > 0
+        assert transcript.released and 0 < transcript.memory_bytes < resident_bytes
+        assert len(transcript) == 47
+        # Full chunks spill; the last seven messages stay packed in memory rather than as a short chunk
+        assert transcript.spilled == 40 and store.read("session-1", 4) is None
+
+        assert transcript[-3:] == messages[-3:]
+        assert not transcript.released
+        transcript.append({"role": "user", "content": "back again"})
+        assert len(transcript) == 48 and transcript[-1]["content"] == "back again"
+        assert list(transcript)[:47] == messages
+
+        # Lost messages are an error, never silently replaced in exports
+        store.backend.delete("session-1")
+        assert transcript.release() > 0
+        assert len(transcript) == 48
+        try:
+            transcript[:]
+            assert False, "reading a missing chunk should fail"
+        except MissingTranscriptChunk as e:
+            assert e.session_id == "session-1" and e.chunk == 0
+        store.backend.close()
+
+
+def test_partial_chunks_are_never_written():
+    """Test that a stale copy releasing its transcript cannot shorten a chunk another process spilled"""
+    print("Testing stale transcript release...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        messages = make_messages(60)
+        stale = make_transcript(store, messages[:43])
+        current = make_transcript(store, messages[:43], max_messages=10)
+        current.extend(messages[43:])
+        assert current.spilled == 50
+        stale.release()
+        assert store.read("session-1", 4) == messages[40:50]
+        assert make_transcript(store, messages[50:], spilled=50) == messages
+
+        # A short chunk is reported, never read as if it were whole
+        store.write("session-1", 4, messages[40:43])
+        try:
+            list(current)
+            assert False, "reading a short chunk should fail"
+        except MissingTranscriptChunk as e:
+            assert e.chunk == 4
+        store.backend.close()
+
+
+def test_shared_state_stores_only_resident_messages():
+    """Test that saved sessions reference spilled messages instead of copying them"""
+    print("Testing shared state with spilled transcripts...")
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SharedSessionState(SQLiteStateBackend(os.path.join(tmp, "state.db")))
+        assistant = HiringAssistant()
+        messages = make_messages(200)
+        for message in messages:
+            assistant.record_message(message["role"], message["content"])
+        transcript = Transcript("session-1", messages, store=shared.spill_store)
+        assert transcript.spilled > 0
+
+        assert shared.save("session-1", assistant, transcript, 0) == 1
+        record = decode_session(shared.backend.load("session-1")[1])
+        assert record["spilled"] == transcript.spilled
+        assert record["messages"] == transcript.tail() == messages[transcript.spilled:]
+
+        stored = shared.load("session-1")
+        assert stored["messages"].spilled == transcript.spilled
+        assert stored["messages"] == messages
+        assert HiringAssistant.from_stored(stored).conversation_stats.total_messages == 200
+
+        # Deleting the session deletes its spilled messages too
+        shared.delete("session-1")
+        assert shared.load("session-1") is None
+        assert shared.spill_store.read("session-1", 0) is None
+        shared.close()
+
+
+def test_spilled_messages_follow_the_session_across_hosts():
+    """Test that another host sharing the state directory reads spilled messages"""
+    print("Testing spilled transcripts across hosts...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "shared-volume")
+        host_a = SharedSessionState(FileStateBackend(directory))
+        host_b = SharedSessionState(FileStateBackend(directory))
+        messages = make_messages(150)
+        assistant = HiringAssistant()
+        transcript = Transcript("session-1", messages, store=host_a.spill_store)
+        assert transcript.spilled > 0
+        host_a.save("session-1", assistant, transcript, 0)
+
+        stored = host_b.load("session-1")
+        assert len(stored["messages"]) == 150
+        assert stored["messages"][0] == messages[0]
+        assert list(stored["messages"]) == messages
+
+        host_b.delete("session-1")
+        assert all(name.endswith(".lock") for name in os.listdir(directory))
+
+
+def test_idle_sessions_are_released():
+    """Test that sessions idle past the TTL are released unless busy"""
+    print("Testing idle session release...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        clock = FakeClock()
+        memory = SessionMemory(ttl=600, sweep_interval=60, clock=clock)
+
+        assistant = HiringAssistant()
+        assistant.set_candidate_field("name", "Jane Doe")
+        assistant.conversation_state = CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        assistant.extract_tech_stack("python and docker")
+        before = assistant.to_dict()
+        transcript = make_transcript(store, make_messages(12))
+        cache = ExportCache()
+        cache.get(("session-1", 1, 12), "json", lambda: "payload")
+        released = []
+        memory.touch("session-1", transcript, assistant, caches=[cache], on_release=lambda: released.append(1))
+        memory.touch("session-2", make_transcript(store, make_messages(3)))
+
+        usage = memory.usage()
+        assert usage["session-1"]["transcript_bytes"] > 0 and usage["session-1"]["assistant_bytes"] > 0
+
+        clock.now += 300
+        memory.touch("session-2")
+        clock.now += 400
+        assert memory.sweep(force=True) == ["session-1"]
+        assert released == [1] and transcript.released and cache.builds == 1
+        assert memory.usage().keys() == {"session-2"}
+        assert memory.metrics()["released_total"] == 1 and memory.metrics()["released_bytes"] > 0
+
+        # The released assistant unpacks on first use with its state intact
+        assert assistant.memory_bytes() < memory.metrics()["released_bytes"]
+        assert assistant.to_dict() == before
+        assert assistant.tech_stack == ["python", "docker"]
+
+        # Busy sessions are never released
+        clock.now += 10000
+        assert memory.sweep(busy=lambda session_id: session_id == "session-2", force=True) == []
+        assert "session-2" in memory.usage()
+
+        # Sessions whose lock is held (a script run in progress) are never released
+        session_3 = make_transcript(store, make_messages(3))
+        memory.touch("session-3", session_3)
+        clock.now += 10000
+        entered, leave = threading.Event(), threading.Event()
+
+        def script_run():
+            with memory.in_use("session-3"):
+                entered.set()
+                leave.wait(5)
+
+        runner = threading.Thread(target=script_run)
+        runner.start()
+        entered.wait(5)
+        assert "session-3" not in memory.sweep(busy=lambda session_id: session_id == "session-2", force=True)
+        assert not session_3.released
+        leave.set()
+        runner.join()
+        assert memory.sweep(busy=lambda session_id: session_id == "session-2", force=True) == ["session-3"]
+        assert session_3.released
+
+        # Using a released session tracks it again
+        with memory.in_use("session-3"):
+            assert "session-3" in memory.usage()
+
+        # Sweeps run at most once per interval
+        throttled = SessionMemory(ttl=0, sweep_interval=60, clock=clock)
+        throttled.touch("session-4", make_transcript(store))
+        assert throttled.sweep() == []
+        clock.now += 61
+        assert throttled.sweep() == ["session-4"]
+        store.backend.close()
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Session Memory Tests")
+    print("=" * 50)
+
+    try:
+        test_spill_and_read_back()
+        test_release_and_reload()
+        test_partial_chunks_are_never_written()
+        test_shared_state_stores_only_resident_messages()
+        test_spilled_messages_follow_the_session_across_hosts()
+        test_idle_sessions_are_released()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
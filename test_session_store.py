@@ -0,0 +1,179 @@
+"""
+Test script for the TalentScout session store
+This script checks write-behind persistence and session resumption without requiring OpenAI API calls.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from session_store import SessionStore, SessionStoreError
+from assistant import HiringAssistant
+from config import CONVERSATION_STATES
+
+
+def test_session_round_trip():
+    """Test that sessions, messages and fields survive a store restart"""
+    print("Testing session round trip...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "sessions.db")
+        assistant = HiringAssistant()
+
+        store = SessionStore(db_path)
+        store.save_session("abc", assistant.to_dict())
+        assistant.record_message("assistant", "Hello!")
+        assistant.record_message("user", "My name is John Doe")
+        assistant.set_candidate_field("name", "John Doe")
+        assistant.set_candidate_field("experience", "5")
+        assistant.conversation_state = CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        assistant.extract_tech_stack("I use python")
+        store.append_events("abc", assistant.events.drain())
+        store.close()
+
+        store = SessionStore(db_path)
+        stored = store.load_session("abc")
+        store.close()
+
+        print(f"Stored: {stored}")
+        assert stored["messages"] == [
+            {"role": "assistant", "content": "Hello!"},
+            {"role": "user", "content": "My name is John Doe"}
+        ]
+        assert stored["candidate_info"] == {"name": "John Doe", "experience": "5"}
+        assert stored["last_seq"] == assistant.events.last_seq
+
+        restored = HiringAssistant.from_dict(stored["state"], last_seq=stored["last_seq"])
+        assert restored.conversation_state == CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        assert restored.tech_stack == ["python"]
+        assert restored.candidate_info == {"name": "John Doe", "experience": "5"}
+        assert restored.state_turns == {CONVERSATION_STATES['GREETING']: 1}
+        assert restored.events.drain() == []
+
+
+def test_replay_from_snapshot():
+    """Test that only events after the latest snapshot are replayed"""
+    print("Testing snapshot replay...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        assistant = HiringAssistant()
+        assistant.set_candidate_field("name", "Jane Smith")
+        store.append_events("abc", assistant.events.drain())
+        store.save_session("abc", assistant.to_dict(), snapshot_seq=assistant.events.last_seq)
+        # An older snapshot arriving late must not replace a newer one
+        store.save_session("abc", HiringAssistant().to_dict(), snapshot_seq=0)
+        assistant.set_candidate_field("location", "Berlin")
+        assistant.conversation_state = CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        store.append_events("abc", assistant.events.drain())
+        store.flush()
+
+        stored = store.load_session("abc")
+        assert stored["snapshot_seq"] == 1
+        assert stored["last_seq"] == 3
+        assert stored["state"]["candidate_info"] == {"name": "Jane Smith", "location": "Berlin"}
+        assert stored["state"]["conversation_state"] == CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        assert store.list_sessions()[0]["conversation_state"] == CONVERSATION_STATES['COLLECTING_TECH_STACK']
+        assert next(store.iter_sessions())["state"] == stored["state"]
+        store.close()
+
+
+def test_batched_writes_coalesce():
+    """Test that repeated snapshots in one batch keep the latest state"""
+    print("Testing write coalescing...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"))
+        for i in range(50):
+            store.save_session("abc", {"conversation_state": "greeting", "turn": i})
+        store.flush()
+        assert store.load_session("abc")["state"]["turn"] == 49
+        assert store.load_session("missing") is None
+        assert [s["session_id"] for s in store.list_sessions()] == ["abc"]
+        store.close()
+
+
+def test_writes_apply_in_queue_order():
+    """Test that a session deleted and recreated within one batch ends up recreated"""
+    print("Testing write order...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"), flush_interval=1)
+        assistant = HiringAssistant()
+        assistant.record_message("user", "first")
+        store.save_assistant("abc", assistant, snapshot=True)
+        store.delete_session("abc")
+        recreated = HiringAssistant()
+        recreated.record_message("user", "second")
+        store.save_assistant("abc", recreated, snapshot=True)
+        store.save_assistant("gone", HiringAssistant(), snapshot=True)
+        store.delete_session("gone")
+        store.flush()
+
+        stored = store.load_session("abc")
+        assert stored["messages"] == [{"role": "user", "content": "second"}]
+        assert store.load_session("gone") is None
+        store.close()
+
+
+def test_failed_writes_are_retried_and_reported():
+    """Test that a transient error is retried and a persistent one surfaces from flush()"""
+    print("Testing failed writes...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "sessions.db"), flush_interval=0.01)
+        apply, failures = store._apply, []
+
+        def flaky(conn, writes):
+            if len(failures) < 1:
+                failures.append(writes)
+                raise sqlite3.OperationalError("database is locked")
+            apply(conn, writes)
+
+        store._apply = flaky
+        store.save_session("abc", {"conversation_state": "greeting"})
+        store.flush()
+        assert len(failures) == 1 and store.load_session("abc") is not None
+
+        def broken(conn, writes):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        store._apply = broken
+        store.save_session("def", {"conversation_state": "greeting"})
+        try:
+            store.flush()
+            assert False, "a dropped write should be reported"
+        except SessionStoreError as e:
+            print(f"Reported: {e}")
+            assert "disk I/O error" in str(e)
+        # Reported once; later writes start clean
+        store._apply = apply
+        store.save_session("ghi", {"conversation_state": "greeting"})
+        store.flush()
+        assert store.load_session("def") is None and store.load_session("ghi") is not None
+        store.close()
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Session Store Tests")
+    print("=" * 50)
+
+    try:
+        test_session_round_trip()
+        test_replay_from_snapshot()
+        test_batched_writes_coalesce()
+        test_writes_apply_in_queue_order()
+        test_failed_writes_are_retried_and_reported()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,142 @@
+"""
+Test script for the TalentScout transcript archive
+This script checks compressed block storage, point lookups, append and compaction.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from transcript_archive import TranscriptArchive, archive_key
+from utils import format_session_data
+
+
+def make_session(i, note="first"):
+    """Build an export-shaped session with a predictable id"""
+    session_data = format_session_data(
+        {"name": f"Candidate {i}", "email": f"candidate{i}@example.com"},
+        ["python"],
+        [{"role": "user", "content": f"Answer {i} ({note})\nwith a newline"}],
+        []
+    )
+    session_data["session_id"] = f"session_{i:04d}"
+    return session_data
+
+
+def test_point_lookup_and_reopen():
+    """Test that sessions are readable by id before and after reopening"""
+    print("Testing point lookups...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.tsa")
+        with TranscriptArchive(path, block_size=10, codec="gzip") as archive:
+            assert archive.extend(make_session(i) for i in range(25)) == 25
+            # Buffered sessions are visible before their block is written
+            assert archive.get("session_0024")["candidate_info"]["name"] == "Candidate 24"
+
+        with TranscriptArchive(path, block_size=10, codec="gzip") as archive:
+            assert len(archive) == 25
+            assert archive.get("session_0007")["candidate_info"] == make_session(7)["candidate_info"]
+            assert archive.get("session_0024")["conversation_messages"][0]["content"].endswith("newline")
+            assert archive.get("missing") is None
+            assert [s["session_id"] for s in archive.iter_sessions()] == [f"session_{i:04d}" for i in range(25)]
+
+
+def test_replace_delete_and_compact():
+    """Test that replaced and deleted sessions are dropped by compaction"""
+    print("Testing compaction...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.tsa")
+        with TranscriptArchive(path, block_size=4, codec="gzip") as archive:
+            archive.extend(make_session(i) for i in range(12))
+            archive.flush()
+            archive.append(make_session(3, note="second"))
+            assert archive.delete("session_0005")
+            assert not archive.delete("session_0005")
+
+            assert "session_0005" not in archive
+            assert "second" in archive.get("session_0003")["conversation_messages"][0]["content"]
+
+            stats = archive.compact()
+            print(f"Compaction: {stats}")
+            assert stats["sessions"] == 11
+            assert stats["bytes_after"] < stats["bytes_before"]
+            assert "second" in archive.get("session_0003")["conversation_messages"][0]["content"]
+            assert archive.get("session_0005") is None
+
+        # The rewritten index is consistent on reopen, and a lost index is rebuilt
+        os.remove(path + ".idx")
+        with TranscriptArchive(path, block_size=4, codec="gzip") as archive:
+            assert len(archive) == 11
+            assert archive.get("session_0011")["candidate_info"]["name"] == "Candidate 11"
+
+
+def test_exports_from_the_same_second_are_kept_apart():
+    """Test that timestamp-named exports made within one second do not replace each other"""
+    print("Testing export ids...")
+
+    first, second = make_session(1), make_session(2)
+    first["session_id"] = second["session_id"] = "session_20240101_120000"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.tsa")
+        with TranscriptArchive(path, codec="gzip") as archive:
+            keys = [archive.append(first), archive.append(second)]
+            print(f"Keys: {keys}")
+            assert keys[0] != keys[1] and all(k.startswith("session_20240101_120000_") for k in keys)
+            # The same export appended again keeps its key
+            assert archive.append(dict(first)) == keys[0]
+        with TranscriptArchive(path, codec="gzip") as archive:
+            assert sorted(archive.session_ids()) == sorted(keys)
+            assert archive.get(keys[1])["candidate_info"]["name"] == "Candidate 2"
+            assert archive.delete(keys[0]) and archive.session_ids() == [keys[1]]
+    # Store session ids are used as they are
+    assert archive_key({"session_id": "3f2a-uuid"}) == "3f2a-uuid"
+
+
+def test_corrupt_block_is_skipped():
+    """Test that rebuilding the index skips a block that no longer decodes"""
+    print("Testing corrupt blocks...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.tsa")
+        with TranscriptArchive(path, block_size=4, codec="gzip") as archive:
+            archive.extend(make_session(i) for i in range(12))
+            second_block = archive._index["session_0004"][0]
+
+        # Damage the second block's payload and lose the sidecar index
+        with open(path, "r+b") as f:
+            f.seek(second_block + 20)
+            f.write(b"\xff" * 16)
+        os.remove(path + ".idx")
+
+        with TranscriptArchive(path, block_size=4, codec="gzip") as archive:
+            print(f"Corrupt blocks: {archive.corrupt_blocks}")
+            assert archive.corrupt_blocks == [second_block]
+            assert archive.session_ids() == [f"session_{i:04d}" for i in (0, 1, 2, 3, 8, 9, 10, 11)]
+            archive.append(make_session(12))
+        with TranscriptArchive(path, block_size=4, codec="gzip") as archive:
+            assert archive.get("session_0012") is not None and archive.get("session_0009") is not None
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Transcript Archive Tests")
+    print("=" * 50)
+
+    try:
+        test_point_lookup_and_reopen()
+        test_replace_delete_and_compact()
+        test_exports_from_the_same_second_are_kept_apart()
+        test_corrupt_block_is_skipped()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
@@ -0,0 +1,144 @@
+"""
+Test script for TalentScout background turn execution
+This script checks per-session ordering and de-duplication of chat turns without requiring OpenAI API calls.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from turn_worker import TurnWorker, DONE, FAILED, FAILED_TURN_REPLY
+from admission import AdmissionController
+
+
+class GatedAssistant:
+    """Stand-in assistant whose responses wait until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.messages = []
+        self.calls = 0
+
+    def record_message(self, role, content):
+        self.messages.append((role, content))
+
+    def generate_response(self, prompt):
+        self.calls += 1
+        self.release.wait(5)
+        return f"reply to {prompt}"
+
+
+def test_turns_run_in_order_and_deduplicate():
+    """Test that a session's turns are serialised and duplicates reuse the pending job"""
+    print("Testing turn ordering and de-duplication...")
+
+    worker = TurnWorker(max_workers=4)
+    assistant = GatedAssistant()
+    first, created = worker.submit("abc", assistant, "hello")
+    assert created
+    duplicate, created = worker.submit("abc", assistant, "hello")
+    assert not created and duplicate is first
+    second, created = worker.submit("abc", assistant, "my name is John")
+    assert created
+
+    assert [job.prompt for job in worker.pending("abc")] == ["hello", "my name is John"]
+    assert worker.collect("abc") == []
+
+    assistant.release.set()
+    assert second.done.wait(5)
+    finished = worker.collect("abc")
+    print(f"Finished: {[(job.prompt, job.response) for job in finished]}")
+    assert [job.response for job in finished] == ["reply to hello", "reply to my name is John"]
+    assert all(job.status == DONE for job in finished)
+    assert assistant.calls == 2
+    assert assistant.messages == [
+        ("user", "hello"), ("assistant", "reply to hello"),
+        ("user", "my name is John"), ("assistant", "reply to my name is John")
+    ]
+    assert worker.deduplicated == 1
+    assert worker.pending("abc") == [] and not worker.has_finished("abc")
+    worker.shutdown()
+
+
+def test_sessions_run_concurrently():
+    """Test that one slow session does not hold up another"""
+    print("Testing concurrent sessions...")
+
+    worker = TurnWorker(max_workers=2)
+    slow, fast = GatedAssistant(), GatedAssistant()
+    fast.release.set()
+    worker.submit("slow", slow, "hello")
+    job, _ = worker.submit("fast", fast, "hello")
+    assert job.done.wait(5)
+    assert worker.has_finished("fast")
+    assert not worker.has_finished("slow")
+    slow.release.set()
+    worker.shutdown()
+
+
+def test_failed_turns_record_both_messages():
+    """Test that a turn turned away by admission control still logs the prompt and the apology"""
+    print("Testing failed turns...")
+
+    # One turn holds the LLM and one waits for it; a third is turned away
+    admission = AdmissionController(max_active=1, max_queued=1)
+    worker = TurnWorker(max_workers=3, admission=admission)
+    running, waiting, refused = GatedAssistant(), GatedAssistant(), GatedAssistant()
+    worker.submit("running", running, "hello")
+    worker.submit("waiting", waiting, "hello")
+    job, _ = worker.submit("refused", refused, "hello")
+    assert job.done.wait(5)
+
+    finished = worker.collect("refused")
+    print(f"Failed turn: {finished[0].response}")
+    assert finished == [job] and job.status == FAILED
+    assert job.response == FAILED_TURN_REPLY.format(error=job.error)
+    assert refused.messages == [("user", "hello"), ("assistant", job.response)]
+    assert refused.calls == 0
+    running.release.set()
+    waiting.release.set()
+    worker.shutdown()
+
+
+def test_uncollected_turns_expire():
+    """Test that finished turns nobody collects are dropped after the TTL"""
+    print("Testing uncollected turn expiry...")
+
+    worker = TurnWorker(max_workers=2, job_ttl=0.05)
+    abandoned = GatedAssistant()
+    abandoned.release.set()
+    job, _ = worker.submit("closed-tab", abandoned, "hello")
+    assert job.done.wait(5)
+    assert worker.has_finished("closed-tab")
+
+    time.sleep(0.1)
+    active = GatedAssistant()
+    active.release.set()
+    worker.submit("open-tab", active, "hello")
+    assert not worker.has_finished("closed-tab") and worker.collect("closed-tab") == []
+    assert worker.expired == 1
+    worker.shutdown()
+
+
+def main():
+    """Run all tests"""
+    print(" Running TalentScout Turn Worker Tests")
+    print("=" * 50)
+
+    try:
+        test_turns_run_in_order_and_deduplicate()
+        test_sessions_run_concurrently()
+        test_failed_turns_record_both_messages()
+        test_uncollected_turns_expire()
+        print(" All tests completed successfully!")
+    except AssertionError as e:
+        print(f" Test failed with error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
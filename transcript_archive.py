@@ -0,0 +1,430 @@
+"""
+Compressed transcript archive for TalentScout Hiring Assistant
+
+Packs many completed sessions into compressed blocks (zstd when available,
+gzip otherwise) inside a single archive file, with a sidecar offset index
+keyed by session id. Store session ids are used as they are; exports named
+by the second they were made (session_YYYYmmdd_HHMMSS) are told apart by a
+hash of their contents. Reading one transcript seeks to its block and
+decompresses only that block. Sessions can be appended at any time;
+re-appended or deleted sessions leave dead records behind until compact()
+rewrites the archive. Blocks that cannot be decoded are skipped when the
+index is rebuilt.
+
+Usage:
+    python transcript_archive.py pack exports/ transcripts.tsa
+    python transcript_archive.py list transcripts.tsa
+    python transcript_archive.py get transcripts.tsa session_20240101_120000_5f2c0e91d3a4
+    python transcript_archive.py delete transcripts.tsa session_20240101_120000_5f2c0e91d3a4
+    python transcript_archive.py compact transcripts.tsa
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import uuid
+import zlib
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+# Try to import zstandard, but handle gracefully if not available
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+DEFAULT_BLOCK_SIZE = 256  # sessions per compressed block
+
+CODEC_GZIP = 0
+CODEC_ZSTD = 1
+CODEC_NAMES = {"gzip": CODEC_GZIP, "zstd": CODEC_ZSTD}
+
+# File header: magic, generation id shared with the sidecar index
+_FILE_MAGIC = b"TSAF"
+_FILE_HEADER = struct.Struct(">4s16s")
+# Block header: magic, codec, payload length, record count
+_MAGIC = b"TSA1"
+_HEADER = struct.Struct(">4sBII")
+
+# Ids format_session_data gives exports, which repeat within a second
+_TIMESTAMP_ID = re.compile(r"session_\d{8}_\d{6}")
+
+# Errors a damaged compressed payload can raise
+_DECODE_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if ZSTD_AVAILABLE else ())
+
+
+class CorruptBlock(ValueError):
+    """Raised when a complete block's payload cannot be decoded"""
+
+    def __init__(self, offset: int, length: int):
+        super().__init__(f"Archive block at offset {offset} is corrupt")
+        self.offset = offset
+        self.length = length
+
+
+def _compress(codec: int, data: bytes, level: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Archive block is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def archive_key(session_data: Dict[str, Any]) -> str:
+    """Key a session is archived under: its session_id, plus a content hash for timestamp ids"""
+    session_id = str(session_data["session_id"])
+    if not _TIMESTAMP_ID.fullmatch(session_id):
+        return session_id
+    content = json.dumps(session_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f"{session_id}_{hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _record_id(record: Dict[str, Any]) -> str:
+    """Archive key of an archived record or tombstone"""
+    # Tombstones already carry the key
+    return str(record["session_id"]) if record.get("_deleted") else archive_key(record)
+
+
+class TranscriptArchive:
+    """Append-only archive of compressed session blocks with an offset index"""
+
+    def __init__(self, path: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                 codec: Optional[str] = None, level: Optional[int] = None):
+        if codec is None:
+            codec = "zstd" if ZSTD_AVAILABLE else "gzip"
+        if codec not in CODEC_NAMES:
+            raise ValueError(f"Unknown codec: {codec}")
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        self.path = path
+        self.index_path = path + ".idx"
+        self.block_size = block_size
+        self.codec = CODEC_NAMES[codec]
+        self.codec_name = codec
+        self.level = level if level is not None else (9 if self.codec == CODEC_ZSTD else 6)
+
+        self._lock = threading.RLock()
+        self._pending: List[Dict[str, Any]] = []
+        # session_id -> (block offset, payload length, line within block)
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._end = 0
+        self._cached_block: Tuple[int, List[bytes]] = (-1, [])
+        # Offsets of blocks skipped as corrupt when the index was last rebuilt
+        self.corrupt_blocks: List[int] = []
+
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(_FILE_HEADER.pack(_FILE_MAGIC, uuid.uuid4().bytes))
+        self._load_index()
+        self._data = open(path, "r+b")
+
+    # Index maintenance
+
+    def _load_index(self):
+        """Load the sidecar index and index any blocks written after it"""
+        with open(self.path, "rb") as data:
+            header = data.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or header[:4] != _FILE_MAGIC:
+            raise ValueError(f"{self.path} is not a transcript archive")
+        generation = _FILE_HEADER.unpack(header)[1].hex()
+        self._index, self._end = {}, _FILE_HEADER.size
+        self.corrupt_blocks = []
+
+        valid = False
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                try:
+                    valid = json.loads(f.readline()).get("archive") == generation
+                except ValueError:
+                    valid = False
+                for line in f if valid else ():
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn final line; the block scan below recovers it
+                    self._apply_index_entry(entry)
+
+        size = os.path.getsize(self.path)
+        if not valid or self._end > size:
+            # The index belongs to another generation of the archive (e.g. an
+            # interrupted compaction) or to data that is gone; rebuild it
+            self._index, self._end = {}, _FILE_HEADER.size
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"archive": generation}) + "\n")
+        if self._end < size:
+            with open(self.path, "rb") as data, open(self.index_path, "a", encoding="utf-8") as index:
+                data.seek(self._end)
+                while True:
+                    offset = data.tell()
+                    try:
+                        block = self._read_block_at(data, offset)
+                        if block is None:
+                            break
+                        entries = self._index_entries(offset, *block)
+                    except (CorruptBlock, ValueError, KeyError, TypeError, AttributeError):
+                        # Skip the damaged block, losing only its sessions, and keep scanning after it
+                        _, _, length, _ = _HEADER.unpack(self._read_header_at(data, offset))
+                        self.corrupt_blocks.append(offset)
+                        self._end = offset + _HEADER.size + length
+                        data.seek(self._end)
+                        continue
+                    for entry in entries:
+                        self._apply_index_entry(entry)
+                        index.write(json.dumps(entry) + "\n")
+            if self._end < size:
+                # Drop a partially written trailing block
+                with open(self.path, "r+b") as data:
+                    data.truncate(self._end)
+
+    def _apply_index_entry(self, entry: Dict[str, Any]):
+        position = (entry["offset"], entry["length"], entry["line"])
+        if entry.get("deleted"):
+            self._index.pop(entry["id"], None)
+        else:
+            self._index[entry["id"]] = position
+        self._end = max(self._end, entry["offset"] + _HEADER.size + entry["length"])
+
+    @staticmethod
+    def _index_entries(offset: int, length: int, lines: List[bytes]) -> List[Dict[str, Any]]:
+        entries = []
+        for i, line in enumerate(lines):
+            record = json.loads(line)
+            entry = {"id": _record_id(record), "offset": offset, "length": length, "line": i}
+            if record.get("_deleted"):
+                entry["deleted"] = True
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _read_header_at(f, offset: int) -> bytes:
+        f.seek(offset)
+        return f.read(_HEADER.size)
+
+    @staticmethod
+    def _read_block_at(f, offset: int) -> Optional[Tuple[int, List[bytes]]]:
+        """Read and decompress the block at offset, or None if it is incomplete
+
+        Raises CorruptBlock if the block is complete but its payload cannot
+        be decompressed.
+        """
+        header = TranscriptArchive._read_header_at(f, offset)
+        if len(header) < _HEADER.size:
+            return None
+        magic, codec, length, count = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            return None
+        payload = f.read(length)
+        if len(payload) < length:
+            return None
+        try:
+            lines = _decompress(codec, payload).split(b"\n")[:count]
+        except _DECODE_ERRORS as e:
+            raise CorruptBlock(offset, length) from e
+        return length, lines
+
+    # Write path
+
+    def append(self, session_data: Dict[str, Any]):
+        """Add a session and return its archive key; a later append under the same key replaces it"""
+        if "session_id" not in session_data:
+            raise ValueError("Archived sessions need a session_id")
+        with self._lock:
+            self._pending.append(session_data)
+            if len(self._pending) >= self.block_size:
+                self.flush()
+        return archive_key(session_data)
+
+    def extend(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """Append many sessions and return how many were added"""
+        count = 0
+        for session_data in sessions:
+            self.append(session_data)
+            count += 1
+        return count
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session from the archive; its bytes are dropped on compact()"""
+        with self._lock:
+            if session_id not in self:
+                return False
+            self._pending.append({"session_id": session_id, "_deleted": True})
+            self.flush()
+            return True
+
+    def flush(self):
+        """Write buffered sessions out as one compressed block"""
+        with self._lock:
+            if not self._pending:
+                return
+            records, self._pending = self._pending, []
+            lines = [json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for r in records]
+            payload = _compress(self.codec, b"\n".join(lines), self.level)
+            offset = self._end
+            self._data.seek(offset)
+            self._data.write(_HEADER.pack(_MAGIC, self.codec, len(payload), len(lines)))
+            self._data.write(payload)
+            self._data.flush()
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                for entry in self._index_entries(offset, len(payload), lines):
+                    self._apply_index_entry(entry)
+                    index.write(json.dumps(entry) + "\n")
+
+    # Read path
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            for record in reversed(self._pending):
+                if _record_id(record) == session_id:
+                    return not record.get("_deleted")
+            return session_id in self._index
+
+    def __len__(self) -> int:
+        return len(self.session_ids())
+
+    def session_ids(self) -> List[str]:
+        """Archive keys of every live session"""
+        with self._lock:
+            ids = dict.fromkeys(self._index)
+            for record in self._pending:
+                if record.get("_deleted"):
+                    ids.pop(_record_id(record), None)
+                else:
+                    ids[_record_id(record)] = None
+            return list(ids)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read one session by decompressing only the block that holds it"""
+        with self._lock:
+            for record in reversed(self._pending):
+                if _record_id(record) == session_id:
+                    return None if record.get("_deleted") else record
+            position = self._index.get(session_id)
+            if position is None:
+                return None
+            offset, _, line = position
+            cached_offset, lines = self._cached_block
+            if cached_offset != offset:
+                _, lines = self._read_block_at(self._data, offset)
+                self._cached_block = (offset, lines)
+            return json.loads(lines[line])
+
+    def iter_sessions(self) -> Iterator[Dict[str, Any]]:
+        """Stream every live session, decompressing each block once"""
+        with self._lock:
+            self.flush()
+            index = dict(self._index)
+        for offset in sorted({position[0] for position in index.values()}):
+            with self._lock:
+                _, lines = self._read_block_at(self._data, offset)
+            for i, line in enumerate(lines):
+                record = json.loads(line)
+                position = index.get(_record_id(record))
+                if position is not None and position[0] == offset and position[2] == i:
+                    yield record
+
+    # Maintenance
+
+    def compact(self) -> Dict[str, int]:
+        """Rewrite the archive with only live sessions, packed into full blocks"""
+        with self._lock:
+            self.flush()
+            bytes_before = self._end
+            tmp_path = self.path + ".compact"
+            for stale in (tmp_path, tmp_path + ".idx"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            compacted = TranscriptArchive(tmp_path, self.block_size, self.codec_name, self.level)
+            try:
+                compacted.extend(self.iter_sessions())
+                compacted.flush()
+            finally:
+                compacted.close()
+
+            self._data.close()
+            # If we stop between the two renames, the index generation no
+            # longer matches the data file and is rebuilt on the next open
+            os.replace(tmp_path, self.path)
+            os.replace(tmp_path + ".idx", self.index_path)
+            self._cached_block = (-1, [])
+            self._load_index()
+            self._data = open(self.path, "r+b")
+            return {"sessions": len(self._index), "bytes_before": bytes_before, "bytes_after": self._end}
+
+    def close(self):
+        """Flush buffered sessions and close the archive"""
+        with self._lock:
+            if self._data.closed:
+                return
+            self.flush()
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the transcript archive"""
+    parser = argparse.ArgumentParser(description="TalentScout compressed transcript archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="Append JSON/JSONL session exports to an archive")
+    pack.add_argument("source", help="Directory of JSON/JSONL session exports")
+    pack.add_argument("archive")
+    pack.add_argument("--codec", choices=sorted(CODEC_NAMES))
+    listing = commands.add_parser("list", help="Print the key of every archived session")
+    listing.add_argument("archive")
+    get = commands.add_parser("get", help="Print one archived session")
+    get.add_argument("archive")
+    get.add_argument("session_id")
+    delete = commands.add_parser("delete", help="Delete one archived session")
+    delete.add_argument("archive")
+    delete.add_argument("session_id")
+    compact = commands.add_parser("compact", help="Drop replaced and deleted sessions")
+    compact.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        from bulk_export import iter_sessions_from_directory
+        with TranscriptArchive(args.archive, codec=args.codec) as archive:
+            count = archive.extend(iter_sessions_from_directory(args.source))
+        print(f"Archived {count} sessions to {args.archive}")
+    elif args.command == "list":
+        with TranscriptArchive(args.archive) as archive:
+            for session_id in archive.session_ids():
+                print(session_id)
+    elif args.command == "get":
+        with TranscriptArchive(args.archive) as archive:
+            session_data = archive.get(args.session_id)
+        if session_data is None:
+            print(f"Session {args.session_id} not found")
+            return 1
+        print(json.dumps(session_data, indent=2, ensure_ascii=False))
+    elif args.command == "delete":
+        with TranscriptArchive(args.archive) as archive:
+            if not archive.delete(args.session_id):
+                print(f"Session {args.session_id} not found")
+                return 1
+        print(f"Deleted {args.session_id}; run compact to reclaim its space")
+    else:
+        with TranscriptArchive(args.archive) as archive:
+            stats = archive.compact()
+        print(f"Compacted {stats['sessions']} sessions: {stats['bytes_before']} -> {stats['bytes_after']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
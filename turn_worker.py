@@ -0,0 +1,178 @@
+"""
+Background turn execution for TalentScout Hiring Assistant
+
+Chat turns run on a shared thread pool instead of the Streamlit script
+thread. Each session gets job handles that outlive reruns; a session's
+turns run one at a time in submission order, and re-submitting a message
+that is already queued or running returns the existing job instead of
+generating it twice. A started turn waits for an LLM slot from the
+admission controller and can report its place in line meanwhile. Both
+messages of a turn are recorded even when it fails, with an apology as
+the reply. Finished turns nobody collects within TURN_JOB_TTL (e.g. the
+browser tab was closed) are discarded.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import TURN_WORKER_THREADS, TURN_JOB_TTL
+from admission import AdmissionController, Overloaded, get_admission_controller
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Reply recorded for a turn that could not be answered
+FAILED_TURN_REPLY = "I apologize, but I'm experiencing technical difficulties. Please try again. Error: {error}"
+
+
+class TurnJob:
+    """Handle for one chat turn submitted to the worker"""
+
+    def __init__(self, session_id: str, assistant, prompt: str):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.assistant = assistant
+        self.prompt = prompt
+        self.status = QUEUED
+        self.response: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+        # Admission ticket, taken when the turn starts
+        self.ticket = None
+
+    @property
+    def pending(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+
+class TurnWorker:
+    """Runs chat turns on a thread pool, serialised and de-duplicated per session"""
+
+    def __init__(self, max_workers: int = TURN_WORKER_THREADS,
+                 admission: Optional[AdmissionController] = None, job_ttl: float = TURN_JOB_TTL):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="turn-worker")
+        self._admission = admission or get_admission_controller()
+        self.job_ttl = job_ttl
+        self._lock = threading.Lock()
+        # session_id -> jobs not yet collected, in submission order
+        self._jobs: Dict[str, List[TurnJob]] = {}
+        self.submitted = 0
+        self.deduplicated = 0
+        self.expired = 0
+
+    def submit(self, session_id: str, assistant, prompt: str) -> Tuple[TurnJob, bool]:
+        """Queue a turn; returns (job, created), reusing an identical pending job"""
+        with self._lock:
+            self._expire()
+            jobs = self._jobs.setdefault(session_id, [])
+            for job in jobs:
+                if job.pending and job.prompt == prompt:
+                    self.deduplicated += 1
+                    return job, False
+            job = TurnJob(session_id, assistant, prompt)
+            idle = not any(j.pending for j in jobs)
+            jobs.append(job)
+            self.submitted += 1
+            if idle:
+                self._start(job)
+        return job, True
+
+    def _start(self, job: TurnJob):
+        # Caller holds self._lock
+        job.status = RUNNING
+        try:
+            # Queue for the LLM now, so the place in line counts from submission
+            job.ticket = self._admission.enter(job.session_id)
+        except Overloaded as e:
+            job.error = str(e)
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: TurnJob):
+        status = FAILED
+        try:
+            # The prompt and a reply are recorded even if the turn fails, so the
+            # event log always matches the transcript the app builds from the job
+            job.assistant.record_message("user", job.prompt)
+            if job.ticket is None:
+                raise Overloaded(job.error)
+            self._admission.wait(job.ticket)
+            job.response = job.assistant.generate_response(job.prompt)
+            status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.response = FAILED_TURN_REPLY.format(error=job.error)
+        finally:
+            if job.ticket is not None:
+                self._admission.release(job.ticket)
+            job.assistant.record_message("assistant", job.response)
+            job.finished_at = time.time()
+            job.status = status
+            job.done.set()
+            with self._lock:
+                for queued in self._jobs.get(job.session_id, []):
+                    if queued.status == QUEUED:
+                        self._start(queued)
+                        break
+                self._expire()
+
+    def _expire(self):
+        # Caller holds self._lock
+        cutoff = time.time() - self.job_ttl
+        for session_id, jobs in list(self._jobs.items()):
+            kept = [job for job in jobs if job.pending or job.finished_at > cutoff]
+            self.expired += len(jobs) - len(kept)
+            if kept:
+                self._jobs[session_id] = kept
+            else:
+                del self._jobs[session_id]
+
+    def pending(self, session_id: str) -> List[TurnJob]:
+        """Jobs for a session that are queued or running"""
+        with self._lock:
+            return [job for job in self._jobs.get(session_id, []) if job.pending]
+
+    def collect(self, session_id: str) -> List[TurnJob]:
+        """Remove and return the session's finished jobs, in submission order"""
+        with self._lock:
+            jobs = self._jobs.get(session_id, [])
+            finished = []
+            while jobs and not jobs[0].pending:
+                finished.append(jobs.pop(0))
+            if not jobs:
+                self._jobs.pop(session_id, None)
+            return finished
+
+    def position(self, job: TurnJob) -> int:
+        """The job's 1-based place in line for the LLM, or 0 if it is not waiting"""
+        return self._admission.position(job.ticket) if job.ticket is not None else 0
+
+    def has_finished(self, session_id: str) -> bool:
+        """Whether the session has a finished job waiting to be collected"""
+        with self._lock:
+            jobs = self._jobs.get(session_id, [])
+            return bool(jobs) and not jobs[0].pending
+
+    def shutdown(self):
+        """Stop accepting work and wait for running turns"""
+        self._executor.shutdown(wait=True)
+
+
+_worker: Optional[TurnWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_turn_worker() -> TurnWorker:
+    """Return the process-wide turn worker, creating it on first use"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = TurnWorker()
+        return _worker
@@ -3,20 +3,17 @@
 Utility functions for TalentScout Hiring Assistant
 """
 
+import importlib.util
 import json
 import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-# Try to import pandas, but handle gracefully if not available
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    pd = None
+# pandas is slow to import and only needed for exports; check that it is
+# installed here and import it where it is used
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
 
-from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS
+from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS, TOPIC_KEYWORDS, TECH_CATEGORIES
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text"""
@@ -89,6 +86,13 @@ def extract_location(text: str) -> Optional[str]:
                 return location
     return None
 
+def parse_experience_years(value: Any) -> Optional[int]:
+    """Parse an experience field such as "5" or "5 years" into whole years, or None"""
+    if value is None or value == "":
+        return None
+    match = re.search(r'\d+', str(value))
+    return int(match.group(0)) if match else None
+
 def extract_tech_stack(text: str) -> List[str]:
     """Extract tech stack from text"""
     found_tech = []
@@ -138,9 +142,10 @@ def validate_candidate_info(info: Dict[str, Any]) -> Dict[str, Any]:
     return validation_results
 
 def format_session_data(candidate_info: Dict[str, Any], tech_stack: List[str], 
-                       messages: List[Dict[str, str]], questions: List[str]) -> Dict[str, Any]:
+                       messages: List[Dict[str, str]], questions: List[str],
+                       assessment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Format session data for export"""
-    return {
+    session_data = {
         "timestamp": datetime.now().isoformat(),
         "session_id": f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
         "candidate_info": candidate_info,
@@ -155,6 +160,9 @@ def format_session_data(candidate_info: Dict[str, Any], tech_stack: List[str],
             "questions_count": len(questions)
         }
     }
+    if assessment is not None:
+        session_data["technical_assessment"] = assessment
+    return session_data
 
 def export_to_json(data: Dict[str, Any], filename: str = None) -> str:
     """Export data to JSON format"""
@@ -164,78 +172,134 @@ def export_to_json(data: Dict[str, Any], filename: str = None) -> str:
     json_data = json.dumps(data, indent=2, ensure_ascii=False)
     return json_data
 
+def _assessment_score(data: Dict[str, Any]) -> Any:
+    """Average technical assessment score, or blank if not graded"""
+    score = (data.get("technical_assessment") or {}).get("average_score")
+    return "" if score is None else score
+
+def flatten_session_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten session data into a single CSV-style row"""
+    candidate_info = data.get("candidate_info", {})
+    summary = data.get("conversation_summary", {})
+    return {
+        "timestamp": data.get("timestamp", ""),
+        "session_id": data.get("session_id", ""),
+        "name": candidate_info.get("name", ""),
+        "email": candidate_info.get("email", ""),
+        "phone": candidate_info.get("phone", ""),
+        "experience": candidate_info.get("experience", ""),
+        "position": candidate_info.get("position", ""),
+        "location": candidate_info.get("location", ""),
+        "tech_stack": ", ".join(data.get("tech_stack", [])),
+        "total_messages": summary.get("total_messages", 0),
+        "questions_count": summary.get("questions_count", 0),
+        "assessment_score": _assessment_score(data)
+    }
+
 def export_to_csv(data: Dict[str, Any]) -> str:
     """Export data to CSV format"""
+    flat_data = flatten_session_data(data)
+    
     if not PANDAS_AVAILABLE:
         # Fallback to manual CSV generation if pandas is not available
-        flat_data = {
-            "timestamp": data.get("timestamp", ""),
-            "session_id": data.get("session_id", ""),
-            "name": data.get("candidate_info", {}).get("name", ""),
-            "email": data.get("candidate_info", {}).get("email", ""),
-            "phone": data.get("candidate_info", {}).get("phone", ""),
-            "experience": data.get("candidate_info", {}).get("experience", ""),
-            "position": data.get("candidate_info", {}).get("position", ""),
-            "location": data.get("candidate_info", {}).get("location", ""),
-            "tech_stack": ", ".join(data.get("tech_stack", [])),
-            "total_messages": data.get("conversation_summary", {}).get("total_messages", 0),
-            "questions_count": data.get("conversation_summary", {}).get("questions_count", 0)
-        }
-        
-        # Create CSV manually
         headers = list(flat_data.keys())
         values = list(flat_data.values())
         csv_content = ",".join(f'"{str(v)}"' for v in values)
         return ",".join(headers) + "\n" + csv_content
     
     # Use pandas if available
-    flat_data = {
-        "timestamp": data.get("timestamp", ""),
-        "session_id": data.get("session_id", ""),
-        "name": data.get("candidate_info", {}).get("name", ""),
-        "email": data.get("candidate_info", {}).get("email", ""),
-        "phone": data.get("candidate_info", {}).get("phone", ""),
-        "experience": data.get("candidate_info", {}).get("experience", ""),
-        "position": data.get("candidate_info", {}).get("position", ""),
-        "location": data.get("candidate_info", {}).get("location", ""),
-        "tech_stack": ", ".join(data.get("tech_stack", [])),
-        "total_messages": data.get("conversation_summary", {}).get("total_messages", 0),
-        "questions_count": data.get("conversation_summary", {}).get("questions_count", 0)
-    }
-    
+    import pandas as pd
     df = pd.DataFrame([flat_data])
     return df.to_csv(index=False)
 
-def generate_conversation_summary(messages: List[Dict[str, str]]) -> str:
-    """Generate a summary of the conversation"""
-    if not messages:
+class TopicClassifier:
+    """Match every topic keyword in a message with one compiled regex pass"""
+
+    def __init__(self, topic_keywords: Dict[str, List[str]]):
+        self.topics = list(topic_keywords)
+        keyword_topics: Dict[str, set] = {}
+        for topic, keywords in topic_keywords.items():
+            for keyword in keywords:
+                keyword_topics.setdefault(keyword.lower(), set()).add(topic)
+        # A match reports the longest keyword at a position, so it also
+        # carries the topics of every keyword contained in it ("javascript"
+        # contains "java"); substring semantics are kept in a single pass
+        self._match_topics = {
+            keyword: frozenset().union(*(t for k, t in keyword_topics.items() if k in keyword))
+            for keyword in keyword_topics
+        }
+        alternation = "|".join(re.escape(k) for k in sorted(keyword_topics, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))") if keyword_topics else None
+
+    def classify(self, text: str) -> set:
+        """Return the set of topics mentioned in text"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._match_topics[match.group(1)]
+            if len(found) == len(self.topics):
+                break
+        return found
+
+_topic_classifier = None
+
+def get_topic_classifier() -> TopicClassifier:
+    """Return the classifier for the configured TOPIC_KEYWORDS table"""
+    global _topic_classifier
+    if _topic_classifier is None:
+        _topic_classifier = TopicClassifier(TOPIC_KEYWORDS)
+    return _topic_classifier
+
+class ConversationStats:
+    """Running message counts and topic mentions, updated as messages arrive"""
+
+    def __init__(self, classifier: Optional[TopicClassifier] = None):
+        self.classifier = classifier or get_topic_classifier()
+        self.total_messages = 0
+        self.user_messages = 0
+        self.assistant_messages = 0
+        self.topic_counts = {topic: 0 for topic in self.classifier.topics}
+
+    def add_message(self, role: str, content: str):
+        """Fold one message into the running stats"""
+        self.total_messages += 1
+        if role == "user":
+            self.user_messages += 1
+            for topic in self.classifier.classify(content):
+                self.topic_counts[topic] += 1
+        elif role == "assistant":
+            self.assistant_messages += 1
+
+    def add_messages(self, messages: List[Dict[str, str]]) -> "ConversationStats":
+        """Fold a list of messages into the running stats"""
+        for message in messages:
+            self.add_message(message["role"], message["content"])
+        return self
+
+    def topics(self) -> List[str]:
+        """Topics mentioned at least once, in TOPIC_KEYWORDS order"""
+        return [topic for topic, count in self.topic_counts.items() if count]
+
+def generate_conversation_summary(messages: List[Dict[str, str]],
+                                  stats: Optional[ConversationStats] = None) -> str:
+    """Generate a summary of the conversation from running stats"""
+    if stats is None:
+        stats = ConversationStats().add_messages(messages)
+    if not stats.total_messages:
         return "No conversation data available."
     
-    user_messages = [m["content"] for m in messages if m["role"] == "user"]
-    assistant_messages = [m["content"] for m in messages if m["role"] == "assistant"]
-    
     summary = f"""
 Conversation Summary:
-- Total Messages: {len(messages)}
-- User Messages: {len(user_messages)}
-- Assistant Messages: {len(assistant_messages)}
-- Conversation Duration: {len(messages) * 2} minutes (estimated)
+- Total Messages: {stats.total_messages}
+- User Messages: {stats.user_messages}
+- Assistant Messages: {stats.assistant_messages}
+- Conversation Duration: {stats.total_messages * 2} minutes (estimated)
 
 Key Topics Discussed:
 """
     
-    # Extract key topics from user messages
-    topics = []
-    for msg in user_messages:
-        if any(keyword in msg.lower() for keyword in ['experience', 'years', 'work']):
-            topics.append("Work Experience")
-        if any(keyword in msg.lower() for keyword in ['python', 'javascript', 'java', 'react', 'django']):
-            topics.append("Technical Skills")
-        if any(keyword in msg.lower() for keyword in ['project', 'challenge', 'problem']):
-            topics.append("Project Experience")
-    
-    unique_topics = list(set(topics))
-    for topic in unique_topics:
+    for topic in stats.topics():
         summary += f"- {topic}\n"
     
     return summary
@@ -253,50 +317,41 @@ def calculate_response_time(start_time: datetime, end_time: datetime) -> float:
     """Calculate response time in seconds"""
     return (end_time - start_time).total_seconds()
 
-def get_tech_stack_categories(tech_stack: List[str]) -> Dict[str, List[str]]:
+def build_tech_taxonomy() -> Dict[str, str]:
+    """Index every categorized technology to its category"""
+    taxonomy = {}
+    for category, techs in TECH_CATEGORIES.items():
+        for tech in techs:
+            taxonomy.setdefault(tech, category)
+    return taxonomy
+
+def get_tech_stack_categories(tech_stack: List[str],
+                              taxonomy: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
     """Categorize tech stack by type"""
-    categories = {
-        "Programming Languages": [],
-        "Frameworks": [],
-        "Databases": [],
-        "Cloud Platforms": [],
-        "DevOps Tools": [],
-        "Other": []
-    }
+    if taxonomy is None:
+        taxonomy = build_tech_taxonomy()
+    categories = {category: [] for category in TECH_CATEGORIES}
+    categories["Other"] = []
     
     for tech in tech_stack:
-        if tech in ['python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust']:
-            categories["Programming Languages"].append(tech)
-        elif tech in ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express']:
-            categories["Frameworks"].append(tech)
-        elif tech in ['mysql', 'postgresql', 'mongodb', 'redis']:
-            categories["Databases"].append(tech)
-        elif tech in ['aws', 'azure', 'gcp']:
-            categories["Cloud Platforms"].append(tech)
-        elif tech in ['docker', 'kubernetes', 'jenkins', 'git']:
-            categories["DevOps Tools"].append(tech)
-        else:
-            categories["Other"].append(tech)
+        categories[taxonomy.get(tech, "Other")].append(tech)
     
     # Remove empty categories
 """
 Utility functions for TalentScout Hiring Assistant
 """
 
+import importlib.util
 import json
 import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-# Try to import pandas, but handle gracefully if not available
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    pd = None
+# pandas is slow to import and only needed for exports; check that it is
+# installed here and import it where it is used
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
 
-from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS
+from config import TECH_KEYWORDS, REQUIRED_FIELDS, FALLBACK_QUESTIONS, TOPIC_KEYWORDS, TECH_CATEGORIES
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text"""
@@ -369,6 +424,13 @@ def extract_location(text: str) -> Optional[str]:
                 return location
     return None
 
+def parse_experience_years(value: Any) -> Optional[int]:
+    """Parse an experience field such as "5" or "5 years" into whole years, or None"""
+    if value is None or value == "":
+        return None
+    match = re.search(r'\d+', str(value))
+    return int(match.group(0)) if match else None
+
 def extract_tech_stack(text: str) -> List[str]:
     """Extract tech stack from text"""
     found_tech = []
@@ -418,9 +480,10 @@ def validate_candidate_info(info: Dict[str, Any]) -> Dict[str, Any]:
     return validation_results
 
 def format_session_data(candidate_info: Dict[str, Any], tech_stack: List[str], 
-                       messages: List[Dict[str, str]], questions: List[str]) -> Dict[str, Any]:
+                       messages: List[Dict[str, str]], questions: List[str],
+                       assessment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Format session data for export"""
-    return {
+    session_data = {
         "timestamp": datetime.now().isoformat(),
         "session_id": f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
         "candidate_info": candidate_info,
@@ -435,6 +498,9 @@ def format_session_data(candidate_info: Dict[str, Any], tech_stack: List[str],
             "questions_count": len(questions)
         }
     }
+    if assessment is not None:
+        session_data["technical_assessment"] = assessment
+    return session_data
 
 def export_to_json(data: Dict[str, Any], filename: str = None) -> str:
     """Export data to JSON format"""
@@ -444,78 +510,134 @@ def export_to_json(data: Dict[str, Any], filename: str = None) -> str:
     json_data = json.dumps(data, indent=2, ensure_ascii=False)
     return json_data
 
+def _assessment_score(data: Dict[str, Any]) -> Any:
+    """Average technical assessment score, or blank if not graded"""
+    score = (data.get("technical_assessment") or {}).get("average_score")
+    return "" if score is None else score
+
+def flatten_session_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten session data into a single CSV-style row"""
+    candidate_info = data.get("candidate_info", {})
+    summary = data.get("conversation_summary", {})
+    return {
+        "timestamp": data.get("timestamp", ""),
+        "session_id": data.get("session_id", ""),
+        "name": candidate_info.get("name", ""),
+        "email": candidate_info.get("email", ""),
+        "phone": candidate_info.get("phone", ""),
+        "experience": candidate_info.get("experience", ""),
+        "position": candidate_info.get("position", ""),
+        "location": candidate_info.get("location", ""),
+        "tech_stack": ", ".join(data.get("tech_stack", [])),
+        "total_messages": summary.get("total_messages", 0),
+        "questions_count": summary.get("questions_count", 0),
+        "assessment_score": _assessment_score(data)
+    }
+
 def export_to_csv(data: Dict[str, Any]) -> str:
     """Export data to CSV format"""
+    flat_data = flatten_session_data(data)
+    
     if not PANDAS_AVAILABLE:
         # Fallback to manual CSV generation if pandas is not available
-        flat_data = {
-            "timestamp": data.get("timestamp", ""),
-            "session_id": data.get("session_id", ""),
-            "name": data.get("candidate_info", {}).get("name", ""),
-            "email": data.get("candidate_info", {}).get("email", ""),
-            "phone": data.get("candidate_info", {}).get("phone", ""),
-            "experience": data.get("candidate_info", {}).get("experience", ""),
-            "position": data.get("candidate_info", {}).get("position", ""),
-            "location": data.get("candidate_info", {}).get("location", ""),
-            "tech_stack": ", ".join(data.get("tech_stack", [])),
-            "total_messages": data.get("conversation_summary", {}).get("total_messages", 0),
-            "questions_count": data.get("conversation_summary", {}).get("questions_count", 0)
-        }
-        
-        # Create CSV manually
         headers = list(flat_data.keys())
         values = list(flat_data.values())
         csv_content = ",".join(f'"{str(v)}"' for v in values)
         return ",".join(headers) + "\n" + csv_content
     
     # Use pandas if available
-    flat_data = {
-        "timestamp": data.get("timestamp", ""),
-        "session_id": data.get("session_id", ""),
-        "name": data.get("candidate_info", {}).get("name", ""),
-        "email": data.get("candidate_info", {}).get("email", ""),
-        "phone": data.get("candidate_info", {}).get("phone", ""),
-        "experience": data.get("candidate_info", {}).get("experience", ""),
-        "position": data.get("candidate_info", {}).get("position", ""),
-        "location": data.get("candidate_info", {}).get("location", ""),
-        "tech_stack": ", ".join(data.get("tech_stack", [])),
-        "total_messages": data.get("conversation_summary", {}).get("total_messages", 0),
-        "questions_count": data.get("conversation_summary", {}).get("questions_count", 0)
-    }
-    
+    import pandas as pd
     df = pd.DataFrame([flat_data])
     return df.to_csv(index=False)
 
-def generate_conversation_summary(messages: List[Dict[str, str]]) -> str:
-    """Generate a summary of the conversation"""
-    if not messages:
+class TopicClassifier:
+    """Match every topic keyword in a message with one compiled regex pass"""
+
+    def __init__(self, topic_keywords: Dict[str, List[str]]):
+        self.topics = list(topic_keywords)
+        keyword_topics: Dict[str, set] = {}
+        for topic, keywords in topic_keywords.items():
+            for keyword in keywords:
+                keyword_topics.setdefault(keyword.lower(), set()).add(topic)
+        # A match reports the longest keyword at a position, so it also
+        # carries the topics of every keyword contained in it ("javascript"
+        # contains "java"); substring semantics are kept in a single pass
+        self._match_topics = {
+            keyword: frozenset().union(*(t for k, t in keyword_topics.items() if k in keyword))
+            for keyword in keyword_topics
+        }
+        alternation = "|".join(re.escape(k) for k in sorted(keyword_topics, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))") if keyword_topics else None
+
+    def classify(self, text: str) -> set:
+        """Return the set of topics mentioned in text"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._match_topics[match.group(1)]
+            if len(found) == len(self.topics):
+                break
+        return found
+
+_topic_classifier = None
+
+def get_topic_classifier() -> TopicClassifier:
+    """Return the classifier for the configured TOPIC_KEYWORDS table"""
+    global _topic_classifier
+    if _topic_classifier is None:
+        _topic_classifier = TopicClassifier(TOPIC_KEYWORDS)
+    return _topic_classifier
+
+class ConversationStats:
+    """Running message counts and topic mentions, updated as messages arrive"""
+
+    def __init__(self, classifier: Optional[TopicClassifier] = None):
+        self.classifier = classifier or get_topic_classifier()
+        self.total_messages = 0
+        self.user_messages = 0
+        self.assistant_messages = 0
+        self.topic_counts = {topic: 0 for topic in self.classifier.topics}
+
+    def add_message(self, role: str, content: str):
+        """Fold one message into the running stats"""
+        self.total_messages += 1
+        if role == "user":
+            self.user_messages += 1
+            for topic in self.classifier.classify(content):
+                self.topic_counts[topic] += 1
+        elif role == "assistant":
+            self.assistant_messages += 1
+
+    def add_messages(self, messages: List[Dict[str, str]]) -> "ConversationStats":
+        """Fold a list of messages into the running stats"""
+        for message in messages:
+            self.add_message(message["role"], message["content"])
+        return self
+
+    def topics(self) -> List[str]:
+        """Topics mentioned at least once, in TOPIC_KEYWORDS order"""
+        return [topic for topic, count in self.topic_counts.items() if count]
+
+def generate_conversation_summary(messages: List[Dict[str, str]],
+                                  stats: Optional[ConversationStats] = None) -> str:
+    """Generate a summary of the conversation from running stats"""
+    if stats is None:
+        stats = ConversationStats().add_messages(messages)
+    if not stats.total_messages:
         return "No conversation data available."
     
-    user_messages = [m["content"] for m in messages if m["role"] == "user"]
-    assistant_messages = [m["content"] for m in messages if m["role"] == "assistant"]
-    
     summary = f"""
 Conversation Summary:
-- Total Messages: {len(messages)}
-- User Messages: {len(user_messages)}
-- Assistant Messages: {len(assistant_messages)}
-- Conversation Duration: {len(messages) * 2} minutes (estimated)
+- Total Messages: {stats.total_messages}
+- User Messages: {stats.user_messages}
+- Assistant Messages: {stats.assistant_messages}
+- Conversation Duration: {stats.total_messages * 2} minutes (estimated)
 
 Key Topics Discussed:
 """
     
-    # Extract key topics from user messages
-    topics = []
-    for msg in user_messages:
-        if any(keyword in msg.lower() for keyword in ['experience', 'years', 'work']):
-            topics.append("Work Experience")
-        if any(keyword in msg.lower() for keyword in ['python', 'javascript', 'java', 'react', 'django']):
-            topics.append("Technical Skills")
-        if any(keyword in msg.lower() for keyword in ['project', 'challenge', 'problem']):
-            topics.append("Project Experience")
-    
-    unique_topics = list(set(topics))
-    for topic in unique_topics:
+    for topic in stats.topics():
         summary += f"- {topic}\n"
     
     return summary
@@ -533,30 +655,24 @@ def calculate_response_time(start_time: datetime, end_time: datetime) -> float:
     """Calculate response time in seconds"""
     return (end_time - start_time).total_seconds()
 
-def get_tech_stack_categories(tech_stack: List[str]) -> Dict[str, List[str]]:
+def build_tech_taxonomy() -> Dict[str, str]:
+    """Index every categorized technology to its category"""
+    taxonomy = {}
+    for category, techs in TECH_CATEGORIES.items():
+        for tech in techs:
+            taxonomy.setdefault(tech, category)
+    return taxonomy
+
+def get_tech_stack_categories(tech_stack: List[str],
+                              taxonomy: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
     """Categorize tech stack by type"""
-    categories = {
-        "Programming Languages": [],
-        "Frameworks": [],
-        "Databases": [],
-        "Cloud Platforms": [],
-        "DevOps Tools": [],
-        "Other": []
-    }
+    if taxonomy is None:
+        taxonomy = build_tech_taxonomy()
+    categories = {category: [] for category in TECH_CATEGORIES}
+    categories["Other"] = []
     
     for tech in tech_stack:
-        if tech in ['python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust']:
-            categories["Programming Languages"].append(tech)
-        elif tech in ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express']:
-            categories["Frameworks"].append(tech)
-        elif tech in ['mysql', 'postgresql', 'mongodb', 'redis']:
-            categories["Databases"].append(tech)
-        elif tech in ['aws', 'azure', 'gcp']:
-            categories["Cloud Platforms"].append(tech)
-        elif tech in ['docker', 'kubernetes', 'jenkins', 'git']:
-            categories["DevOps Tools"].append(tech)
-        else:
-            categories["Other"].append(tech)
+        categories[taxonomy.get(tech, "Other")].append(tech)
     
     # Remove empty categories
     return {k: v for k, v in categories.items() if v} 
\ No newline at end of file